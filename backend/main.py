@@ -19,12 +19,12 @@ import asyncio
 import inspect
 import logging
 import argparse
-import threading
+import orjson
 from datetime import datetime
 from typing import Optional
 
 from models import Device, DeviceType, RSDTunnel
-from services import DeviceManager, LocationService, TunnelManager, FavoritesService, CruiseService, LastLocationService, PortForwardService, BrouterService, RouteService, event_bus
+from services import DeviceManager, LocationService, TunnelManager, FavoritesService, CruiseService, LastLocationService, PortForwardService, BrouterService, RouteService, event_bus, encode_json, format_sse
 
 
 # Configure logging to stderr
@@ -38,6 +38,82 @@ logging.basicConfig(
 logger = logging.getLogger('Backend')
 
 
+# Required params per RPC method, validated before dispatch in order
+_REQUIRED_PARAMS = {
+    "setLocation": ("deviceId", "latitude", "longitude"),
+    "clearLocation": ("deviceId",),
+    "getDeviceState": ("deviceId",),
+    "disconnectDevice": ("deviceId",),
+    "addFavorite": ("latitude", "longitude"),
+    "updateFavorite": ("index", "name"),
+    "deleteFavorite": ("index",),
+    "importFavorites": ("filePath",),
+    "startCruise": ("deviceId", "startLatitude", "startLongitude", "targetLatitude", "targetLongitude"),
+    "stopCruise": ("deviceId",),
+    "pauseCruise": ("deviceId",),
+    "resumeCruise": ("deviceId",),
+    "setCruiseSpeed": ("deviceId", "speedKmh"),
+    "getCruiseStatus": ("deviceId",),
+    "getLastLocation": ("deviceId",),
+    "startPortForward": ("listenIp", "listenPort", "targetPort"),
+    "stopPortForward": ("listenIp", "listenPort"),
+    "addRouteWaypoint": ("deviceId", "lat", "lng"),
+    "undoRouteWaypoint": ("deviceId",),
+    "startRouteCruise": ("deviceId",),
+    "getRouteStatus": ("deviceId",),
+    "pauseRouteCruise": ("deviceId",),
+    "resumeRouteCruise": ("deviceId",),
+    "rerouteRouteCruise": ("deviceId", "lat", "lng"),
+    "stopRouteCruise": ("deviceId",),
+    "setRouteCruiseSpeed": ("deviceId", "speedKmh"),
+    "clearRoute": ("deviceId",),
+    "setRouteLoopMode": ("deviceId", "enabled"),
+}
+# Identifiers must be non-empty; other params only need to be present,
+# since 0 and False are valid coordinates, indexes and flags
+_NON_EMPTY_PARAMS = frozenset({"deviceId", "filePath", "listenIp", "listenPort", "targetPort"})
+# Params that are only meaningful together share one message
+_PARAM_ERRORS = {
+    "latitude": "latitude and longitude required",
+    "longitude": "latitude and longitude required",
+    "lat": "lat and lng required",
+    "lng": "lat and lng required",
+    "startLatitude": "Start and target coordinates required",
+    "startLongitude": "Start and target coordinates required",
+    "targetLatitude": "Start and target coordinates required",
+    "targetLongitude": "Start and target coordinates required",
+}
+# method -> ((param, must be non-empty, error result), ...), precompiled once
+_PARAM_CHECKS = {
+    method: tuple(
+        (
+            key,
+            key in _NON_EMPTY_PARAMS,
+            {"success": False, "error": _PARAM_ERRORS.get(key, f"{key} required")},
+        )
+        for key in keys
+    )
+    for method, keys in _REQUIRED_PARAMS.items()
+}
+
+# Fixed error results, shared rather than rebuilt per failure: results are
+# only serialized or read, never mutated
+_ERR_DEVICE_NOT_FOUND = {"success": False, "error": "Device not found"}
+_ERR_NO_LAST_LOCATION = {"success": False, "error": "No last location for this device"}
+# Empty list results; tuples so the shared lists can't be appended to
+_EMPTY_DEVICES_RESULT = {"devices": ()}
+_EMPTY_FAVORITES_RESULT = {"favorites": ()}
+
+
+def _missing_param_result(params: dict, checks: tuple) -> Optional[dict]:
+    """Return the error result for the first missing required param, if any."""
+    for key, non_empty, error in checks:
+        value = params.get(key)
+        if value is None or (non_empty and not value):
+            return error
+    return None
+
+
 class LocationSimulatorServer:
     """
     JSON-RPC server for location simulation.
@@ -46,6 +122,12 @@ class LocationSimulatorServer:
     Events are published via SSE for real-time updates to all connected clients.
     """
 
+    __slots__ = (
+        "devices", "tunnel", "location", "favorites", "cruise",
+        "last_locations", "port_forward", "brouter", "route",
+        "_request_count", "_methods", "_async_methods",
+    )
+
     def __init__(self):
         # Services
         self.devices = DeviceManager()
@@ -66,7 +148,7 @@ class LocationSimulatorServer:
         self.tunnel.set_event_emitter(self._emit_event)
 
         # Start tunneld check in background (non-blocking)
-        threading.Thread(target=self.tunnel.ensure_tunneld, daemon=True).start()
+        self.tunnel.start_tunneld_check()
 
         # Wire up cruise service callbacks
         self.cruise.set_location_callback(self._set_location_for_cruise)
@@ -120,6 +202,11 @@ class LocationSimulatorServer:
             "clearRoute": self._clear_route,
             "setRouteLoopMode": self._set_route_loop_mode,
         }
+        # Resolved once here rather than inspecting the handler per request
+        self._async_methods = frozenset(
+            name for name, handler in self._methods.items()
+            if inspect.iscoroutinefunction(handler)
+        )
 
         logger.info("Location Simulator Backend initialized")
 
@@ -153,13 +240,22 @@ class LocationSimulatorServer:
 
         return tunnel
 
+    # High-frequency state snapshots; a slow SSE client only needs the latest
+    _COALESCED_EVENTS = {"cruiseUpdate", "routeUpdate"}
+
     def _emit_event(self, event: dict) -> None:
         """Emit an event to all SSE subscribers.
 
         Events are JSON objects with 'event' and 'data' keys.
         Used by CruiseService to send position updates.
+        Per-device state updates are coalesced in subscriber queues.
         """
-        event_bus.publish_sync(event)
+        name = event.get("event")
+        if name in self._COALESCED_EVENTS:
+            device_id = (event.get("data") or {}).get("deviceId")
+            event_bus.publish_sync(event, coalesce_key=f"{name}:{device_id}")
+        else:
+            event_bus.publish_sync(event)
 
     def _set_location_for_cruise(
         self,
@@ -175,7 +271,7 @@ class LocationSimulatorServer:
         """
         device = self.devices.get_device(device_id)
         if not device:
-            return {"success": False, "error": "Device not found"}
+            return _ERR_DEVICE_NOT_FOUND
 
         result = self.location.set_location(device, latitude, longitude)
 
@@ -191,8 +287,7 @@ class LocationSimulatorServer:
 
     # Methods that do blocking I/O and need run_in_executor
     _BLOCKING_METHODS = {
-        "listDevices", "setLocation", "clearLocation",
-        "retryTunneld", "disconnectDevice",
+        "listDevices", "setLocation", "clearLocation", "disconnectDevice",
         "startCruise", "stopCruise", "pauseCruise", "resumeCruise",
         "startRouteCruise", "stopRouteCruise", "pauseRouteCruise", "resumeRouteCruise",
     }
@@ -209,15 +304,21 @@ class LocationSimulatorServer:
         method = request.get("method")
         params = request.get("params", {})
 
-        if method not in self._methods:
+        handler = self._methods.get(method)
+        if handler is None:
             return {
                 "id": request_id,
                 "error": {"code": -32601, "message": f"Method not found: {method}"}
             }
 
         try:
-            handler = self._methods[method]
-            if inspect.iscoroutinefunction(handler):
+            checks = _PARAM_CHECKS.get(method)
+            if checks:
+                error = _missing_param_result(params, checks)
+                if error:
+                    return {"id": request_id, "result": error}
+
+            if method in self._async_methods:
                 # Async method — await it
                 result = await handler(params)
             elif method in self._BLOCKING_METHODS:
@@ -242,6 +343,8 @@ class LocationSimulatorServer:
     def _list_devices(self, params: dict) -> dict:
         """List all connected devices with tunnel info for physical devices."""
         devices = self.devices.list_devices()
+        if not devices:
+            return _EMPTY_DEVICES_RESULT
         device_list = []
         for d in devices:
             d_dict = d.to_dict()
@@ -258,8 +361,6 @@ class LocationSimulatorServer:
         internally and only queries tunneld on retry after failure.
         """
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         device = self.devices.get_device(device_id)
         if not device:
@@ -268,9 +369,6 @@ class LocationSimulatorServer:
         latitude = params.get("latitude")
         longitude = params.get("longitude")
 
-        if latitude is None or longitude is None:
-            return {"success": False, "error": "latitude and longitude required"}
-
         result = self.location.set_location(
             device,
             float(latitude),
@@ -286,8 +384,6 @@ class LocationSimulatorServer:
     def _clear_location(self, params: dict) -> dict:
         """Clear simulated location on a device."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         device = self.devices.get_device(device_id)
         if not device:
@@ -298,9 +394,12 @@ class LocationSimulatorServer:
         return result
 
     def _retry_tunneld(self, params: dict) -> dict:
-        """Retry starting tunneld daemon. Called from error banner retry button."""
-        state = self.tunnel.ensure_tunneld()
-        return {"success": state == "ready", "state": state}
+        """Retry starting tunneld daemon. Called from error banner retry button.
+
+        Returns immediately; the outcome is reported via tunneldStatus SSE.
+        """
+        state = self.tunnel.start_tunneld_check()
+        return {"success": True, "state": state}
 
     def _get_tunnel_info_for_device(self, device: Device) -> Optional[dict]:
         """Query tunneld for a device's tunnel info.
@@ -343,17 +442,15 @@ class LocationSimulatorServer:
         in a single response. Used by frontend on device switch.
         """
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"error": "deviceId required"}
 
         # Location: prefer LocationService's live position, fall back to LastLocationService
         loc = self.location._last_locations.get(device_id)
         if loc:
             location = {"latitude": loc["lat"], "longitude": loc["lon"]}
         else:
-            last = self.last_locations.get(device_id)
+            last = self.last_locations.get_tuple(device_id)
             if last:
-                location = {"latitude": last["lat"], "longitude": last["lon"]}
+                location = {"latitude": last[0], "longitude": last[1]}
             else:
                 location = None
 
@@ -438,8 +535,6 @@ class LocationSimulatorServer:
     def _disconnect_device(self, params: dict) -> dict:
         """Disconnect a device — stop all active tasks and clear state."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         # Stop cruise if active
         self.cruise.stop_cruise(device_id)
@@ -458,6 +553,8 @@ class LocationSimulatorServer:
     def _get_favorites(self, params: dict) -> dict:
         """Get all favorite locations."""
         favorites = self.favorites.get_all()
+        if not favorites:
+            return _EMPTY_FAVORITES_RESULT
         return {"favorites": [f.to_dict() for f in favorites]}
 
     def _add_favorite(self, params: dict) -> dict:
@@ -466,9 +563,6 @@ class LocationSimulatorServer:
         longitude = params.get("longitude")
         name = params.get("name", "")
 
-        if latitude is None or longitude is None:
-            return {"success": False, "error": "latitude and longitude required"}
-
         return self.favorites.add(float(latitude), float(longitude), name)
 
     def _update_favorite(self, params: dict) -> dict:
@@ -476,29 +570,18 @@ class LocationSimulatorServer:
         index = params.get("index")
         name = params.get("name")
 
-        if index is None:
-            return {"success": False, "error": "index required"}
-        if name is None:
-            return {"success": False, "error": "name required"}
-
         return self.favorites.update(int(index), name)
 
     def _delete_favorite(self, params: dict) -> dict:
         """Delete a favorite location."""
         index = params.get("index")
 
-        if index is None:
-            return {"success": False, "error": "index required"}
-
         return self.favorites.delete(int(index))
 
     def _import_favorites(self, params: dict) -> dict:
         """Import favorites from a file."""
         file_path = params.get("filePath")
 
-        if not file_path:
-            return {"success": False, "error": "filePath required"}
-
         return self.favorites.import_from_file(file_path)
 
     # =========================================================================
@@ -509,8 +592,6 @@ class LocationSimulatorServer:
         """Start cruise mode towards a target location."""
         # Get device ID from params or selected device
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         # Get coordinates
         start_lat = params.get("startLatitude")
@@ -519,9 +600,6 @@ class LocationSimulatorServer:
         target_lon = params.get("targetLongitude")
         speed = params.get("speedKmh", 5.0)
 
-        if None in (start_lat, start_lon, target_lat, target_lon):
-            return {"success": False, "error": "Start and target coordinates required"}
-
         return self.cruise.start_cruise(
             device_id=device_id,
             start_lat=float(start_lat),
@@ -534,45 +612,29 @@ class LocationSimulatorServer:
     def _stop_cruise(self, params: dict) -> dict:
         """Stop cruise mode."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.cruise.stop_cruise(device_id)
 
     def _pause_cruise(self, params: dict) -> dict:
         """Pause cruise mode."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.cruise.pause_cruise(device_id)
 
     def _resume_cruise(self, params: dict) -> dict:
         """Resume paused cruise mode."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.cruise.resume_cruise(device_id)
 
     def _set_cruise_speed(self, params: dict) -> dict:
         """Set cruise speed."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         speed = params.get("speedKmh")
-        if speed is None:
-            return {"success": False, "error": "speedKmh required"}
 
         return self.cruise.set_cruise_speed(device_id, float(speed))
 
     def _get_cruise_status(self, params: dict) -> dict:
         """Get cruise status for a device."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.cruise.get_cruise_status(device_id)
 
     # =========================================================================
@@ -582,8 +644,6 @@ class LocationSimulatorServer:
     def _get_last_location(self, params: dict) -> dict:
         """Get the last set location for a device."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         location = self.last_locations.get(device_id)
         if location:
@@ -592,7 +652,7 @@ class LocationSimulatorServer:
                 "latitude": location["lat"],
                 "longitude": location["lon"],
             }
-        return {"success": False, "error": "No last location for this device"}
+        return _ERR_NO_LAST_LOCATION
 
     # =========================================================================
     # Port Forwarding Operations
@@ -610,13 +670,6 @@ class LocationSimulatorServer:
         target_ip = params.get("targetIp", "127.0.0.1")
         target_port = params.get("targetPort")
 
-        if not listen_ip:
-            return {"success": False, "error": "listenIp required"}
-        if not listen_port:
-            return {"success": False, "error": "listenPort required"}
-        if not target_port:
-            return {"success": False, "error": "targetPort required"}
-
         return await self.port_forward.start_forward(
             listen_ip,
             int(listen_port),
@@ -629,11 +682,6 @@ class LocationSimulatorServer:
         listen_ip = params.get("listenIp")
         listen_port = params.get("listenPort")
 
-        if not listen_ip:
-            return {"success": False, "error": "listenIp required"}
-        if not listen_port:
-            return {"success": False, "error": "listenPort required"}
-
         return await self.port_forward.stop_forward(listen_ip, int(listen_port))
 
     def _list_port_forwards(self, params: dict) -> dict:
@@ -648,29 +696,19 @@ class LocationSimulatorServer:
     async def _add_route_waypoint(self, params: dict) -> dict:
         """Add a waypoint to the route."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         lat = params.get("lat")
         lng = params.get("lng")
-        if lat is None or lng is None:
-            return {"success": False, "error": "lat and lng required"}
-
         return await self.route.add_waypoint(device_id, float(lat), float(lng))
 
     async def _undo_route_waypoint(self, params: dict) -> dict:
         """Remove the last waypoint from the route."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return await self.route.undo_waypoint(device_id)
 
     def _start_route_cruise(self, params: dict) -> dict:
         """Start route cruise."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         speed = params.get("speedKmh", 5.0)
         return self.route.start_route_cruise(device_id, float(speed))
@@ -678,38 +716,24 @@ class LocationSimulatorServer:
     def _get_route_status(self, params: dict) -> dict:
         """Get route status for a device."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.route.get_route_status(device_id)
 
     def _pause_route_cruise(self, params: dict) -> dict:
         """Pause route cruise."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.route.pause_route_cruise(device_id)
 
     def _resume_route_cruise(self, params: dict) -> dict:
         """Resume route cruise."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.route.resume_route_cruise(device_id)
 
     async def _reroute_route_cruise(self, params: dict) -> dict:
         """Reroute and resume route cruise from current position."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         lat = params.get("lat")
         lng = params.get("lng")
-        if lat is None or lng is None:
-            return {"success": False, "error": "lat and lng required"}
-
         return await self.route.reroute_and_resume(
             device_id, float(lat), float(lng)
         )
@@ -717,41 +741,26 @@ class LocationSimulatorServer:
     def _stop_route_cruise(self, params: dict) -> dict:
         """Stop route cruise."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.route.stop_route_cruise(device_id)
 
     def _set_route_cruise_speed(self, params: dict) -> dict:
         """Set route cruise speed."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         speed = params.get("speedKmh")
-        if speed is None:
-            return {"success": False, "error": "speedKmh required"}
 
         return self.route.set_route_speed(device_id, float(speed))
 
     def _clear_route(self, params: dict) -> dict:
         """Clear route for a device."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
-
         return self.route.clear_route(device_id)
 
     async def _set_route_loop_mode(self, params: dict) -> dict:
         """Toggle route loop mode."""
         device_id = params.get("deviceId")
-        if not device_id:
-            return {"success": False, "error": "deviceId required"}
 
         enabled = params.get("enabled")
-        if enabled is None:
-            return {"success": False, "error": "enabled required"}
-
         return await self.route.set_loop_mode(device_id, bool(enabled))
 
     # =========================================================================
@@ -780,6 +789,12 @@ class LocationSimulatorServer:
             "Access-Control-Max-Age": "3600",
         }
 
+        def json_response(data, status: int = 200) -> web.Response:
+            """JSON response serialized with orjson rather than json_response's stdlib json."""
+            return web.Response(
+                body=encode_json(data), status=status, content_type="application/json"
+            )
+
         @web.middleware
         async def cors_middleware(request: web.Request, handler):
             """Add CORS headers to all responses."""
@@ -799,7 +814,7 @@ class LocationSimulatorServer:
         async def handle_rpc(request: web.Request) -> web.Response:
             """Handle JSON-RPC requests over HTTP POST."""
             try:
-                body = await request.json()
+                body = orjson.loads(await request.read())
                 self._request_count += 1
                 request_id = body.get("id", "?")
                 method = body.get("method", "?")
@@ -819,15 +834,16 @@ class LocationSimulatorServer:
                     logger.info(
                         f"[{self._request_count}] >> OK ({elapsed:.1f}ms)")
 
-                return web.json_response(response)
+                return json_response(response)
             except json.JSONDecodeError:
-                return web.json_response(
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                return json_response(
                     {"error": {"code": -32700, "message": "Parse error"}},
                     status=400
                 )
             except Exception as e:
                 logger.exception(f"HTTP handler error: {e}")
-                return web.json_response(
+                return json_response(
                     {"error": {"code": -1, "message": str(e)}},
                     status=500
                 )
@@ -863,30 +879,23 @@ class LocationSimulatorServer:
                 # Note: no "event:" field — all events go through onmessage
                 # so the frontend doesn't need per-event-type addEventListener
                 await response.write(
-                    f"data: {json.dumps({'event': 'connected', 'data': {'status': 'connected'}})}\n\n".encode()
+                    format_sse({"event": "connected", "data": {"status": "connected"}})
                 )
 
                 # Send current tunneld state so client doesn't stay stuck on "starting"
                 # (the background thread may have finished before any SSE client connected)
-                tunneld_data = {"state": self.tunnel._tunneld_state}
-                if self.tunnel._tunneld_error:
-                    tunneld_data["error"] = self.tunnel._tunneld_error
-                await response.write(
-                    f"data: {json.dumps({'event': 'tunneldStatus', 'data': tunneld_data})}\n\n".encode()
-                )
+                await response.write(self.tunnel.get_status_bytes())
 
                 # Subscribe to event bus and stream events
-                async for event in event_bus.subscribe():
-                    if event is None:
+                # Frames are SSE data-only (no event: field), pre-encoded
+                # once per publish. Event name is in the JSON payload
+                # (event.event), so all events go through onmessage
+                async for frame in event_bus.subscribe_sse():
+                    if frame is None:
                         # Shutdown signal
                         break
 
-                    # Format as SSE: data-only (no event: field)
-                    # Event name is in the JSON payload (event.event)
-                    # This ensures all events go through onmessage
-                    await response.write(
-                        f"data: {json.dumps(event)}\n\n".encode()
-                    )
+                    await response.write(frame)
                     
             except asyncio.CancelledError:
                 logger.debug("SSE connection cancelled")
@@ -899,7 +908,7 @@ class LocationSimulatorServer:
 
         async def handle_health(request: web.Request) -> web.Response:
             """Health check endpoint."""
-            return web.json_response({
+            return json_response({
                 "status": "ok",
                 "mode": "http",
                 "subscribers": event_bus.subscriber_count
@@ -926,7 +935,9 @@ class LocationSimulatorServer:
         logger.info(f"  GET  /health  - Health check")
         logger.info("=" * 60)
 
-        event_bus.set_loop(asyncio.get_running_loop())
+        loop = asyncio.get_running_loop()
+        event_bus.set_loop(loop)
+        self.last_locations.start(loop)
 
         await site.start()
 
@@ -944,6 +955,8 @@ class LocationSimulatorServer:
             await self.brouter.close()
             self.location.close_all_connections()
             self.last_locations.close()
+            self.favorites.close()
+            self.tunnel.close()
             await runner.cleanup()
             logger.info("HTTP server shutdown")
 
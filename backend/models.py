@@ -1,10 +1,49 @@
 """Data models for the backend."""
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 
 
+def generate_serializers(
+    fields: dict[str, str],
+    dict_method: str = "to_dict",
+    helpers: Optional[dict] = None,
+):
+    """Class decorator attaching an exec-generated dict serializer.
+
+    The method is compiled once per class with the field order and
+    attribute loads inlined, so serializing skips any per-call
+    introspection. Expressions read enum values via ``_value_`` (a plain
+    instance attribute) rather than the slower ``Enum.value`` property.
+
+    Args:
+        fields: Output key -> Python expression over ``self``
+        dict_method: Name for the generated dict method
+        helpers: Extra globals the expressions may reference, so a lookup
+            can be inlined instead of going through a property
+
+    Returns:
+        Decorator that sets ``dict_method`` on the class
+    """
+    body = ", ".join(f"{key!r}: {expr}" for key, expr in fields.items())
+    source = (
+        f"def {dict_method}(self):\n"
+        f"    return {{{body}}}\n"
+    )
+
+    def decorate(cls):
+        namespace = dict(helpers or {})
+        exec(compile(source, f"<{cls.__name__} serializers>", "exec"), namespace)
+        method = namespace[dict_method]
+        method.__qualname__ = f"{cls.__name__}.{dict_method}"
+        setattr(cls, dict_method, method)
+        return cls
+
+    return decorate
+
+
 class DeviceType(Enum):
     SIMULATOR = "simulator"
     PHYSICAL = "physical"
@@ -31,26 +70,51 @@ class TunnelStatus(Enum):
     ERROR = "error"                   # Error state
 
 
-@dataclass
+@generate_serializers({
+    "address": "self.address",
+    "port": "self.port",
+    "udid": "self.udid",
+}, dict_method="_build_dict")
+@dataclass(slots=True, frozen=True)
 class RSDTunnel:
-    """RSD tunnel connection info for iOS 17+ devices."""
+    """RSD tunnel connection info for iOS 17+ devices.
+
+    Frozen since TunnelManager hands the same memoized instance to every caller.
+    """
     address: str
     port: int
     udid: Optional[str] = None
+    # Serialized form; never stale since the instance is immutable
+    _dict_cache: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def is_configured(self) -> bool:
         return bool(self.address) and self.port > 0
 
     def to_dict(self) -> dict:
-        return {
-            "address": self.address,
-            "port": self.port,
-            "udid": self.udid
-        }
-
-
-@dataclass
+        """Serialized form, built once and shared: callers must not mutate it.
+
+        Only ever nested inside other payloads (device and tunnel state
+        dicts), which are themselves shallow-copied at most.
+        """
+        cached = self._dict_cache
+        if cached is None:
+            cached = self._build_dict()
+            object.__setattr__(self, "_dict_cache", cached)
+        return cached
+
+
+@generate_serializers({
+    "udid": "self.udid",
+    "status": "self.status._value_",
+    "tunnelInfo": "self.tunnel_info.to_dict() if self.tunnel_info else None",
+    "lastValidated": "self.last_validated",
+    "lastQueried": "self.last_queried",
+    "error": "self.error",
+}, dict_method="_build_dict")
+@dataclass(slots=True)
 class TunnelState:
     """Per-device tunnel state managed by TunnelManager."""
     udid: str
@@ -59,20 +123,26 @@ class TunnelState:
     last_validated: float = 0.0       # Timestamp of last successful validation
     last_queried: float = 0.0         # Timestamp of last tunneld query
     error: Optional[str] = None
+    # Serialized form; None when fields changed since the last to_dict
+    _dict_cache: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def invalidate(self) -> None:
+        """Drop the cached to_dict() result after mutating the state."""
+        self._dict_cache = None
 
     def to_dict(self) -> dict:
-        return {
-            "udid": self.udid,
-            "status": self.status.value,
-            "tunnelInfo": self.tunnel_info.to_dict() if self.tunnel_info else None,
-            "lastValidated": self.last_validated,
-            "lastQueried": self.last_queried,
-            "error": self.error
-        }
-
-
-# Product type to display name mapping
-PRODUCT_NAME_MAP = {
+        cached = self._dict_cache
+        if cached is None:
+            cached = self._dict_cache = self._build_dict()
+        # Shallow copy, as for Device: callers may add keys to the result
+        return dict(cached)
+
+
+# Product type to display name mapping. Keys are interned, as are product
+# types on Device, so lookups match on identity.
+PRODUCT_NAME_MAP = {sys.intern(k): v for k, v in {
     "iPhone17,1": "iPhone 16 Pro",
     "iPhone17,2": "iPhone 16 Pro Max",
     "iPhone16,1": "iPhone 15 Pro",
@@ -81,10 +151,22 @@ PRODUCT_NAME_MAP = {
     "iPhone15,3": "iPhone 14 Pro Max",
     "iPhone14,2": "iPhone 13 Pro",
     "iPhone14,3": "iPhone 13 Pro Max",
-}
-
-
-@dataclass
+}.items()}
+_product_name_get = PRODUCT_NAME_MAP.get
+
+
+@generate_serializers({
+    "id": "self.id",
+    "name": "self.name",
+    "type": "self.type._value_",
+    "state": "self.state._value_",
+    "productType": "self.product_type",
+    # Inlined product_name property
+    "productName": "_product_name_get(self.product_type, self.product_type or self.name)",
+    "connectionType": "self.connection_type._value_",
+    "rsdTunnel": "self.rsd_tunnel.to_dict() if self.rsd_tunnel else None",
+}, dict_method="_build_dict", helpers={"_product_name_get": _product_name_get})
+@dataclass(slots=True, init=False)
 class Device:
     """iOS device (simulator or physical)."""
     id: str
@@ -94,21 +176,47 @@ class Device:
     rsd_tunnel: Optional[RSDTunnel] = None
     product_type: Optional[str] = None
     connection_type: ConnectionType = ConnectionType.UNKNOWN
+    # Serialized form, rebuilt lazily after any field assignment
+    _dict_cache: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        type: DeviceType,
+        state: DeviceState,
+        rsd_tunnel: Optional[RSDTunnel] = None,
+        product_type: Optional[str] = None,
+        connection_type: ConnectionType = ConnectionType.UNKNOWN,
+    ) -> None:
+        # Hand-written so construction skips the cache-clearing __setattr__
+        # below (the generated __init__ would run it once per field)
+        _set = object.__setattr__
+        _set(self, "id", id)
+        _set(self, "name", name)
+        _set(self, "type", type)
+        _set(self, "state", state)
+        _set(self, "rsd_tunnel", rsd_tunnel)
+        _set(self, "product_type", sys.intern(product_type) if product_type else product_type)
+        _set(self, "connection_type", connection_type)
+        _set(self, "_dict_cache", None)
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
 
     @property
     def product_name(self) -> str:
-        if self.product_type:
-            return PRODUCT_NAME_MAP.get(self.product_type, self.product_type)
-        return self.name
+        product_type = self.product_type
+        return _product_name_get(product_type, product_type or self.name)
 
     def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "type": self.type.value,
-            "state": self.state.value,
-            "productType": self.product_type,
-            "productName": self.product_name,
-            "connectionType": self.connection_type.value,
-            "rsdTunnel": self.rsd_tunnel.to_dict() if self.rsd_tunnel else None,
-        }
+        cached = self._dict_cache
+        if cached is None:
+            cached = self._build_dict()
+            self._dict_cache = cached
+        # Shallow copy: callers (e.g. listDevices) add keys to the result
+        return dict(cached)
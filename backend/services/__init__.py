@@ -9,7 +9,7 @@ from .last_location_service import LastLocationService
 from .port_forward_service import PortForwardService
 from .brouter_service import BrouterService
 from .route_service import RouteService
-from .event_bus import EventBus, event_bus
+from .event_bus import EventBus, encode_json, event_bus, format_sse
 from . import coordinate_utils
 
 __all__ = [
@@ -24,5 +24,7 @@ __all__ = [
     'RouteService',
     'EventBus',
     'event_bus',
+    'format_sse',
+    'encode_json',
     'coordinate_utils',
 ]
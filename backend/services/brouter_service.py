@@ -5,16 +5,37 @@ straight-line paths if the API is unavailable or fails.
 
 Configuration:
     BROUTER_API_URL environment variable (default: https://brouter.de/brouter)
+    BROUTER_MAX_CONCURRENCY environment variable (default: 4) - max
+        in-flight requests to the Brouter API
 """
 
 import asyncio
 import logging
 import os
+import random
+import time
+from collections import OrderedDict
 from typing import Optional
 
 import aiohttp
+import numpy as np
+import orjson
 
-from .coordinate_utils import distance_between
+# aiohttp[speedups] extras: async DNS and Brotli decoding. Optional so the
+# service still works with a plain aiohttp install.
+try:
+    import aiodns  # noqa: F401 - required by aiohttp.AsyncResolver
+    HAS_AIODNS = True
+except ImportError:
+    HAS_AIODNS = False
+
+try:
+    import brotli  # noqa: F401 - enables aiohttp's br decoding
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+from .coordinate_utils import distance_between, path_length, simplify_path
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +43,94 @@ logger = logging.getLogger(__name__)
 DEFAULT_BROUTER_URL = "https://brouter.de/brouter"
 BROUTER_PROFILE = "trekking"
 BROUTER_TIMEOUT_SECONDS = 10
+DEFAULT_BROUTER_MAX_CONCURRENCY = 4
 BROUTER_MAX_RETRIES = 3
+BROUTER_BACKOFF_BASE_SECONDS = 1.0
+BROUTER_BACKOFF_CAP_SECONDS = 30.0
+ROUTE_CACHE_MAX_SIZE = 512
+ROUTE_CACHE_TTL_SECONDS = 3600
+ROUTE_CACHE_PRECISION = 5  # Decimal places (~1m) for cache keys
+ROUTE_SIMPLIFY_EPSILON_KM = 0.005  # Douglas-Peucker tolerance (5m)
+CONNECTOR_LIMIT = 100
+CONNECTOR_LIMIT_PER_HOST = 20
+CONNECTOR_KEEPALIVE_SECONDS = 300
+CONNECTOR_DNS_CACHE_SECONDS = 300
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+# Shared HTTP session for all BrouterService instances, so keep-alive
+# connections (and their TLS handshakes) are reused across callers.
+# Bound to the event loop it was created on.
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter backoff delay in seconds for a retry attempt.
+
+    Random delay in [0, min(cap, base * 2^attempt)] so concurrent callers
+    don't retry in lockstep against the Brouter API.
+    """
+    return random.uniform(
+        0, min(BROUTER_BACKOFF_CAP_SECONDS, BROUTER_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    )
+
+
+def _is_retryable_status(status: int) -> bool:
+    """5xx and 429 are transient; other 4xx won't succeed on retry."""
+    return status == 429 or status >= 500
+
+
+def _retire_session(
+    session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Release a session bound to another event loop.
+
+    If that loop is still running, the close is scheduled on it; otherwise
+    nothing can run there any more, so the session is detached from its
+    connector and marked closed.
+    """
+    if session.closed:
+        return
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+    else:
+        session.detach()
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get or lazily create the shared aiohttp session.
+
+    Creation has no await points, so it is atomic on the event loop and
+    concurrent callers always observe the same session. A session left
+    over from a different event loop is released before being replaced.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None:
+            _retire_session(_session, _session_loop)
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTOR_LIMIT,
+                limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+                keepalive_timeout=CONNECTOR_KEEPALIVE_SECONDS,
+                ttl_dns_cache=CONNECTOR_DNS_CACHE_SECONDS,
+                use_dns_cache=True,
+                resolver=aiohttp.AsyncResolver() if HAS_AIODNS else None,
+            ),
+            timeout=aiohttp.ClientTimeout(total=BROUTER_TIMEOUT_SECONDS),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared HTTP session. Called on shutdown."""
+    global _session, _session_loop
+    session, _session, _session_loop = _session, None, None
+    if session is not None and not session.closed:
+        await session.close()
 
 
 class BrouterService:
@@ -30,15 +138,53 @@ class BrouterService:
 
     def __init__(self):
         self._api_url = os.environ.get("BROUTER_API_URL", DEFAULT_BROUTER_URL)
-        self._session: Optional[aiohttp.ClientSession] = None
+        # Bounds upstream pressure from bursts of route requests
+        max_concurrency = int(
+            os.environ.get("BROUTER_MAX_CONCURRENCY", DEFAULT_BROUTER_MAX_CONCURRENCY)
+        )
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        # LRU of successful routes: key -> (timestamp, result)
+        self._cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create an aiohttp session."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=BROUTER_TIMEOUT_SECONDS)
-            )
-        return self._session
+        """Get the shared aiohttp session."""
+        return await get_session()
+
+    @staticmethod
+    def _cache_key(
+        start: tuple[float, float], end: tuple[float, float]
+    ) -> tuple[float, float, float, float]:
+        """Build a cache key from coordinates rounded to ~1m."""
+        return (
+            round(start[0], ROUTE_CACHE_PRECISION),
+            round(start[1], ROUTE_CACHE_PRECISION),
+            round(end[0], ROUTE_CACHE_PRECISION),
+            round(end[1], ROUTE_CACHE_PRECISION),
+        )
+
+    @staticmethod
+    def _copy_result(result: dict) -> dict:
+        """Copy a route result so callers can't mutate cached paths."""
+        return {**result, "path": [list(p) for p in result["path"]]}
+
+    def _cache_get(self, key: tuple) -> Optional[dict]:
+        """Return a cached route for key, or None if missing or expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        cached_at, result = entry
+        if time.monotonic() - cached_at > ROUTE_CACHE_TTL_SECONDS:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return self._copy_result(result)
+
+    def _cache_put(self, key: tuple, result: dict) -> None:
+        """Store a route result, evicting the least recently used entry."""
+        self._cache[key] = (time.monotonic(), self._copy_result(result))
+        self._cache.move_to_end(key)
+        while len(self._cache) > ROUTE_CACHE_MAX_SIZE:
+            self._cache.popitem(last=False)
 
     async def get_route(
         self,
@@ -47,16 +193,26 @@ class BrouterService:
     ) -> dict:
         """Calculate a hiking route between two points.
 
+        Successful Brouter routes are memoized by rounded coordinates;
+        straight-line fallbacks are never cached.
+
         Args:
             start: (latitude, longitude) of start point
             end: (latitude, longitude) of end point
 
         Returns:
             dict with:
-                path: list of [lat, lng] points
-                distance_km: total path distance
+                path: list of [lat, lng] points, Douglas-Peucker simplified
+                distance_km: total path distance (of the unsimplified path)
                 is_fallback: True if straight-line fallback was used
+                raw_points: point count before simplification (Brouter only)
         """
+        key = self._cache_key(start, end)
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.debug(f"Brouter cache hit: {len(cached['path'])} points")
+            return cached
+
         logger.info(
             f"Requesting route: ({start[0]:.5f},{start[1]:.5f}) -> "
             f"({end[0]:.5f},{end[1]:.5f})"
@@ -65,9 +221,20 @@ class BrouterService:
         path = await self._fetch_route(start, end)
 
         if path is not None:
+            # Distance from the full-resolution path; transmit the simplified one
             dist = self._calculate_path_distance(path)
-            logger.info(f"Brouter route: {len(path)} points, {dist:.2f} km")
-            return {"path": path, "distance_km": dist, "is_fallback": False}
+            simplified = simplify_path(path, ROUTE_SIMPLIFY_EPSILON_KM)
+            logger.info(
+                f"Brouter route: {len(simplified)}/{len(path)} points, {dist:.2f} km"
+            )
+            result = {
+                "path": simplified,
+                "distance_km": dist,
+                "is_fallback": False,
+                "raw_points": len(path),
+            }
+            self._cache_put(key, result)
+            return result
 
         # Fallback to straight line
         logger.warning("Brouter failed, using straight-line fallback")
@@ -100,57 +267,51 @@ class BrouterService:
                 logger.debug(
                     f"Brouter request attempt {attempt + 1}/{BROUTER_MAX_RETRIES}"
                 )
-                async with session.get(self._api_url, params=params) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        logger.warning(
-                            f"Brouter HTTP {resp.status}: {text[:200]}"
-                        )
-                        if attempt < BROUTER_MAX_RETRIES - 1:
-                            await asyncio.sleep(2 ** attempt)
-                        continue
-
-                    data = await resp.json()
-                    coords = (
-                        data.get("features", [{}])[0]
-                        .get("geometry", {})
-                        .get("coordinates", [])
-                    )
-
-                    if not coords:
-                        logger.warning("Brouter returned empty coordinates")
-                        return None
-
-                    # Brouter returns [lng, lat]; convert to [lat, lng]
-                    path = [[c[1], c[0]] for c in coords]
-                    return path
-
-            except asyncio.TimeoutError:
+                # Held per attempt only, not across the backoff sleep
+                async with self._semaphore:
+                    async with session.get(self._api_url, params=params) as resp:
+                        if resp.status != 200:
+                            text = await resp.text()
+                            logger.warning(
+                                f"Brouter HTTP {resp.status}: {text[:200]}"
+                            )
+                            if not _is_retryable_status(resp.status):
+                                return None
+                        else:
+                            data = orjson.loads(await resp.read())
+                            coords = (
+                                data.get("features", [{}])[0]
+                                .get("geometry", {})
+                                .get("coordinates", [])
+                            )
+
+                            if not coords:
+                                logger.warning("Brouter returned empty coordinates")
+                                return None
+
+                            # Brouter returns [lng, lat(, ele)]; convert to [lat, lng]
+                            path = np.asarray(coords, dtype=np.float64)[:, 1::-1].tolist()
+                            return path
+
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
                 logger.warning(
-                    f"Brouter timeout (attempt {attempt + 1}/{BROUTER_MAX_RETRIES})"
+                    f"Brouter request failed (attempt {attempt + 1}/{BROUTER_MAX_RETRIES}): "
+                    f"{e!r}"
                 )
-                if attempt < BROUTER_MAX_RETRIES - 1:
-                    await asyncio.sleep(2 ** attempt)
             except Exception as e:
-                logger.warning(
-                    f"Brouter error (attempt {attempt + 1}/{BROUTER_MAX_RETRIES}): {e}"
-                )
-                if attempt < BROUTER_MAX_RETRIES - 1:
-                    await asyncio.sleep(2 ** attempt)
+                # Malformed response or programming error - retrying won't help
+                logger.warning(f"Brouter error: {e}")
+                return None
+
+            if attempt < BROUTER_MAX_RETRIES - 1:
+                await asyncio.sleep(_backoff(attempt))
 
         return None
 
     def _calculate_path_distance(self, path: list[list[float]]) -> float:
         """Calculate total distance of a path in km."""
-        total = 0.0
-        for i in range(len(path) - 1):
-            total += distance_between(
-                path[i][0], path[i][1],
-                path[i + 1][0], path[i + 1][1],
-            )
-        return total
+        return path_length(path)
 
     async def close(self) -> None:
-        """Close the HTTP session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Close the shared HTTP session."""
+        await close_session()
@@ -5,6 +5,8 @@ Ported from src/utils/coordinateCalculator.js for backend cruise mode.
 
 import math
 
+import numpy as np
+
 EARTH_RADIUS_KM = 6371.0
 
 
@@ -105,3 +107,116 @@ def distance_between(
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
     return EARTH_RADIUS_KM * c
+
+
+def path_segment_distances(path) -> np.ndarray:
+    """Calculate the Haversine distance of every consecutive pair in a path.
+
+    Vectorized over the whole polyline, so long Brouter paths don't pay
+    per-point Python overhead.
+
+    Args:
+        path: Sequence of [lat, lng] points
+
+    Returns:
+        Array of len(path) - 1 distances in kilometers (empty if fewer
+        than 2 points)
+    """
+    if len(path) < 2:
+        return np.zeros(0, dtype=np.float64)
+
+    return radian_segment_distances(np.radians(np.asarray(path, dtype=np.float64)))
+
+
+def radian_segment_distances(coords: np.ndarray) -> np.ndarray:
+    """Haversine distances between consecutive points already in radians.
+
+    Lets callers that query the same path repeatedly convert it once.
+
+    Args:
+        coords: (N, 2) array of [lat, lng] in radians
+
+    Returns:
+        Array of N - 1 distances in kilometers (empty if N < 2)
+    """
+    if len(coords) < 2:
+        return np.zeros(0, dtype=np.float64)
+
+    lat = coords[:, 0]
+    d_lat = np.diff(lat)
+    d_lon = np.diff(coords[:, 1])
+
+    a = (np.sin(d_lat / 2) ** 2 +
+         np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(d_lon / 2) ** 2)
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def path_length(path, start_idx: int = 0) -> float:
+    """Total Haversine length of a path from start_idx to its end.
+
+    Args:
+        path: Sequence of [lat, lng] points
+        start_idx: Index of the first point to measure from
+
+    Returns:
+        Length in kilometers (0.0 if fewer than 2 points remain)
+    """
+    if len(path) - start_idx < 2:
+        return 0.0
+
+    return float(path_segment_distances(path[start_idx:]).sum())
+
+
+def simplify_path(path, epsilon_km: float) -> list[list[float]]:
+    """Simplify a polyline with the Ramer-Douglas-Peucker algorithm.
+
+    Points are projected onto a local equirectangular plane (accurate
+    enough at the few-metre tolerances used for routes), and each split
+    step is vectorized over the points of the current span.
+
+    Args:
+        path: Sequence of [lat, lng] points
+        epsilon_km: Maximum perpendicular deviation of dropped points
+
+    Returns:
+        Simplified list of [lat, lng] points; endpoints are always kept
+    """
+    n = len(path)
+    if n < 3:
+        return [list(p) for p in path]
+
+    points = np.asarray(path, dtype=np.float64)
+    radians = np.radians(points)
+    x = radians[:, 1] * math.cos(radians[:, 0].mean()) * EARTH_RADIUS_KM
+    y = radians[:, 0] * EARTH_RADIUS_KM
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # Explicit stack instead of recursion: long paths would otherwise hit
+    # the recursion limit on degenerate input
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        seg_x = x[last] - x[first]
+        seg_y = y[last] - y[first]
+        rel_x = x[first + 1:last] - x[first]
+        rel_y = y[first + 1:last] - y[first]
+        seg_len = math.hypot(seg_x, seg_y)
+        if seg_len == 0:
+            deviation = np.hypot(rel_x, rel_y)
+        else:
+            deviation = np.abs(seg_x * rel_y - seg_y * rel_x) / seg_len
+
+        i = int(np.argmax(deviation))
+        if deviation[i] > epsilon_km:
+            split = first + 1 + i
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return points[keep].tolist()
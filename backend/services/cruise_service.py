@@ -37,6 +37,9 @@ def arrival_threshold_km(speed_kmh: float) -> float:
     Combined with overshoot clamping in _cruise_loop, this ensures:
     - Short segments at slow speeds are traveled, not skipped
     - High-speed cruise converges reliably (no oscillation)
+
+    Pure and a single division, so it is not memoized: a cache lookup
+    would cost more than the computation.
     """
     if speed_kmh <= 0:
         return 0.000001  # 1mm floor for zero/negative speed
@@ -74,9 +77,9 @@ class CruiseSession:
     current_lon: float = field(init=False)
 
     # Tracking
-    start_time: float = field(default_factory=time.time)
+    start_time: float = field(default_factory=time.monotonic)
     distance_traveled_km: float = 0.0
-    last_update_time: float = field(default_factory=time.time)
+    last_update_time: float = field(default_factory=time.monotonic)
 
     # Internal
     _stop_event: threading.Event = field(default_factory=threading.Event, repr=False)
@@ -90,7 +93,7 @@ class CruiseSession:
         """Convert to dictionary for JSON serialization."""
         return {
             "deviceId": self.device_id,
-            "state": self.state.value,
+            "state": self.state._value_,
             "location": {
                 "latitude": self.current_lat,
                 "longitude": self.current_lon,
@@ -105,7 +108,7 @@ class CruiseSession:
                 self.target_lat, self.target_lon
             ),
             "distanceTraveledKm": self.distance_traveled_km,
-            "durationSeconds": time.time() - self.start_time,
+            "durationSeconds": time.monotonic() - self.start_time,
         }
 
 
@@ -336,7 +339,7 @@ class CruiseService:
                 return {"success": False, "error": f"Cannot resume: cruise is {session.state.value}"}
 
             session.state = CruiseState.RUNNING
-            session.last_update_time = time.time()  # Reset timing for smooth movement
+            session.last_update_time = time.monotonic()  # Reset timing for smooth movement
 
         logger.info(f"[{device_id[:8]}] Cruise resumed")
 
@@ -417,7 +420,7 @@ class CruiseService:
                     break
 
                 # Calculate actual elapsed time for accurate movement
-                now = time.time()
+                now = time.monotonic()
                 duration_sec = now - session.last_update_time
                 session.last_update_time = now
 
@@ -448,7 +451,7 @@ class CruiseService:
                             "longitude": session.current_lon,
                         },
                         "distanceTraveledKm": session.distance_traveled_km,
-                        "durationSeconds": time.time() - session.start_time,
+                        "durationSeconds": time.monotonic() - session.start_time,
                     }
 
                     # Check if an arrival callback is registered (e.g. RouteService)
@@ -61,7 +61,13 @@ class DeviceManager:
         simulators = self._discover_simulators()
         physical = self._discover_physical_devices()
 
-        self._devices = simulators + physical
+        # Keep the instances of unchanged devices so their cached to_dict()
+        # survives across polls; discovery builds fresh objects every time
+        previous = {device.id: device for device in self._devices}
+        self._devices = [
+            old if (old := previous.get(device.id)) == device else device
+            for device in simulators + physical
+        ]
         logger.info(f"Found {len(self._devices)} device(s): {len(simulators)} simulators, {len(physical)} physical")
 
         return self._devices
@@ -7,21 +7,114 @@ Usage:
     from services.event_bus import event_bus
     
     # Publisher (e.g., CruiseService)
-    event_bus.publish_sync({"event": "cruiseUpdate", "data": {...}})
+    event_bus.publish_sync({"event": "cruiseStarted", "data": {...}})
+
+    # High-frequency state updates can be coalesced: a slow subscriber
+    # keeps only the latest pending event per key instead of a backlog
+    event_bus.publish_sync(
+        {"event": "cruiseUpdate", "data": {...}},
+        coalesce_key="cruiseUpdate:<deviceId>",
+    )
     
-    # Subscriber (SSE endpoint)
-    async for event in event_bus.subscribe():
-        yield format_sse(event)
+    # Subscriber (SSE endpoint) - frames are encoded once per publish,
+    # not once per subscriber
+    async for frame in event_bus.subscribe_sse():
+        await response.write(frame)
 """
 
 import asyncio
-import json
 import logging
+from collections import deque
 from typing import AsyncGenerator, Optional
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
+# NumPy arrays/scalars (e.g. route polylines) serialize natively
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def encode_json(obj) -> bytes:
+    """Encode an event or RPC payload as JSON bytes."""
+    return orjson.dumps(obj, option=JSON_OPTIONS)
+
+
+def format_sse(event: dict) -> bytes:
+    """Encode an event as a data-only SSE frame."""
+    return b"data: " + encode_json(event) + b"\n\n"
+
+
+class _CoalescedSlot:
+    """Queue placeholder whose event is replaced by newer same-key events."""
+
+    __slots__ = ("key", "event")
+
+    def __init__(self, key: str, event: tuple):
+        self.key = key
+        self.event = event
+
+
+class _Subscriber:
+    """Per-subscriber bounded event queue with optional coalescing by key.
+
+    When the queue is full the oldest pending item is dropped, so a slow
+    subscriber converges on the latest state instead of stalling on stale
+    updates. Coalesced events occupy a single slot in the queue; publishing
+    another event with the same key overwrites the slot's event in place.
+    Queueing a non-coalesced event seals all open slots, so a newer
+    coalesced event is never delivered ahead of an event published before it.
+    """
+
+    def __init__(self, max_queue_size: int):
+        self._items: deque = deque(maxlen=max_queue_size)
+        self._ready = asyncio.Event()
+        self._open_slots: dict[str, _CoalescedSlot] = {}
+
+    def put_nowait(self, event: Optional[tuple], coalesce_key: Optional[str] = None) -> None:
+        """Queue an (event, frame) pair, dropping the oldest item if full."""
+        if coalesce_key is None:
+            self._append(event)
+            self._open_slots.clear()
+            return
+
+        slot = self._open_slots.get(coalesce_key)
+        if slot is not None:
+            slot.event = event
+            return
+
+        slot = _CoalescedSlot(coalesce_key, event)
+        self._append(slot)
+        self._open_slots[coalesce_key] = slot
+
+    def _append(self, item) -> None:
+        """Append an item and wake the consumer."""
+        items = self._items
+        if len(items) == items.maxlen:
+            # Evict explicitly so a dropped slot stops accepting updates
+            self._close_slot(items.popleft())
+        items.append(item)
+        self._ready.set()
+
+    def _close_slot(self, item) -> None:
+        """Stop coalescing into item if it is an open slot."""
+        if isinstance(item, _CoalescedSlot) and self._open_slots.get(item.key) is item:
+            del self._open_slots[item.key]
+
+    async def get(self) -> Optional[tuple]:
+        """Wait for and return the next (event, frame) pair, or None on close."""
+        items = self._items
+        while not items:
+            self._ready.clear()
+            await self._ready.wait()
+        item = items.popleft()
+        if isinstance(item, _CoalescedSlot):
+            self._close_slot(item)
+            return item.event
+        return item
+
+
 class EventBus:
     """
     Central event bus that distributes events to all SSE subscribers.
@@ -38,7 +131,9 @@ class EventBus:
             max_queue_size: Maximum events to queue per subscriber.
                            Older events are dropped if queue is full.
         """
-        self._subscribers: set[asyncio.Queue] = set()
+        # Copy-on-write: subscribe/unsubscribe swap in a new tuple under the
+        # lock, so publish can iterate the current snapshot without locking.
+        self._subscribers: tuple[_Subscriber, ...] = ()
         self._lock = asyncio.Lock()
         self._max_queue_size = max_queue_size
         self._loop: Optional[asyncio.AbstractEventLoop] = None
@@ -55,7 +150,7 @@ class EventBus:
         self._loop = loop
         logger.debug("Event bus bound to event loop")
 
-    async def subscribe(self) -> AsyncGenerator[dict, None]:
+    async def subscribe(self) -> AsyncGenerator[Optional[dict], None]:
         """Subscribe to events. Yields events as they arrive.
         
         Usage:
@@ -64,65 +159,103 @@ class EventBus:
                 pass
         
         Yields:
-            Event dictionaries with 'event' and 'data' keys
+            Event dictionaries with 'event' and 'data' keys (None on close)
+        """
+        async for item in self._subscription():
+            yield item if item is None else item[0]
+
+    async def subscribe_sse(self) -> AsyncGenerator[Optional[bytes], None]:
+        """Subscribe to events as pre-encoded SSE frames.
+
+        Yields:
+            ``data: <json>\\n\\n`` frames as bytes (None on close)
         """
-        queue: asyncio.Queue = asyncio.Queue(maxsize=self._max_queue_size)
+        async for item in self._subscription():
+            yield item if item is None else item[1]
+
+    async def _subscription(self) -> AsyncGenerator[Optional[tuple], None]:
+        """Register a subscriber queue and yield its (event, frame) pairs."""
+        subscriber = _Subscriber(self._max_queue_size)
         
         async with self._lock:
-            self._subscribers.add(queue)
+            self._subscribers = self._subscribers + (subscriber,)
         
         subscriber_count = len(self._subscribers)
         logger.info(f"SSE client connected (total subscribers: {subscriber_count})")
         
         try:
             while True:
-                event = await queue.get()
-                yield event
+                yield await subscriber.get()
         except asyncio.CancelledError:
             logger.debug("SSE subscriber cancelled")
             raise
         finally:
             async with self._lock:
-                self._subscribers.discard(queue)
+                self._subscribers = tuple(
+                    sub for sub in self._subscribers if sub is not subscriber
+                )
             subscriber_count = len(self._subscribers)
             logger.info(f"SSE client disconnected (total subscribers: {subscriber_count})")
     
-    async def publish(self, event: dict) -> int:
+    async def publish(self, event: dict, coalesce_key: Optional[str] = None) -> int:
         """Publish an event to all subscribers.
-        
+
         Args:
             event: Event dictionary to publish
+            coalesce_key: If set, replaces any still-pending event with the
+                          same key in each subscriber queue
             
         Returns:
             Number of subscribers that received the event
         """
-        delivered = 0
-        
-        async with self._lock:
-            for queue in self._subscribers:
-                try:
-                    # Use put_nowait to avoid blocking
-                    queue.put_nowait(event)
-                    delivered += 1
-                except asyncio.QueueFull:
-                    # Drop event for slow subscriber
-                    logger.warning("Subscriber queue full, dropping event")
-        
-        return delivered
+        return self._deliver(event, coalesce_key)
+
+    def _deliver(self, event: dict, coalesce_key: Optional[str] = None) -> int:
+        """Put an event on every subscriber queue. Must run on the event loop.
+
+        Lock-free: iterates the current subscriber snapshot. Safe because
+        the event loop is single-threaded and the tuple is never mutated.
+        The SSE frame is encoded once here and shared by all subscribers.
+
+        Returns:
+            Number of subscribers that received the event
+        """
+        subscribers = self._subscribers
+        if not subscribers:
+            return 0
+
+        try:
+            item = (event, format_sse(event))
+        except TypeError as e:
+            logger.error(f"Cannot encode event {event.get('event')}: {e}")
+            return 0
+
+        # Never blocks or fails: full queues drop their oldest item
+        for subscriber in subscribers:
+            subscriber.put_nowait(item, coalesce_key)
+
+        return len(subscribers)
     
-    def publish_sync(self, event: dict) -> None:
-        """Synchronous publish - schedules async publish on the event loop.
+    def publish_sync(self, event: dict, coalesce_key: Optional[str] = None) -> None:
+        """Synchronous publish - delivers the event on the event loop.
 
         Thread-safe: can be called from any thread. Uses call_soon_threadsafe
-        to schedule the coroutine on the main event loop.
+        to run delivery as a plain callback on the main event loop, without
+        creating a task per event.
 
         Args:
             event: Event dictionary to publish
+            coalesce_key: Optional coalescing key (see publish)
         """
-        if self._loop is None or self._loop.is_closed():
+        loop = self._loop
+        if loop is None or loop.is_closed():
             logger.debug("Cannot publish event: no event loop bound (call set_loop first)")
             return
-        self._loop.call_soon_threadsafe(self._loop.create_task, self.publish(event))
+        try:
+            loop.call_soon_threadsafe(self._deliver, event, coalesce_key)
+        except RuntimeError:
+            # Loop closed between the check and the call (shutdown race)
+            logger.debug("Cannot publish event: event loop is closed")
     
     @property
     def subscriber_count(self) -> int:
@@ -133,13 +266,10 @@ class EventBus:
         """Close the event bus and disconnect all subscribers."""
         async with self._lock:
             # Clear all subscriber queues
-            for queue in self._subscribers:
-                # Put None to signal shutdown (optional)
-                try:
-                    queue.put_nowait(None)
-                except asyncio.QueueFull:
-                    pass
-            self._subscribers.clear()
+            for subscriber in self._subscribers:
+                # Put None to signal shutdown
+                subscriber.put_nowait(None)
+            self._subscribers = ()
         logger.info("Event bus closed")
 
 
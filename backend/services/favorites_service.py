@@ -2,27 +2,63 @@
 
 import logging
 import os
+import threading
+from collections import Counter
 from pathlib import Path
 from typing import List, Optional
 from dataclasses import dataclass
 
-logger = logging.getLogger(__name__)
+from models import generate_serializers
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+FLUSH_INTERVAL = 2.0
+DUPLICATE_PRECISION = 6  # Decimal places (~0.1m) for duplicate detection
+
+
+def _parse_line(line: str, _float=float) -> Optional[tuple]:
+    """Parse a favorites line into (latitude, longitude, name) or None.
+
+    Format is latitude,longitude[,name]; the name may itself contain commas.
+    Hot path for loading/importing large files, so numbers are parsed by
+    float() directly (it tolerates the surrounding whitespace itself).
+    Builtins are bound as default args to skip global lookups.
+    """
+    parts = line.split(",", 2)
+    if len(parts) < 2:
+        return None
+    lat_text, lon_text = parts[0], parts[1]
+    # float() also accepts digit separators, which the format does not
+    if "_" in lat_text or "_" in lon_text:
+        return None
+    try:
+        latitude = _float(lat_text)
+        longitude = _float(lon_text)
+    except ValueError:
+        return None
+    name = parts[2].strip() if len(parts) == 3 else None
+
+    # Validate coordinates (also rejects float()'s nan/inf spellings)
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        return None
+
+    if name is None:
+        name = f"{latitude}, {longitude}"
+    return latitude, longitude, name
+
+
+@generate_serializers({
+    "latitude": "self.latitude",
+    "longitude": "self.longitude",
+    "name": "self.name",
+})
+@dataclass(slots=True)
 class Favorite:
     """A favorite location."""
     latitude: float
     longitude: float
     name: str
 
-    def to_dict(self) -> dict:
-        return {
-            "latitude": self.latitude,
-            "longitude": self.longitude,
-            "name": self.name,
-        }
-
     def to_line(self) -> str:
         """Convert to file line format: latitude,longitude,name"""
         return f"{self.latitude},{self.longitude},{self.name}"
@@ -30,26 +66,26 @@ class Favorite:
     @classmethod
     def from_line(cls, line: str) -> Optional["Favorite"]:
         """Parse a line from favorites file. Returns None if invalid."""
-        line = line.strip()
-        if not line:
+        parsed = _parse_line(line)
+        if parsed is None:
             return None
+        return cls(latitude=parsed[0], longitude=parsed[1], name=parsed[2])
 
-        parts = line.split(",", 2)  # Split into at most 3 parts
-        if len(parts) < 2:
-            return None
 
-        try:
-            latitude = float(parts[0].strip())
-            longitude = float(parts[1].strip())
-            name = parts[2].strip() if len(parts) > 2 else f"{latitude}, {longitude}"
+def _coordinate_key(latitude: float, longitude: float) -> tuple[float, float]:
+    """Key identifying favorites at the same location."""
+    return (round(latitude, DUPLICATE_PRECISION), round(longitude, DUPLICATE_PRECISION))
 
-            # Validate coordinates
-            if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
-                return None
 
-            return cls(latitude=latitude, longitude=longitude, name=name)
-        except (ValueError, IndexError):
-            return None
+def _read_favorites(path: Path) -> List[Favorite]:
+    """Read and parse a favorites file, skipping invalid lines.
+
+    Single read + splitlines instead of per-line file iteration.
+    """
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8", errors="replace")
+    from_line = Favorite.from_line
+    return [favorite for line in text.splitlines() if (favorite := from_line(line))]
 
 
 class FavoritesService:
@@ -71,11 +107,23 @@ class FavoritesService:
 
         self._file_path = self._data_dir / self.DEFAULT_FILENAME
         self._favorites: List[Favorite] = []
+        # Coordinate key -> count, for O(1) duplicate checks. Counted rather
+        # than a plain set since a hand-edited file may contain duplicates.
+        self._index: Counter[tuple[float, float]] = Counter()
 
         # Ensure directory exists and load favorites
         self._ensure_file_exists()
         self._load()
 
+        # Debounced disk writes: bulk add/import marks dirty, flushed periodically
+        self._dirty = False
+        # Set while the latest flush failed; the next change reports it
+        self._save_failed = False
+        self._save_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+
     @property
     def file_path(self) -> Path:
         """Get the favorites file path."""
@@ -94,29 +142,85 @@ class FavoritesService:
     def _load(self) -> None:
         """Load favorites from file."""
         self._favorites = []
+        self._index = Counter()
         try:
             if self._file_path.exists():
-                with open(self._file_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        favorite = Favorite.from_line(line)
-                        if favorite:
-                            self._favorites.append(favorite)
+                self._favorites = _read_favorites(self._file_path)
+                self._index = Counter(
+                    _coordinate_key(f.latitude, f.longitude) for f in self._favorites
+                )
                 logger.info(f"Loaded {len(self._favorites)} favorites from {self._file_path}")
         except OSError as e:
             logger.error(f"Failed to load favorites: {e}")
 
     def _save(self) -> bool:
-        """Save favorites to file."""
+        """Save favorites to file.
+
+        Builds the whole file in memory, writes it to a temp file in one
+        call and renames it over the target, so a crash mid-write never
+        leaves a truncated file behind.
+        """
+        tmp_path = self._file_path.with_suffix(".txt.tmp")
         try:
-            with open(self._file_path, "w", encoding="utf-8") as f:
-                for favorite in self._favorites:
-                    f.write(favorite.to_line() + "\n")
+            with self._save_lock:
+                # Snapshot under the lock so a later save never writes older
+                # data; list() guards against add() on another thread
+                data = "".join([f"{favorite.to_line()}\n" for favorite in list(self._favorites)])
+                with open(tmp_path, "wb") as f:
+                    f.write(data.encode("utf-8"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self._file_path)
             logger.debug(f"Saved {len(self._favorites)} favorites")
             return True
         except OSError as e:
             logger.error(f"Failed to save favorites: {e}")
             return False
 
+    def _mark_dirty(self) -> None:
+        """Schedule a write of the current favorites on the next flush."""
+        self._dirty = True
+
+    def _flush_loop(self) -> None:
+        """Background loop that periodically writes dirty data to disk."""
+        while not self._stop_event.is_set():
+            self._stop_event.wait(FLUSH_INTERVAL)
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        """Write pending changes, keeping them pending if the write fails."""
+        if self._dirty:
+            # Cleared before saving so changes made during the write are
+            # picked up by the next flush
+            self._dirty = False
+            if self._save():
+                self._save_failed = False
+            else:
+                self._dirty = True
+                self._save_failed = True
+
+    def _save_error(self) -> Optional[dict]:
+        """Error result if pending changes still can't be written, else None.
+
+        Changes are acknowledged before the debounced write, so a failed
+        flush is reported by the next change instead, after one more try.
+        """
+        if self._save_failed:
+            self._flush_pending()
+            if self._save_failed:
+                return {"success": False, "error": "Failed to save favorites file"}
+        return None
+
+    def flush(self) -> None:
+        """Immediately write to disk if there are pending changes."""
+        self._flush_pending()
+
+    def close(self) -> None:
+        """Stop the flush thread and write any pending changes."""
+        self._stop_event.set()
+        self._flush_thread.join(timeout=2)
+        self.flush()
+
     def get_all(self) -> List[Favorite]:
         """Get all favorites."""
         return self._favorites.copy()
@@ -134,17 +238,22 @@ class FavoritesService:
         if not (-180 <= longitude <= 180):
             return {"success": False, "error": "Invalid longitude (must be -180 to 180)"}
 
+        key = _coordinate_key(latitude, longitude)
+        if key in self._index:
+            return {"success": False, "error": "A favorite already exists at this location"}
+
+        error = self._save_error()
+        if error:
+            return error
+
         name = name.strip() if name else f"{latitude}, {longitude}"
 
         favorite = Favorite(latitude=latitude, longitude=longitude, name=name)
         self._favorites.append(favorite)
+        self._index[key] += 1
+        self._mark_dirty()
 
-        if self._save():
-            return {"success": True, "favorite": favorite.to_dict()}
-        else:
-            # Rollback
-            self._favorites.pop()
-            return {"success": False, "error": "Failed to save favorites file"}
+        return {"success": True, "favorite": favorite.to_dict()}
 
     def update(self, index: int, name: str) -> dict:
         """
@@ -160,15 +269,14 @@ class FavoritesService:
         if not name:
             return {"success": False, "error": "Name cannot be empty"}
 
-        old_name = self._favorites[index].name
+        error = self._save_error()
+        if error:
+            return error
+
         self._favorites[index].name = name
+        self._mark_dirty()
 
-        if self._save():
-            return {"success": True, "favorite": self._favorites[index].to_dict()}
-        else:
-            # Rollback
-            self._favorites[index].name = old_name
-            return {"success": False, "error": "Failed to save favorites file"}
+        return {"success": True, "favorite": self._favorites[index].to_dict()}
 
     def delete(self, index: int) -> dict:
         """
@@ -180,49 +288,78 @@ class FavoritesService:
         if index < 0 or index >= len(self._favorites):
             return {"success": False, "error": f"Invalid index: {index}"}
 
+        error = self._save_error()
+        if error:
+            return error
+
         removed = self._favorites.pop(index)
+        key = _coordinate_key(removed.latitude, removed.longitude)
+        self._index[key] -= 1
+        if self._index[key] <= 0:
+            del self._index[key]
+        self._mark_dirty()
 
-        if self._save():
-            return {"success": True}
-        else:
-            # Rollback
-            self._favorites.insert(index, removed)
-            return {"success": False, "error": "Failed to save favorites file"}
+        return {"success": True}
 
     def import_from_file(self, file_path: str) -> dict:
         """
         Import favorites from another file (appends to existing).
 
+        Entries at the location of an existing favorite (or of an earlier
+        entry in the same file) are skipped.
+
         Returns:
-            dict with 'success', 'imported' count, and optionally 'error'
+            dict with 'success', 'imported' and 'duplicates' counts, and
+            optionally 'error'
         """
         path = Path(file_path)
         if not path.exists():
             return {"success": False, "error": f"File not found: {file_path}"}
 
-        imported = []
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    favorite = Favorite.from_line(line)
-                    if favorite:
-                        imported.append(favorite)
+            imported = _read_favorites(path)
         except OSError as e:
             return {"success": False, "error": f"Failed to read file: {e}"}
 
         if not imported:
             return {"success": False, "error": "No valid favorites found in file"}
 
-        self._favorites.extend(imported)
-
-        if self._save():
-            return {"success": True, "imported": len(imported)}
-        else:
+        index = self._index
+        new_favorites = []
+        for favorite in imported:
+            key = _coordinate_key(favorite.latitude, favorite.longitude)
+            if key not in index:
+                index[key] += 1
+                new_favorites.append(favorite)
+        duplicates = len(imported) - len(new_favorites)
+
+        if not new_favorites:
+            return {"success": False, "error": "All favorites in file already exist"}
+
+        # One synchronous write for the whole batch, not one per imported line
+        self._favorites.extend(new_favorites)
+        self._mark_dirty()
+        self._flush_pending()
+        if self._save_failed:
             # Rollback
-            for _ in imported:
-                self._favorites.pop()
+            del self._favorites[-len(new_favorites):]
+            for favorite in new_favorites:
+                key = _coordinate_key(favorite.latitude, favorite.longitude)
+                index[key] -= 1
+                if index[key] <= 0:
+                    del index[key]
             return {"success": False, "error": "Failed to save favorites file"}
 
+        return {"success": True, "imported": len(new_favorites), "duplicates": duplicates}
+
     def reload(self) -> None:
-        """Reload favorites from file."""
+        """Reload favorites from file, writing pending changes first.
+
+        If they can't be written, the in-memory favorites are kept rather
+        than replaced by the older file contents.
+        """
+        self._flush_pending()
+        if self._save_failed:
+            logger.warning("Not reloading favorites: pending changes could not be saved")
+            return
         self._load()
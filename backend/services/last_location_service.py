@@ -4,11 +4,15 @@ Persists the last set location per device to disk, allowing locations
 to be restored when the app restarts.
 """
 
+import asyncio
 import json
 import logging
+import os
 import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -33,17 +37,19 @@ class LastLocationService:
             self._data_dir = Path.home() / ".location-simulator"
 
         self._file_path = self._data_dir / self.DEFAULT_FILENAME
-        self._locations: Dict[str, dict] = {}  # device_id -> {"lat": float, "lon": float}
+        # device_id -> (lat, lon); tuples keep hot cruise updates allocation-light
+        self._locations: Dict[str, Tuple[float, float]] = {}
 
         # Ensure directory exists and load data
         self._ensure_dir_exists()
         self._load()
 
-        # Debounced disk writes: mark dirty and flush periodically
+        # Debounced disk writes: mark dirty and flush periodically once start()
+        # has bound an event loop
         self._dirty = False
-        self._stop_event = threading.Event()
-        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
-        self._flush_thread.start()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._save_lock = threading.Lock()
 
     @property
     def file_path(self) -> Path:
@@ -68,44 +74,75 @@ class LastLocationService:
                     if isinstance(data, dict):
                         for device_id, loc in data.items():
                             if isinstance(loc, dict) and "lat" in loc and "lon" in loc:
-                                self._locations[device_id] = {
-                                    "lat": float(loc["lat"]),
-                                    "lon": float(loc["lon"]),
-                                }
+                                self._locations[device_id] = (
+                                    float(loc["lat"]),
+                                    float(loc["lon"]),
+                                )
                 logger.info(f"Loaded last locations for {len(self._locations)} devices")
         except (OSError, json.JSONDecodeError) as e:
             logger.error(f"Failed to load last locations: {e}")
 
     def _save(self) -> bool:
-        """Save last locations to file."""
+        """Save last locations to file.
+
+        Writes to a temp file and renames it over the target so a crash
+        mid-write never leaves a truncated file behind.
+        """
+        tmp_path = self._file_path.with_suffix(".json.tmp")
         try:
             self._ensure_dir_exists()
-            with open(self._file_path, "w", encoding="utf-8") as f:
-                json.dump(self._locations, f, indent=2)
+            with self._save_lock:
+                # Snapshot under the lock so an executor save holding older
+                # data can't land after a newer flush; list() guards against
+                # update() on another thread
+                data = {
+                    device_id: {"lat": lat, "lon": lon}
+                    for device_id, (lat, lon) in list(self._locations.items())
+                }
+                with open(tmp_path, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self._file_path)
             logger.debug(f"Saved last locations for {len(self._locations)} devices")
             return True
         except OSError as e:
             logger.error(f"Failed to save last locations: {e}")
             return False
 
-    def _flush_loop(self) -> None:
-        """Background loop that periodically writes dirty data to disk."""
-        while not self._stop_event.is_set():
-            self._stop_event.wait(FLUSH_INTERVAL)
-            if self._dirty:
-                self._save()
-                self._dirty = False
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start periodic flushing on the given event loop.
 
-    def flush(self) -> None:
-        """Immediately write to disk if there are pending changes."""
+        Args:
+            loop: The running asyncio event loop
+        """
+        self._loop = loop
+        self._flush_handle = loop.call_later(FLUSH_INTERVAL, self._flush_tick)
+
+    def _flush_tick(self) -> None:
+        """Timer callback: write dirty data off-loop, then re-arm."""
         if self._dirty:
-            self._save()
+            self._loop.run_in_executor(None, self._flush_pending)
+        self._flush_handle = self._loop.call_later(FLUSH_INTERVAL, self._flush_tick)
+
+    def _flush_pending(self) -> None:
+        """Write pending changes, keeping them pending if the write fails."""
+        if self._dirty:
+            # Cleared before saving so updates made during the write are
+            # picked up by the next flush
             self._dirty = False
+            if not self._save():
+                self._dirty = True
+
+    def flush(self) -> None:
+        """Immediately write to disk if there are pending changes."""
+        self._flush_pending()
 
     def close(self) -> None:
-        """Stop the flush thread and write any pending changes."""
-        self._stop_event.set()
-        self._flush_thread.join(timeout=2)
+        """Stop periodic flushing and write any pending changes."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
         self.flush()
 
     def update(self, device_id: str, lat: float, lon: float) -> bool:
@@ -120,7 +157,7 @@ class LastLocationService:
         Returns:
             True if saved successfully, False otherwise
         """
-        self._locations[device_id] = {"lat": lat, "lon": lon}
+        self._locations[device_id] = (lat, lon)
         self._dirty = True
         return True
 
@@ -134,6 +171,21 @@ class LastLocationService:
         Returns:
             Dict with "lat" and "lon" keys, or None if not found
         """
+        loc = self._locations.get(device_id)
+        if loc is None:
+            return None
+        return {"lat": loc[0], "lon": loc[1]}
+
+    def get_tuple(self, device_id: str) -> Optional[Tuple[float, float]]:
+        """
+        Get the last location for a device without allocating a dict.
+
+        Args:
+            device_id: The device identifier
+
+        Returns:
+            (lat, lon) tuple, or None if not found
+        """
         return self._locations.get(device_id)
 
     def get_all(self) -> Dict[str, dict]:
@@ -143,7 +195,10 @@ class LastLocationService:
         Returns:
             Dict mapping device_id to location dict
         """
-        return self._locations.copy()
+        return {
+            device_id: {"lat": lat, "lon": lon}
+            for device_id, (lat, lon) in self._locations.items()
+        }
 
     def delete(self, device_id: str) -> bool:
         """
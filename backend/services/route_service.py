@@ -21,17 +21,28 @@ Hybrid sync/async design:
 """
 
 import logging
+import math
 import time
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional, Callable
 
-from .coordinate_utils import distance_between
+import numpy as np
+
+from .coordinate_utils import EARTH_RADIUS_KM, path_segment_distances
 from .cruise_service import CruiseService, arrival_threshold_km
 from .brouter_service import BrouterService
 
 logger = logging.getLogger(__name__)
 
+# Minimum interval between per-point routeUpdate events for one session.
+# State transitions (segment/loop complete, arrived, pause/resume) always emit
+ROUTE_UPDATE_MIN_INTERVAL_S = 0.1
+
+# A single skip over more sub-threshold points than this means a degenerate
+# (over-dense) polyline; it is still O(1) but worth a warning
+LONG_SKIP_WARN_POINTS = 1000
+
 
 class RouteState(str, Enum):
     """Route cruise session state."""
@@ -42,7 +53,7 @@ class RouteState(str, Enum):
     STOPPED = "stopped"
 
 
-@dataclass
+@dataclass(slots=True)
 class Waypoint:
     """A waypoint in the route."""
     lat: float
@@ -53,49 +64,119 @@ class Waypoint:
         return {"lat": self.lat, "lng": self.lng, "name": self.name}
 
 
-@dataclass
+# eq=False: the generated __eq__ would compare the path ndarrays, whose
+# elementwise result has no truth value. Identity equality also keeps
+# comparisons of Route/RouteSession (which hold segment lists) working.
+@dataclass(slots=True, eq=False)
 class RouteSegment:
     """A segment of the route between two waypoints."""
     from_waypoint: int  # Index into Route.waypoints
     to_waypoint: int
-    path: list[list[float]]  # [[lat, lng], ...]
+    path: np.ndarray  # (N, 2) float64 [[lat, lng], ...]
     distance_km: float
     is_closure: bool = False
     is_fallback: bool = False
+    # cum_dist_km[i] = distance along path from path[0] to path[i]. Built
+    # once at construction: segment geometry never changes during a cruise
+    cum_dist_km: np.ndarray = field(init=False, repr=False, compare=False)
+    # cos(latitude) for equirectangular threshold checks along this segment
+    cos_lat: float = field(init=False, repr=False, compare=False)
+    # Endpoints as plain-float (lat, lng) tuples for bridge/rollover handling
+    first_point: Optional[tuple[float, float]] = field(init=False, repr=False, compare=False)
+    last_point: Optional[tuple[float, float]] = field(init=False, repr=False, compare=False)
+    # (threshold_km, next_step) where next_step[i] is the first pair index
+    # >= i at least threshold_km long. Rebuilt only when the speed changes
+    _next_step_cache: Optional[tuple[float, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Contiguous float64 storage; nested lists only at the JSON boundary
+        self.path = np.asarray(self.path, dtype=np.float64).reshape(-1, 2)
+        self.cum_dist_km = _cumulative_distances(self.path)
+        self.cos_lat = _cos_lat(self.path)
+        if len(self.path):
+            self.first_point = tuple(self.path[0].tolist())
+            self.last_point = tuple(self.path[-1].tolist())
+        else:
+            self.first_point = self.last_point = None
 
     def to_dict(self) -> dict:
         return {
             "fromWaypoint": self.from_waypoint,
             "toWaypoint": self.to_waypoint,
-            "path": self.path,
+            "path": self.path.tolist(),
             "distanceKm": self.distance_km,
             "isClosure": self.is_closure,
             "isFallback": self.is_fallback,
         }
 
+    def next_travel_step(self, step: int, threshold_km: float) -> int:
+        """Skip point pairs shorter than the arrival threshold.
+
+        The skip target for every step is precomputed once per threshold,
+        so each arrival is a single table lookup.
 
-@dataclass
+        Returns:
+            First step >= step whose pair is at least threshold_km long, or
+            len(path) - 1 if the rest of the path is too short to travel
+        """
+        last = len(self.path) - 1
+        if step >= last:
+            return step
+
+        cached = self._next_step_cache
+        if cached is None or cached[0] != threshold_km:
+            cached = (threshold_km, _next_step_table(self.path, threshold_km, self.cos_lat))
+            self._next_step_cache = cached
+        return int(cached[1][step])
+
+
+@dataclass(slots=True)
 class Route:
     """A multi-waypoint route."""
     waypoints: list[Waypoint] = field(default_factory=list)
     segments: list[RouteSegment] = field(default_factory=list)
     loop_mode: bool = False
     total_distance_km: float = 0.0
+    # Serialized form; None when waypoints/segments changed since last to_dict
+    _dict_cache: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def invalidate(self) -> None:
+        """Drop the cached to_dict() result after mutating the route."""
+        self._dict_cache = None
 
     def recalculate_distance(self) -> None:
         """Recalculate total distance from segments."""
         self.total_distance_km = sum(s.distance_km for s in self.segments)
+        self.invalidate()
 
     def to_dict(self) -> dict:
-        return {
-            "waypoints": [w.to_dict() for w in self.waypoints],
-            "segments": [s.to_dict() for s in self.segments],
-            "loopMode": self.loop_mode,
-            "totalDistanceKm": self.total_distance_km,
-        }
+        """Serialize the route.
+
+        The result is cached and shared between calls (every routeUpdate
+        embeds it), so callers must not mutate it.
+        """
+        cached = self._dict_cache
+        if cached is None:
+            cached = {
+                "waypoints": [w.to_dict() for w in self.waypoints],
+                "segments": [s.to_dict() for s in self.segments],
+                "loopMode": self.loop_mode,
+                "totalDistanceKm": self.total_distance_km,
+            }
+            self._dict_cache = cached
+        return cached
+
 
+# Serialized empty route for undo/clear/status responses. Shared like any
+# Route.to_dict() result, so it must not be mutated
+_EMPTY_ROUTE_DICT = Route().to_dict()
 
-@dataclass
+
+@dataclass(slots=True)
 class RouteSession:
     """Per-device route cruise session state.
 
@@ -115,16 +196,24 @@ class RouteSession:
     loops_completed: int = 0
 
     # Bridge cruise: smooth transition between segment endpoints
-    bridge_from: Optional[list[float]] = None  # [lat, lng] — last point of completed segment
+    bridge_from: Optional[tuple[float, float]] = None  # (lat, lng) — last point of completed segment
     is_bridging: bool = False  # True during a bridge cruise
 
     # Reroute state (temporary path from joystick/direct position to next waypoint)
-    reroute_path: Optional[list[list[float]]] = None
+    reroute_segment: Optional[RouteSegment] = None
     reroute_step: int = 0
 
     # Tracking
-    start_time: float = field(default_factory=time.time)
+    start_time: float = field(default_factory=time.monotonic)
     distance_traveled_km: float = 0.0
+    # time.monotonic() of the last per-point routeUpdate (throttling)
+    last_update_emit: float = field(default=0.0, repr=False)
+
+    # arrival_threshold_km(speed_kmh), cached: speed only changes via set_route_speed
+    _arrival_threshold_km: float = field(init=False, repr=False, default=0.0)
+
+    def __post_init__(self) -> None:
+        self._arrival_threshold_km = arrival_threshold_km(self.speed_kmh)
 
     def remaining_distance_km(self) -> float:
         """Calculate remaining distance in current iteration."""
@@ -132,25 +221,28 @@ class RouteSession:
         segments = self.route.segments
 
         if self.current_segment_index < len(segments):
-            # Remaining in current segment
-            seg = segments[self.current_segment_index]
-            path = seg.path
-            for i in range(self.current_step_in_segment, len(path) - 1):
-                remaining += distance_between(
-                    path[i][0], path[i][1],
-                    path[i + 1][0], path[i + 1][1],
-                )
+            # Remaining in current segment: two lookups into the precomputed
+            # cumulative distances
+            cum = segments[self.current_segment_index].cum_dist_km
+            step = min(self.current_step_in_segment, len(cum) - 1)
+            remaining += float(cum[-1] - cum[step])
 
             # Full remaining segments
-            for i in range(self.current_segment_index + 1, len(segments)):
-                remaining += segments[i].distance_km
+            remaining += sum(
+                s.distance_km for s in segments[self.current_segment_index + 1:]
+            )
 
         return remaining
 
-    def to_dict(self) -> dict:
+    def progress_dict(self) -> dict:
+        """Progression state without the route geometry.
+
+        Used for frequent progress events: the frontend already has the
+        route from routeStarted/routeWaypointAdded.
+        """
         return {
             "deviceId": self.device_id,
-            "state": self.state.value,
+            "state": self.state._value_,
             "speedKmh": self.speed_kmh,
             "currentSegmentIndex": self.current_segment_index,
             "currentStepInSegment": self.current_step_in_segment,
@@ -159,14 +251,58 @@ class RouteSession:
             "distanceTraveledKm": self.distance_traveled_km,
             "remainingDistanceKm": self.remaining_distance_km(),
             "totalSegments": len(self.route.segments),
-            "route": self.route.to_dict(),
         }
 
+    def to_dict(self) -> dict:
+        data = self.progress_dict()
+        data["route"] = self.route.to_dict()
+        return data
+
 
 # Type for event emitter callback
 EventEmitter = Callable[[dict], None]
 
 
+def _cos_lat(path: list[list[float]]) -> float:
+    """cos(latitude) of a path's first point (stable over short segments)."""
+    return math.cos(math.radians(path[0][0])) if len(path) else 1.0
+
+
+def _cheap_dist2_km2(
+    lat1: float, lng1: float, lat2: float, lng2: float, coslat: float
+) -> float:
+    """Squared equirectangular distance in km^2.
+
+    Accurate to well under a metre at the few-metre scales used for
+    arrival-threshold checks, without Haversine's trig calls.
+    """
+    d_lat = math.radians(lat2 - lat1)
+    d_lng = math.radians(lng2 - lng1) * coslat
+    return (d_lat * d_lat + d_lng * d_lng) * (EARTH_RADIUS_KM * EARTH_RADIUS_KM)
+
+
+def _cumulative_distances(path: np.ndarray) -> np.ndarray:
+    """cum[i] = distance along path from path[0] to path[i], in km."""
+    return np.concatenate(([0.0], np.cumsum(path_segment_distances(path))))
+
+
+def _next_step_table(path: np.ndarray, threshold_km: float, coslat: float) -> np.ndarray:
+    """next_step[i] = first pair index >= i at least threshold_km long.
+
+    Pair lengths use the same equirectangular approximation as
+    _cheap_dist2_km2; indices with no such pair map to len(path) - 1.
+    """
+    last = len(path) - 1
+    radians = np.radians(path)
+    d_lat = np.diff(radians[:, 0])
+    d_lng = np.diff(radians[:, 1]) * coslat
+    dist2 = (d_lat * d_lat + d_lng * d_lng) * (EARTH_RADIUS_KM * EARTH_RADIUS_KM)
+
+    table = np.where(dist2 >= threshold_km * threshold_km, np.arange(last), last)
+    # Suffix minimum: each index points at the nearest travelable pair ahead
+    return np.minimum.accumulate(table[::-1])[::-1]
+
+
 class RouteService:
     """Service for managing route cruise sessions.
 
@@ -220,6 +356,7 @@ class RouteService:
         if len(route.waypoints) == 0:
             wp = Waypoint(lat=lat, lng=lng, name="START")
             route.waypoints.append(wp)
+            route.invalidate()
             logger.info(f"[{device_id[:8]}] Route: START set at ({lat:.5f},{lng:.5f})")
             self._emit("routeWaypointAdded", {
                 "deviceId": device_id,
@@ -251,6 +388,7 @@ class RouteService:
         )
         route.waypoints.append(wp)
         route.segments.append(segment)
+        route.invalidate()
 
         # If loop mode is ON, recalculate closure
         if route.loop_mode and len(route.waypoints) >= 2:
@@ -291,9 +429,9 @@ class RouteService:
             logger.info(f"[{device_id[:8]}] Route: undo START, route cleared")
             self._emit("routeWaypointAdded", {
                 "deviceId": device_id,
-                "route": Route().to_dict(),
+                "route": _EMPTY_ROUTE_DICT,
             })
-            return {"success": True, "route": Route().to_dict()}
+            return {"success": True, "route": _EMPTY_ROUTE_DICT}
 
         # Remove closure segment if present
         if route.loop_mode and route.segments and route.segments[-1].is_closure:
@@ -303,6 +441,7 @@ class RouteService:
         route.waypoints.pop()
         if route.segments:
             route.segments.pop()
+        route.invalidate()
 
         # Recalculate closure if loop mode is ON and we have enough waypoints
         if route.loop_mode and len(route.waypoints) >= 2:
@@ -334,6 +473,7 @@ class RouteService:
             self._routes[device_id] = route
 
         route.loop_mode = enabled
+        route.invalidate()
         session = self._sessions.get(device_id)
 
         if enabled and len(route.waypoints) >= 2:
@@ -370,7 +510,7 @@ class RouteService:
 
         logger.info(f"[{device_id[:8]}] Route: cleared")
 
-        return {"success": True, "route": Route().to_dict()}
+        return {"success": True, "route": _EMPTY_ROUTE_DICT}
 
     def get_route(self, device_id: str) -> Optional[dict]:
         """Get route definition for a device, or None if no route exists."""
@@ -388,7 +528,7 @@ class RouteService:
         session = self._sessions.get(device_id)
 
         result = {
-            "route": route.to_dict() if route else Route().to_dict(),
+            "route": route.to_dict() if route else _EMPTY_ROUTE_DICT,
         }
 
         if session:
@@ -416,6 +556,7 @@ class RouteService:
             is_fallback=result["is_fallback"],
         )
         route.segments.append(closure)
+        route.invalidate()
 
     # =========================================================================
     # Route Cruise API (sync - CruiseService is sync)
@@ -453,7 +594,7 @@ class RouteService:
         self._sessions[device_id] = session
 
         # Register arrival callback
-        self._cruise_service.on_arrival(device_id, self._on_point_arrival)
+        self._cruise_service.on_arrival(device_id, self._arrival_callback(session))
 
         # Feed first point pair
         self._start_next_point_pair(session)
@@ -464,9 +605,11 @@ class RouteService:
             f"at {speed_kmh}km/h"
         )
 
-        self._emit("routeStarted", session.to_dict())
+        session_dict = session.to_dict()
 
-        return {"success": True, "session": session.to_dict()}
+        self._emit("routeStarted", session_dict)
+
+        return {"success": True, "session": session_dict}
 
     def pause_route_cruise(self, device_id: str) -> dict:
         """Pause route cruise."""
@@ -482,7 +625,7 @@ class RouteService:
 
         logger.info(f"[{device_id[:8]}] Route cruise paused")
 
-        self._emit("routeUpdate", session.to_dict())
+        self._emit("routeUpdate", session.progress_dict())
 
         return {"success": True, "session": session.to_dict()}
 
@@ -500,7 +643,7 @@ class RouteService:
 
         logger.info(f"[{device_id[:8]}] Route cruise resumed")
 
-        self._emit("routeUpdate", session.to_dict())
+        self._emit("routeUpdate", session.progress_dict())
 
         return {"success": True, "session": session.to_dict()}
 
@@ -518,7 +661,7 @@ class RouteService:
 
         logger.info(f"[{device_id[:8]}] Route cruise stopped")
 
-        self._emit("routeUpdate", session.to_dict())
+        self._emit("routeUpdate", session.progress_dict())
 
         return {"success": True}
 
@@ -544,13 +687,14 @@ class RouteService:
                 "error": f"Cannot reroute: route is {session.state.value}",
             }
 
-        segments = session.route.segments
+        route = session.route
+        segments = route.segments
         if session.current_segment_index >= len(segments):
             return {"success": False, "error": "Route has no remaining segments"}
 
         # Find target waypoint of current segment
         seg = segments[session.current_segment_index]
-        target_wp = session.route.waypoints[seg.to_waypoint]
+        target_wp = route.waypoints[seg.to_waypoint]
 
         logger.info(
             f"[{device_id[:8]}] Rerouting from ({current_lat:.5f},{current_lng:.5f}) "
@@ -563,19 +707,25 @@ class RouteService:
         )
 
         # Set reroute path - _start_next_point_pair will process this first
-        session.reroute_path = result["path"]
+        session.reroute_segment = RouteSegment(
+            from_waypoint=seg.from_waypoint,
+            to_waypoint=seg.to_waypoint,
+            path=result["path"],
+            distance_km=result["distance_km"],
+            is_fallback=result["is_fallback"],
+        )
         session.reroute_step = 0
         session.state = RouteState.RUNNING
 
         # Ensure arrival callback is registered
-        self._cruise_service.on_arrival(device_id, self._on_point_arrival)
+        self._cruise_service.on_arrival(device_id, self._arrival_callback(session))
 
         # Start feeding point pairs from reroute path (sync call)
         self._start_next_point_pair(session)
 
         logger.info(f"[{device_id[:8]}] Route cruise rerouted and resumed")
 
-        self._emit("routeUpdate", session.to_dict())
+        self._emit("routeUpdate", session.progress_dict())
 
         return {"success": True, "session": session.to_dict()}
 
@@ -587,6 +737,7 @@ class RouteService:
 
         speed_kmh = max(0.1, speed_kmh)
         session.speed_kmh = speed_kmh
+        session._arrival_threshold_km = arrival_threshold_km(speed_kmh)
         self._cruise_service.set_cruise_speed(device_id, speed_kmh)
 
         logger.debug(f"[{device_id[:8]}] Route cruise speed set to {speed_kmh}km/h")
@@ -603,42 +754,140 @@ class RouteService:
     # =========================================================================
 
     def _start_next_point_pair(self, session: RouteSession) -> None:
-        """Feed the next point pair from the polyline to CruiseService."""
-        # Handle reroute path first (from joystick/direct mode deviation)
-        if session.reroute_path is not None:
-            path = session.reroute_path
-            step = session.reroute_step
-
-            if step >= len(path) - 1:
-                # Reroute complete, advance to next segment
-                session.bridge_from = path[-1]
-                session.reroute_path = None
-                session.reroute_step = 0
-                session.current_segment_index += 1
-                session.current_step_in_segment = 0
-                session.segments_completed += 1
-                logger.debug(
-                    f"[{session.device_id[:8]}] Reroute segment complete, "
-                    f"advancing to segment {session.current_segment_index}"
+        """Feed the next point pair from the polyline to CruiseService.
+
+        Loops (rather than recursing) over skipped pairs, segment boundaries
+        and loop rollovers until a pair is handed to CruiseService or the
+        route is complete, so dense polylines can't exhaust the stack.
+        """
+        # A loop that rolls over twice without feeding a pair has nothing
+        # to travel (every pair is under the threshold) - stop instead of spinning
+        rolled_over = False
+        # Bound once: this runs on the cruise thread for every point arrival
+        cruise = self._cruise_service
+        device_id = session.device_id
+        route = session.route
+        while True:
+            # Handle reroute path first (from joystick/direct mode deviation)
+            if session.reroute_segment is not None:
+                reroute = session.reroute_segment
+                path = reroute.path
+
+                # Skip pairs closer than arrival threshold (5m) - auto-advance
+                step = reroute.next_travel_step(
+                    session.reroute_step, session._arrival_threshold_km
+                )
+                self._check_long_skip(session, session.reroute_step, step)
+                session.reroute_step = step
+
+                if step >= len(path) - 1:
+                    # Reroute complete, advance to next segment
+                    session.bridge_from = reroute.last_point
+                    session.reroute_segment = None
+                    session.reroute_step = 0
+                    session.current_segment_index += 1
+                    session.current_step_in_segment = 0
+                    session.segments_completed += 1
+                    logger.debug(
+                        f"[{device_id[:8]}] Reroute segment complete, "
+                        f"advancing to segment {session.current_segment_index}"
+                    )
+                    self._emit("routeSegmentComplete", session.progress_dict())
+                    continue
+
+                current_pt = path[step].tolist()
+                next_pt = path[step + 1].tolist()
+
+                cruise.start_cruise(
+                    device_id=device_id,
+                    start_lat=current_pt[0],
+                    start_lon=current_pt[1],
+                    target_lat=next_pt[0],
+                    target_lon=next_pt[1],
+                    speed_kmh=session.speed_kmh,
                 )
-                self._emit("routeSegmentComplete", session.to_dict())
-                self._start_next_point_pair(session)
                 return
 
-            current_pt = path[step]
-            next_pt = path[step + 1]
+            segments = route.segments
+
+            # Check if all segments are traversed
+            if session.current_segment_index >= len(segments):
+                if route.loop_mode and not rolled_over:
+                    rolled_over = True
+                    session.bridge_from = segments[-1].last_point
+                    session.current_segment_index = 0
+                    session.current_step_in_segment = 0
+                    session.loops_completed += 1
+                    logger.info(
+                        f"[{device_id[:8]}] Route loop {session.loops_completed} complete"
+                    )
+                    self._emit("routeLoopComplete", session.progress_dict())
+                    # Continue with first segment
+                    continue
+                else:
+                    # Route complete
+                    session.state = RouteState.ARRIVED
+                    cruise.remove_arrival_callback(device_id)
+                    # Clean up CruiseService session (we're inside its callback)
+                    cruise.cleanup_session(device_id)
+                    self._sessions.pop(device_id, None)
+                    logger.info(
+                        f"[{device_id[:8]}] Route arrived after "
+                        f"{session.distance_traveled_km:.2f}km"
+                    )
+                    self._emit("routeArrived", session.to_dict())
+                    return
+
+            # Bridge cruise: smooth transition between segment endpoints
+            if session.bridge_from is not None:
+                from_lat, from_lng = session.bridge_from
+                session.bridge_from = None
+
+                seg = segments[session.current_segment_index]
+                to_lat, to_lng = seg.first_point
+                gap2 = _cheap_dist2_km2(from_lat, from_lng, to_lat, to_lng, seg.cos_lat)
+                threshold_km = session._arrival_threshold_km
+
+                if gap2 >= threshold_km * threshold_km:
+                    session.is_bridging = True
+                    cruise.start_cruise(
+                        device_id=device_id,
+                        start_lat=from_lat, start_lon=from_lng,
+                        target_lat=to_lat, target_lon=to_lng,
+                        speed_kmh=session.speed_kmh,
+                    )
+                    return
+                # Gap < 5m — fall through to normal processing
+
+            segment = segments[session.current_segment_index]
+            coordinates = segment.path
 
             # Skip pairs closer than arrival threshold (5m) - auto-advance
-            dist = distance_between(
-                current_pt[0], current_pt[1], next_pt[0], next_pt[1]
+            step = segment.next_travel_step(
+                session.current_step_in_segment, session._arrival_threshold_km
             )
-            if dist < arrival_threshold_km(session.speed_kmh):
-                session.reroute_step += 1
-                self._start_next_point_pair(session)
-                return
+            self._check_long_skip(session, session.current_step_in_segment, step)
+            session.current_step_in_segment = step
+
+            if step >= len(coordinates) - 1:
+                # Segment polyline exhausted, advance to next segment
+                session.bridge_from = segment.last_point
+                session.current_segment_index += 1
+                session.current_step_in_segment = 0
+                session.segments_completed += 1
+                logger.debug(
+                    f"[{device_id[:8]}] Segment {session.segments_completed} complete"
+                )
+                self._emit("routeSegmentComplete", session.progress_dict())
+                # Start next segment
+                continue
 
-            self._cruise_service.start_cruise(
-                device_id=session.device_id,
+            # Feed point pair to CruiseService (as plain floats)
+            current_pt = coordinates[step].tolist()
+            next_pt = coordinates[step + 1].tolist()
+
+            cruise.start_cruise(
+                device_id=device_id,
                 start_lat=current_pt[0],
                 start_lon=current_pt[1],
                 target_lat=next_pt[0],
@@ -647,94 +896,23 @@ class RouteService:
             )
             return
 
-        segments = session.route.segments
-
-        # Check if all segments are traversed
-        if session.current_segment_index >= len(segments):
-            if session.route.loop_mode:
-                session.bridge_from = segments[-1].path[-1]
-                session.current_segment_index = 0
-                session.current_step_in_segment = 0
-                session.loops_completed += 1
-                logger.info(
-                    f"[{session.device_id[:8]}] Route loop {session.loops_completed} complete"
-                )
-                self._emit("routeLoopComplete", session.to_dict())
-                # Continue with first segment
-                self._start_next_point_pair(session)
-                return
-            else:
-                # Route complete
-                session.state = RouteState.ARRIVED
-                self._cruise_service.remove_arrival_callback(session.device_id)
-                # Clean up CruiseService session (we're inside its callback)
-                self._cruise_service.cleanup_session(session.device_id)
-                del self._sessions[session.device_id]
-                logger.info(
-                    f"[{session.device_id[:8]}] Route arrived after "
-                    f"{session.distance_traveled_km:.2f}km"
-                )
-                self._emit("routeArrived", session.to_dict())
-                return
-
-        # Bridge cruise: smooth transition between segment endpoints
-        if session.bridge_from is not None:
-            bridge_from = session.bridge_from
-            session.bridge_from = None
-
-            seg = segments[session.current_segment_index]
-            bridge_to = seg.path[0]
-            gap = distance_between(bridge_from[0], bridge_from[1], bridge_to[0], bridge_to[1])
-
-            if gap >= arrival_threshold_km(session.speed_kmh):
-                session.is_bridging = True
-                self._cruise_service.start_cruise(
-                    device_id=session.device_id,
-                    start_lat=bridge_from[0], start_lon=bridge_from[1],
-                    target_lat=bridge_to[0], target_lon=bridge_to[1],
-                    speed_kmh=session.speed_kmh,
-                )
-                return
-            # Gap < 5m — fall through to normal processing
-
-        segment = segments[session.current_segment_index]
-        coordinates = segment.path
-        step = session.current_step_in_segment
-
-        if step >= len(coordinates) - 1:
-            # Segment polyline exhausted, advance to next segment
-            session.bridge_from = coordinates[-1]
-            session.current_segment_index += 1
-            session.current_step_in_segment = 0
-            session.segments_completed += 1
-            logger.debug(
-                f"[{session.device_id[:8]}] Segment {session.segments_completed} complete"
+    def _check_long_skip(self, session: RouteSession, start: int, step: int) -> None:
+        """Warn when one skip jumps over a degenerate run of short pairs."""
+        if step - start > LONG_SKIP_WARN_POINTS:
+            logger.warning(
+                f"[{session.device_id[:8]}] Skipped {step - start} points shorter "
+                f"than the arrival threshold - polyline is unusually dense"
             )
-            self._emit("routeSegmentComplete", session.to_dict())
-            # Recurse to start next segment
-            self._start_next_point_pair(session)
-            return
-
-        # Feed point pair to CruiseService
-        current_pt = coordinates[step]
-        next_pt = coordinates[step + 1]
 
-        # Skip pairs closer than arrival threshold (5m) - auto-advance
-        dist = distance_between(
-            current_pt[0], current_pt[1], next_pt[0], next_pt[1]
-        )
-        if dist < arrival_threshold_km(session.speed_kmh):
-            session.current_step_in_segment += 1
-            self._start_next_point_pair(session)
-            return
+    def _arrival_callback(self, session: RouteSession) -> Callable[[str, dict], None]:
+        """Build the CruiseService arrival callback bound to a session.
 
-        self._cruise_service.start_cruise(
-            device_id=session.device_id,
-            start_lat=current_pt[0],
-            start_lon=current_pt[1],
-            target_lat=next_pt[0],
-            target_lon=next_pt[1],
-            speed_kmh=session.speed_kmh,
+        Capturing the session skips a _sessions lookup on every point
+        arrival. A removed session is always STOPPED or ARRIVED, so the
+        state check in _on_point_arrival_bound covers stale callbacks.
+        """
+        return lambda _device_id, cruise_status: self._on_point_arrival_bound(
+            session, cruise_status
         )
 
     def _on_point_arrival(
@@ -742,7 +920,14 @@ class RouteService:
     ) -> None:
         """Called by CruiseService when it arrives at the current target point."""
         session = self._sessions.get(device_id)
-        if not session or session.state != RouteState.RUNNING:
+        if session:
+            self._on_point_arrival_bound(session, cruise_status)
+
+    def _on_point_arrival_bound(
+        self, session: RouteSession, cruise_status: dict
+    ) -> None:
+        """Advance a known session after arriving at its current target point."""
+        if session.state != RouteState.RUNNING:
             return
 
         # Track distance from this point pair
@@ -754,13 +939,17 @@ class RouteService:
         if session.is_bridging:
             session.is_bridging = False
             # Bridge done — don't advance step; normal processing starts from step 0
-        elif session.reroute_path is not None:
+        elif session.reroute_segment is not None:
             session.reroute_step += 1
         else:
             session.current_step_in_segment += 1
 
-        # Emit progress update
-        self._emit("routeUpdate", session.to_dict())
+        # Emit progress update, throttled: dense polylines at high speed
+        # would otherwise serialize the session on every point
+        now = time.monotonic()
+        if now - session.last_update_emit >= ROUTE_UPDATE_MIN_INTERVAL_S:
+            session.last_update_emit = now
+            self._emit("routeUpdate", session.progress_dict())
 
         # Feed next point pair
         self._start_next_point_pair(session)
@@ -1,36 +1,83 @@
 """RSD tunnel management for iOS 17+ devices.
 
 TunnelManager queries tunneld for tunnel connections.
-It does NOT cache tunnel info - each get_tunnel() call queries tunneld fresh.
+Tunnel info is only memoized for TUNNEL_MEMO_TTL (a fraction of a second) so
+bursts of get_tunnel() calls collapse into one tunneld query.
 """
 
-import json
+import http.client
 import logging
 import os
+import socket
 import subprocess
 import sys
+import threading
 import time
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Callable, Optional
 
+import orjson
+
+# Optional: reads Windows process command lines without spawning wmic
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
 from models import RSDTunnel, TunnelState, TunnelStatus
+from .event_bus import format_sse
 
 logger = logging.getLogger(__name__)
 
 # Default tunneld port
 TUNNELD_DEFAULT_PORT = 49151
 TUNNELD_QUERY_TIMEOUT = 10  # seconds
+TUNNELD_PROBE_TIMEOUT = 0.5  # seconds; liveness probe, local daemon answers fast
+TUNNELD_CONNECT_TIMEOUT = 0.5  # seconds; localhost connect either works at once or not at all
+TUNNELD_HEADERS = {"Accept": "application/json", "Connection": "keep-alive"}
+TUNNEL_MEMO_TTL = 0.25  # seconds; short enough to be effectively fresh
+TUNNELD_SNAPSHOT_TTL = 0.2  # seconds; one tunneld GET serves all devices
+TUNNELD_START_BUDGET = 15.0  # seconds; readiness wait after launch (admin prompt not counted)
+TUNNELD_START_BUDGET_LINUX = 10.0  # seconds
+TUNNELD_READY_DELAY_MIN = 0.01  # seconds; first backoff step
+TUNNELD_READY_DELAY_MAX = 0.5  # seconds; backoff cap
+
+# Toolhelp process snapshot flag (tlhelp32.h) and python image names
+TH32CS_SNAPPROCESS = 0x00000002
+PYTHON_EXE_NAMES = ("python.exe", "pythonw.exe")
 
 
 class TunnelManager:
     """
     Manages pymobiledevice3 lockdown tunnels for iOS 17+ devices.
 
-    Each get_tunnel() call queries tunneld for fresh tunnel info.
-    No caching - tunneld is the source of truth.
+    get_tunnel() queries tunneld for fresh tunnel info, memoized per device
+    for TUNNEL_MEMO_TTL. tunneld remains the source of truth.
     """
 
-    def __init__(self):
+    PYTHON_PATH_FILENAME = "python_path"
+
+    # Key spellings used for tunnel info across tunneld versions, in priority order
+    _ADDRESS_KEYS = ("tunnel-address", "address", "tunnel_address", "rsd_address")
+    _PORT_KEYS = ("tunnel-port", "port", "tunnel_port", "rsd_port")
+
+    def __init__(self, data_dir: Optional[str] = None):
+        """
+        Initialize the tunnel manager.
+
+        Args:
+            data_dir: Directory for the cached interpreter path.
+                Defaults to ~/.location-simulator/
+        """
+        if data_dir:
+            self._data_dir = Path(data_dir)
+        else:
+            self._data_dir = Path.home() / ".location-simulator"
+        # Python interpreter with pymobiledevice3, resolved once
+        self._python_path: Optional[str] = None
+
         # Track last known state for UI display
         self._last_status: dict[str, TunnelState] = {}
         # Track last error for UI display
@@ -38,23 +85,87 @@ class TunnelManager:
         # Tunneld daemon state: "starting", "ready", or "error"
         self._tunneld_state: str = "starting"
         self._tunneld_error: Optional[str] = None
+        # tunneldStatus SSE frame for the current state, re-encoded only
+        # after the state changes; guarded by _status_lock with the state
+        self._status_lock = threading.Lock()
+        self._status_dirty = True
+        self._status_bytes = b""
+        # Background ensure_tunneld() run, at most one at a time
+        self._startup_thread: Optional[threading.Thread] = None
+        self._startup_lock = threading.Lock()
         # Event emitter callback for SSE (set by main.py)
         self._event_emitter: Optional[Callable[[dict], None]] = None
+        # Keep-alive HTTP connection to tunneld, shared by polling threads
+        self._http: Optional[http.client.HTTPConnection] = None
+        self._http_lock = threading.Lock()
+        # Short-lived get_tunnel() memo: udid -> (monotonic time, tunnel)
+        self._tunnel_cache: dict[str, tuple[float, Optional[RSDTunnel]]] = {}
+        # Per-device locks so concurrent callers share one tunneld query
+        self._fetch_locks: dict[str, threading.Lock] = {}
+        self._fetch_locks_lock = threading.Lock()
+        # Last parsed tunneld response (it lists every device at once)
+        self._snapshot: Optional[tuple[float, dict]] = None
+        self._snapshot_lock = threading.Lock()
+        # udid -> differently formatted tunneld key it partially matched
+        self._udid_aliases: dict[str, str] = {}
 
     def set_event_emitter(self, emitter: Callable[[dict], None]) -> None:
-        """Set the event emitter callback for SSE events."""
+        """Set the event emitter callback for SSE events.
+
+        Called from whichever thread runs ensure_tunneld(), so the emitter
+        must be thread-safe and must not block on SSE consumers.
+        main.py passes EventBus.publish_sync, which only schedules delivery
+        on the event loop.
+        """
         self._event_emitter = emitter
 
+    def _tunneld_status_event(self) -> dict:
+        data = {"state": self._tunneld_state}
+        if self._tunneld_error:
+            data["error"] = self._tunneld_error
+        return {"event": "tunneldStatus", "data": data}
+
     def _emit_tunneld_status(self, state: str, error: str = None) -> None:
         """Emit tunneldStatus SSE event."""
-        self._tunneld_state = state
-        self._tunneld_error = error
+        with self._status_lock:
+            self._tunneld_state = state
+            self._tunneld_error = error
+            self._status_dirty = True
+            event = self._tunneld_status_event()
         if self._event_emitter:
-            event = {"event": "tunneldStatus", "data": {"state": state}}
-            if error:
-                event["data"]["error"] = error
             self._event_emitter(event)
 
+    def get_status_bytes(self) -> bytes:
+        """Current tunneld state as an encoded tunneldStatus SSE frame.
+
+        Sent to every SSE client on connect; the frame is cached and only
+        re-encoded after _emit_tunneld_status() changes the state.
+        """
+        with self._status_lock:
+            if self._status_dirty:
+                self._status_bytes = format_sse(self._tunneld_status_event())
+                self._status_dirty = False
+            return self._status_bytes
+
+    def start_tunneld_check(self) -> str:
+        """Run ensure_tunneld() in a background thread and return at once.
+
+        The admin prompt alone can block for a minute, so callers don't wait
+        for the outcome; it arrives as tunneldStatus SSE events. If a check
+        is already in progress it is left to finish instead of starting a
+        second one (and a second admin prompt).
+
+        Returns:
+            "starting"
+        """
+        with self._startup_lock:
+            if self._startup_thread is None or not self._startup_thread.is_alive():
+                self._startup_thread = threading.Thread(
+                    target=self.ensure_tunneld, daemon=True
+                )
+                self._startup_thread.start()
+        return "starting"
+
     def ensure_tunneld(self) -> str:
         """Check if tunneld is running, start it if not.
 
@@ -108,11 +219,8 @@ class TunnelManager:
                 logger.warning(f"tunneld returned: {stderr}")
 
             # Wait for tunneld to become responsive
-            time.sleep(2)
-            for _ in range(26):  # ~13 seconds
-                if self._is_tunneld_running():
-                    return True
-                time.sleep(0.5)
+            if self._wait_ready(TUNNELD_START_BUDGET):
+                return True
             self._last_error = "Tunnel did not become available"
             return False
         except subprocess.TimeoutExpired:
@@ -129,11 +237,8 @@ class TunnelManager:
                 ["pkexec", python_path, "-m", "pymobiledevice3", "remote", "tunneld", "-d"],
                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
             )
-            time.sleep(2)
-            for _ in range(16):  # ~8 seconds
-                if self._is_tunneld_running():
-                    return True
-                time.sleep(0.5)
+            if self._wait_ready(TUNNELD_START_BUDGET_LINUX):
+                return True
             self._last_error = "Tunnel did not become available"
             return False
         except Exception as e:
@@ -175,26 +280,47 @@ class TunnelManager:
                     return False
 
             # Wait for tunneld to become responsive
-            time.sleep(2)
-            for _ in range(26):  # ~13 seconds
-                if self._is_tunneld_running():
-                    return True
-                time.sleep(0.5)
+            if self._wait_ready(TUNNELD_START_BUDGET):
+                return True
             self._last_error = "Tunnel did not become available"
             return False
         except Exception as e:
             self._last_error = str(e)
             return False
 
+    def _wait_ready(self, budget: float) -> bool:
+        """Wait up to budget seconds for a freshly started tunneld to answer.
+
+        Polls with exponential backoff. A plain TCP connect is tried first,
+        and the HTTP liveness check only runs once the port accepts.
+        """
+        deadline = time.monotonic() + budget
+        delay = TUNNELD_READY_DELAY_MIN
+        while time.monotonic() < deadline:
+            if _port_open(TUNNELD_DEFAULT_PORT) and self._is_tunneld_running():
+                return True
+            time.sleep(delay)
+            delay = min(delay * 2, TUNNELD_READY_DELAY_MAX)
+        return False
+
     # =========================================================================
     # Public API
     # =========================================================================
 
+    def _fetch_lock(self, udid: str) -> threading.Lock:
+        """Get the per-device fetch lock, creating it on first use."""
+        lock = self._fetch_locks.get(udid)
+        if lock is None:
+            with self._fetch_locks_lock:
+                lock = self._fetch_locks.setdefault(udid, threading.Lock())
+        return lock
+
     def get_tunnel(self, udid: str) -> Optional[RSDTunnel]:
         """
         Get tunnel for device by querying tunneld.
 
-        Always queries tunneld for fresh info - no caching.
+        Results are memoized for TUNNEL_MEMO_TTL; concurrent callers for
+        the same device wait for a single in-flight query.
         Returns tunnel info if found, None otherwise.
 
         This method does NOT require admin password - it only queries
@@ -203,16 +329,31 @@ class TunnelManager:
         if not udid:
             logger.warning("get_tunnel called without UDID")
             return None
+        # UDIDs arrive as fresh strings per request; interned, the per-device
+        # dict lookups below match on identity
+        udid = sys.intern(udid)
+
+        cached = self._tunnel_cache.get(udid)
+        if cached and time.monotonic() - cached[0] < TUNNEL_MEMO_TTL:
+            return cached[1]
 
-        # Query tunneld for current tunnel info
-        tunnel = self._query_tunneld_http(udid)
+        with self._fetch_lock(udid):
+            # Another thread may have fetched while we waited
+            cached = self._tunnel_cache.get(udid)
+            if cached and time.monotonic() - cached[0] < TUNNEL_MEMO_TTL:
+                return cached[1]
 
+            # Query tunneld for current tunnel info
+            tunnel = self._query_tunneld_http(udid)
+            self._tunnel_cache[udid] = (time.monotonic(), tunnel)
+
+        # Lazy %-formatting: this runs on every poll with debug usually off
         if tunnel:
-            logger.debug(f"[{udid[:8]}] Tunnel found: {tunnel.address}:{tunnel.port}")
+            logger.debug("[%.8s] Tunnel found: %s:%s", udid, tunnel.address, tunnel.port)
             # Update last known status
             self._update_status(udid, TunnelStatus.CONNECTED, tunnel)
         else:
-            logger.debug(f"[{udid[:8]}] No tunnel found in tunneld")
+            logger.debug("[%.8s] No tunnel found in tunneld", udid)
             self._update_status(udid, TunnelStatus.NO_TUNNEL, None)
 
         return tunnel
@@ -258,15 +399,25 @@ class TunnelManager:
         Mark tunnel as disconnected after a connection failure.
         Called by main.py when location operation fails.
 
-        Since we don't cache, this just updates the UI status.
-        Next get_tunnel() will query tunneld fresh anyway.
+        Drops the memoized tunnel and tunneld snapshot so the next
+        get_tunnel() queries tunneld.
         """
+        self._tunnel_cache.pop(udid, None)
+        self._snapshot = None
         if udid in self._last_status:
             state = self._last_status[udid]
             state.status = TunnelStatus.DISCONNECTED
             state.error = "Connection failed"
+            state.invalidate()
             logger.info(f"[{udid[:8]}] Tunnel marked as disconnected")
 
+    def close(self) -> None:
+        """Close the keep-alive connection to tunneld. Called on shutdown."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
     # =========================================================================
     # Internal Helpers
     # =========================================================================
@@ -279,6 +430,7 @@ class TunnelManager:
         error: str = None
     ) -> None:
         """Update last known status for UI display."""
+        udid = sys.intern(udid)
         if udid not in self._last_status:
             self._last_status[udid] = TunnelState(udid=udid)
 
@@ -288,33 +440,115 @@ class TunnelManager:
         state.error = error
         if status == TunnelStatus.CONNECTED:
             state.last_validated = time.time()
+        state.invalidate()
 
     # =========================================================================
     # Tunnel Discovery (Query tunneld)
     # =========================================================================
 
+    def _tunneld_get(self, timeout: float = TUNNELD_QUERY_TIMEOUT) -> bytes:
+        """GET tunneld's HTTP API root over a persistent connection.
+
+        The connection is reused across calls (HTTP keep-alive) instead of
+        paying a TCP handshake per query. If tunneld dropped the idle
+        connection, the request is retried once on a fresh one.
+
+        Connecting uses the short TUNNELD_CONNECT_TIMEOUT; timeout only
+        bounds the request/response, so a dead port fails fast while a slow
+        answer from a live daemon still gets the full budget.
+
+        Returns:
+            Response body
+
+        Raises:
+            OSError or http.client.HTTPException if tunneld can't be reached
+            or doesn't answer with a success status
+        """
+        with self._http_lock:
+            for attempt in range(2):
+                if self._http is None:
+                    self._http = http.client.HTTPConnection(
+                        "127.0.0.1", TUNNELD_DEFAULT_PORT
+                    )
+                conn = self._http
+
+                try:
+                    if conn.sock is None:
+                        conn.timeout = min(TUNNELD_CONNECT_TIMEOUT, timeout)
+                        conn.connect()
+                    conn.timeout = timeout
+                    conn.sock.settimeout(timeout)
+                    conn.request("GET", "/", headers=TUNNELD_HEADERS)
+                    response = conn.getresponse()
+                    body = response.read()
+                except (http.client.BadStatusLine, ConnectionResetError, BrokenPipeError):
+                    # Stale keep-alive connection (RemoteDisconnected is both)
+                    conn.close()
+                    self._http = None
+                    if attempt:
+                        raise
+                    continue
+                except Exception:
+                    conn.close()
+                    self._http = None
+                    raise
+
+                if response.will_close:
+                    conn.close()
+                    self._http = None
+                if response.status >= 400:
+                    raise http.client.HTTPException(
+                        f"tunneld returned HTTP {response.status}"
+                    )
+                return body
+
+    def _fetch_tunneld_snapshot(self) -> Optional[dict]:
+        """Get tunneld's device -> tunnels mapping, cached for TUNNELD_SNAPSHOT_TTL.
+
+        tunneld returns every device in one response, so looking up N
+        devices costs one GET and one parse instead of N.
+
+        Returns:
+            Parsed response, or None if tunneld can't be queried
+        """
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot and time.monotonic() - snapshot[0] < TUNNELD_SNAPSHOT_TTL:
+                return snapshot[1]
+
+            try:
+                # orjson parses the raw bytes directly, no decode step
+                data = orjson.loads(self._tunneld_get())
+            except Exception as e:
+                logger.debug(f"Tunneld query failed: {e}")
+                return None
+
+            if not isinstance(data, dict):
+                return None
+            self._snapshot = (time.monotonic(), data)
+            return data
+
     def _query_tunneld_http(self, udid: str) -> Optional[RSDTunnel]:
         """Query tunneld via HTTP API for specific device."""
         try:
-            url = f"http://127.0.0.1:{TUNNELD_DEFAULT_PORT}/"
-            req = urllib.request.Request(url, method='GET')
-            req.add_header('Accept', 'application/json')
-
-            with urllib.request.urlopen(req, timeout=TUNNELD_QUERY_TIMEOUT) as response:
-                response_text = response.read().decode('utf-8')
-
-            data = json.loads(response_text)
+            data = self._fetch_tunneld_snapshot()
 
-            if not isinstance(data, dict) or len(data) == 0:
+            if not data:
                 return None
 
             # Find matching device
             if udid in data:
                 return self._extract_tunnel_info(data[udid], udid)
 
+            # A partial match found earlier stays valid across snapshots
+            alias = self._udid_aliases.get(udid)
+            if alias in data:
+                return self._extract_tunnel_info(data[alias], udid)
+
             # Try partial match (some systems use different UDID formats)
             for device_udid, device_info in data.items():
                 if udid in device_udid or device_udid in udid:
+                    self._udid_aliases[udid] = device_udid
                     return self._extract_tunnel_info(device_info, udid)
 
             return None
@@ -334,15 +568,9 @@ class TunnelManager:
         if not isinstance(device_info, dict):
             return None
 
-        # Try various key names
-        address = (device_info.get('tunnel-address') or
-                   device_info.get('address') or
-                   device_info.get('tunnel_address') or
-                   device_info.get('rsd_address'))
-        port = (device_info.get('tunnel-port') or
-                device_info.get('port') or
-                device_info.get('tunnel_port') or
-                device_info.get('rsd_port'))
+        # First non-empty value among the known key spellings
+        address = next(filter(None, map(device_info.get, self._ADDRESS_KEYS)), None)
+        port = next(filter(None, map(device_info.get, self._PORT_KEYS)), None)
 
         if address and port:
             return RSDTunnel(address=str(address), port=int(port), udid=udid)
@@ -353,22 +581,36 @@ class TunnelManager:
         """Check if tunneld process is running.
 
         First tries querying the tunneld HTTP API (cross-platform).
-        Falls back to platform-specific process checks.
+        A refused connection means nothing listens on the tunneld port, so
+        only ambiguous failures (timeouts, bad responses) fall back to the
+        slower platform-specific process checks.
         """
         # Fast path: try HTTP API (works on all platforms)
         try:
-            url = f"http://127.0.0.1:{TUNNELD_DEFAULT_PORT}/"
-            req = urllib.request.Request(url, method='GET')
-            req.add_header('Accept', 'application/json')
-            with urllib.request.urlopen(req, timeout=TUNNELD_QUERY_TIMEOUT) as response:
-                response.read()
+            self._tunneld_get(timeout=TUNNELD_PROBE_TIMEOUT)
             return True
+        except ConnectionRefusedError:
+            return False
         except Exception:
             pass
 
         # Fallback: platform-specific process check
         try:
+            if sys.platform == "linux":
+                return _proc_has_tunneld()
+            if sys.platform == "win32" and HAS_PSUTIL:
+                return any(
+                    "tunneld" in " ".join(proc.info["cmdline"] or [])
+                    for proc in psutil.process_iter(["cmdline"])
+                )
             if sys.platform == "win32":
+                # In-process snapshot first: with no other python running,
+                # tunneld can't be either, and wmic is skipped entirely
+                try:
+                    if not set(_windows_python_pids()) - {os.getpid()}:
+                        return False
+                except OSError:
+                    pass
                 result = subprocess.run(
                     ["wmic", "process", "where", "name='python.exe'", "get", "commandline"],
                     capture_output=True, text=True, timeout=5,
@@ -389,7 +631,69 @@ class TunnelManager:
     # =========================================================================
 
     def _find_python_with_pymobiledevice3(self) -> str:
-        """Find Python installation with pymobiledevice3."""
+        """Find Python installation with pymobiledevice3.
+
+        The result is remembered for the process and persisted to the data
+        directory, so later calls and restarts verify one interpreter
+        instead of probing every candidate.
+        """
+        if self._python_path:
+            return self._python_path
+
+        cached = self._load_python_path()
+        if cached and os.path.exists(cached) and self._probe_python(cached):
+            self._python_path = cached
+            return cached
+
+        path, found = self._probe_python_candidates()
+        if found:
+            self._python_path = path
+            self._save_python_path(path)
+        return path
+
+    def _load_python_path(self) -> Optional[str]:
+        """Read the persisted interpreter path, if any."""
+        try:
+            return (self._data_dir / self.PYTHON_PATH_FILENAME).read_text().strip() or None
+        except OSError:
+            return None
+
+    def _save_python_path(self, path: str) -> None:
+        """Persist the resolved interpreter path for future runs."""
+        try:
+            self._data_dir.mkdir(parents=True, exist_ok=True)
+            (self._data_dir / self.PYTHON_PATH_FILENAME).write_text(path)
+        except OSError as e:
+            logger.debug(f"Failed to save python path: {e}")
+
+    def _probe_python(self, path: str) -> bool:
+        """Check whether an interpreter can import pymobiledevice3."""
+        try:
+            kwargs = {}
+            if sys.platform == "win32":
+                kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+            result = subprocess.run(
+                [path, "-c", "import pymobiledevice3; print('ok')"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                **kwargs
+            )
+            return result.returncode == 0 and 'ok' in result.stdout
+        except Exception:
+            return False
+
+    def _probe_python_candidates(self) -> tuple[str, bool]:
+        """Probe known interpreter locations for pymobiledevice3.
+
+        Candidates are probed concurrently, so one that hangs until its
+        timeout doesn't delay the rest; the earliest candidate in priority
+        order that works still wins.
+
+        Returns:
+            (path, found) - the platform's default interpreter name with
+            found=False when no candidate works
+        """
         home = os.path.expanduser("~")
 
         if sys.platform == "win32":
@@ -414,25 +718,101 @@ class TunnelManager:
             ]
             fallback = "python3"
 
-        for path in candidates:
-            if not path:
-                continue
-            if path not in (fallback,) and not os.path.exists(path):
-                continue
-            try:
-                kwargs = {}
-                if sys.platform == "win32":
-                    kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
-                result = subprocess.run(
-                    [path, "-c", "import pymobiledevice3; print('ok')"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    **kwargs
-                )
-                if result.returncode == 0 and 'ok' in result.stdout:
-                    return path
-            except Exception:
-                continue
+        # Existing candidates in priority order, without duplicates
+        paths = list(dict.fromkeys(
+            path for path in candidates
+            if path and (path == fallback or os.path.exists(path))
+        ))
+        if not paths:
+            return fallback, False
+
+        executor = ThreadPoolExecutor(max_workers=len(paths))
+        try:
+            futures = [executor.submit(self._probe_python, path) for path in paths]
+            for path, future in zip(paths, futures):
+                if future.result():
+                    return path, True
+        finally:
+            # Don't wait on lower-priority probes; each is bounded by its timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return fallback, False
+
+
+def _port_open(port: int, timeout: float = 0.1) -> bool:
+    """Check whether something accepts TCP connections on localhost:port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
 
-        return fallback
+def _proc_has_tunneld(proc_root: str = "/proc") -> bool:
+    """Scan /proc/*/cmdline for a pymobiledevice3 tunneld process (Linux).
+
+    Equivalent to `pgrep -f "pymobiledevice3.*tunneld"` without forking.
+    """
+    for pid in os.listdir(proc_root):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(os.path.join(proc_root, pid, "cmdline"), "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            # Process exited mid-scan or isn't readable
+            continue
+        start = cmdline.find(b"pymobiledevice3")
+        if start >= 0 and cmdline.find(b"tunneld", start) >= 0:
+            return True
+    return False
+
+
+def _windows_python_pids() -> list[int]:
+    """List PIDs of running python processes (Windows).
+
+    Walks a CreateToolhelp32Snapshot process list via ctypes instead of
+    spawning wmic. Only image names are available this way, not command
+    lines.
+
+    Raises:
+        OSError if the snapshot can't be taken
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_size_t),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", wintypes.LONG),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", wintypes.WCHAR * wintypes.MAX_PATH),
+        ]
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot in (None, wintypes.HANDLE(-1).value):  # INVALID_HANDLE_VALUE
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    pids = []
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        found = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while found:
+            if entry.szExeFile.lower() in PYTHON_EXE_NAMES:
+                pids.append(entry.th32ProcessID)
+            found = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+    return pids
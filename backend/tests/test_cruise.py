@@ -4,7 +4,14 @@ import time
 import pytest
 from unittest.mock import MagicMock
 
-from services.coordinate_utils import move_location, bearing_to, distance_between
+from services.coordinate_utils import (
+    move_location,
+    bearing_to,
+    distance_between,
+    path_length,
+    path_segment_distances,
+    simplify_path,
+)
 from services.cruise_service import CruiseService, CruiseState
 
 
@@ -73,6 +80,43 @@ class TestCoordinateUtils:
         assert lat == pytest.approx(25.0, abs=1e-10)
         assert lon == pytest.approx(121.5, abs=1e-10)
 
+    def test_path_segment_distances_matches_distance_between(self):
+        """Vectorized path distances should match per-pair Haversine."""
+        path = [[25.0, 121.5], [25.01, 121.5], [25.02, 121.52], [25.02, 121.52]]
+        distances = path_segment_distances(path)
+
+        assert len(distances) == 3
+        for i, d in enumerate(distances):
+            expected = distance_between(*path[i], *path[i + 1])
+            assert d == pytest.approx(expected, abs=1e-9)
+
+    def test_path_segment_distances_short_path(self):
+        """Paths with fewer than 2 points have no segments."""
+        assert len(path_segment_distances([])) == 0
+        assert len(path_segment_distances([[25.0, 121.5]])) == 0
+
+    def test_path_length_matches_segment_sum(self):
+        """Path length should equal the sum of segment distances."""
+        path = [[25.0, 121.5], [25.01, 121.5], [25.02, 121.52], [25.03, 121.51]]
+        distances = path_segment_distances(path)
+
+        assert path_length(path) == pytest.approx(distances.sum(), abs=1e-9)
+        assert path_length(path, 2) == pytest.approx(distances[2:].sum(), abs=1e-9)
+        assert path_length(path, 3) == 0.0
+        assert path_length([]) == 0.0
+
+    def test_simplify_path_drops_collinear_points(self):
+        """Points on a straight line collapse to the endpoints."""
+        path = [[25.0 + i * 1e-4, 121.5] for i in range(50)]
+        assert simplify_path(path, 0.005) == [path[0], path[-1]]
+
+    def test_simplify_path_keeps_significant_deviation(self):
+        """Points farther than epsilon from the chord are kept."""
+        path = [[25.0, 121.5], [25.005, 121.501], [25.01, 121.5]]
+        assert simplify_path(path, 0.005) == path
+        # ~100m deviation is within a 200m tolerance
+        assert simplify_path(path, 0.2) == [path[0], path[-1]]
+
 
 # =============================================================================
 # Cruise Service Tests
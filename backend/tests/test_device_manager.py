@@ -58,6 +58,37 @@ class TestDeviceManager:
         assert result is False
 
 
+class TestListDevices:
+    """Tests for list_devices reusing unchanged devices."""
+
+    @staticmethod
+    def _device(name="iPhone 15"):
+        return Device(id="sim-1", name=name, type=DeviceType.SIMULATOR, state=DeviceState.CONNECTED)
+
+    def test_unchanged_device_instance_is_kept(self):
+        manager = DeviceManager()
+
+        with patch.object(manager, "_discover_simulators", side_effect=[[self._device()], [self._device()]]), \
+                patch.object(manager, "_discover_physical_devices", return_value=[]):
+            first = manager.list_devices()[0]
+            first.to_dict()
+            second = manager.list_devices()[0]
+
+        assert second is first
+
+    def test_changed_device_is_replaced(self):
+        manager = DeviceManager()
+
+        with patch.object(manager, "_discover_simulators",
+                          side_effect=[[self._device()], [self._device("Renamed")]]), \
+                patch.object(manager, "_discover_physical_devices", return_value=[]):
+            manager.list_devices()
+            devices = manager.list_devices()
+
+        assert devices[0].name == "Renamed"
+        assert devices[0].to_dict()["name"] == "Renamed"
+
+
 class TestSimulatorDiscovery:
     """Tests for simulator discovery."""
 
@@ -0,0 +1,208 @@
+"""Tests for EventBus."""
+
+import asyncio
+import json
+import sys
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from services.event_bus import EventBus, format_sse
+
+# services.event_bus is shadowed by the event_bus instance on the package
+event_bus_module = sys.modules["services.event_bus"]
+
+
+async def _start_subscriber(bus: EventBus, received: list) -> asyncio.Task:
+    """Start a subscriber task that appends events to received."""
+    async def consume():
+        async for event in bus.subscribe():
+            received.append(event)
+
+    task = asyncio.create_task(consume())
+    # Let the subscriber register before publishing
+    await asyncio.sleep(0)
+    return task
+
+
+class TestEventBusPublish:
+    """Tests for publishing events to subscribers."""
+
+    async def test_publish_delivers_to_all_subscribers(self):
+        bus = EventBus()
+        received_a, received_b = [], []
+        task_a = await _start_subscriber(bus, received_a)
+        task_b = await _start_subscriber(bus, received_b)
+
+        delivered = await bus.publish({"event": "test", "data": {}})
+        await asyncio.sleep(0)
+
+        assert delivered == 2
+        assert received_a == [{"event": "test", "data": {}}]
+        assert received_b == [{"event": "test", "data": {}}]
+
+        task_a.cancel()
+        task_b.cancel()
+
+    async def test_publish_without_subscribers(self):
+        bus = EventBus()
+
+        assert await bus.publish({"event": "test", "data": {}}) == 0
+
+    async def test_unsubscribe_on_cancel(self):
+        bus = EventBus()
+        task = await _start_subscriber(bus, [])
+        assert bus.subscriber_count == 1
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert bus.subscriber_count == 0
+
+    async def test_full_queue_drops_oldest_event(self):
+        bus = EventBus(max_queue_size=2)
+        # Subscriber registered but not consuming while events are published
+        gen = bus.subscribe()
+        pending = asyncio.ensure_future(gen.__anext__())
+        await asyncio.sleep(0)
+
+        assert await bus.publish({"event": "first", "data": {}}) == 1
+        assert await bus.publish({"event": "second", "data": {}}) == 1
+        assert await bus.publish({"event": "third", "data": {}}) == 1
+
+        assert (await pending)["event"] == "second"
+        assert (await gen.__anext__())["event"] == "third"
+        await gen.aclose()
+
+    async def test_dropped_slot_stops_coalescing(self):
+        """Updates for an evicted coalesced slot are queued anew, not lost."""
+        bus = EventBus(max_queue_size=1)
+        gen = bus.subscribe()
+        pending = asyncio.ensure_future(gen.__anext__())
+        await asyncio.sleep(0)
+
+        await bus.publish({"event": "cruiseUpdate", "data": {"n": 1}}, coalesce_key="k")
+        await bus.publish({"event": "other", "data": {}}, coalesce_key="x")
+        await bus.publish({"event": "cruiseUpdate", "data": {"n": 2}}, coalesce_key="k")
+
+        event = await pending
+        assert event["event"] == "cruiseUpdate"
+        assert event["data"]["n"] == 2
+        await gen.aclose()
+
+
+class TestEventBusSse:
+    """Tests for pre-encoded SSE frames."""
+
+    def test_format_sse(self):
+        frame = format_sse({"event": "test", "data": {"n": 1}})
+
+        assert frame.startswith(b"data: ")
+        assert frame.endswith(b"\n\n")
+        assert json.loads(frame[6:]) == {"event": "test", "data": {"n": 1}}
+
+    def test_format_sse_serializes_numpy(self):
+        frame = format_sse({"event": "test", "data": {"path": np.array([[25.0, 121.5]])}})
+
+        assert json.loads(frame[6:]) == {"event": "test", "data": {"path": [[25.0, 121.5]]}}
+
+    async def test_subscribe_sse_yields_frames(self):
+        bus = EventBus()
+        gen = bus.subscribe_sse()
+        pending = asyncio.ensure_future(gen.__anext__())
+        await asyncio.sleep(0)
+
+        await bus.publish({"event": "test", "data": {}})
+
+        assert await pending == format_sse({"event": "test", "data": {}})
+        await gen.aclose()
+
+    async def test_event_encoded_once_for_all_subscribers(self):
+        bus = EventBus()
+        task_a = await _start_subscriber(bus, [])
+        task_b = await _start_subscriber(bus, [])
+
+        with patch.object(event_bus_module, "format_sse", wraps=format_sse) as mock_format:
+            assert await bus.publish({"event": "test", "data": {}}) == 2
+
+        mock_format.assert_called_once()
+        task_a.cancel()
+        task_b.cancel()
+
+
+class TestEventBusCoalescing:
+    """Tests for coalescing events by key in subscriber queues."""
+
+    async def test_coalesced_event_replaces_pending(self):
+        bus = EventBus()
+        gen = bus.subscribe()
+        first = asyncio.ensure_future(gen.__anext__())
+        await asyncio.sleep(0)
+
+        # The first event wakes the waiting consumer; the next two coalesce
+        await bus.publish({"event": "cruiseUpdate", "data": {"n": 1}}, coalesce_key="k")
+        assert (await first)["data"]["n"] == 1
+
+        await bus.publish({"event": "cruiseUpdate", "data": {"n": 2}}, coalesce_key="k")
+        await bus.publish({"event": "cruiseUpdate", "data": {"n": 3}}, coalesce_key="k")
+
+        assert (await gen.__anext__())["data"]["n"] == 3
+        await gen.aclose()
+
+    async def test_coalesced_event_does_not_jump_ahead(self):
+        """A newer coalesced event is not delivered before an earlier event."""
+        bus = EventBus()
+        gen = bus.subscribe()
+        first = asyncio.ensure_future(gen.__anext__())
+        await asyncio.sleep(0)
+        await bus.publish({"event": "warmup", "data": {}})
+        await first
+
+        await bus.publish({"event": "cruiseUpdate", "data": {"n": 1}}, coalesce_key="k")
+        await bus.publish({"event": "cruiseArrived", "data": {}})
+        await bus.publish({"event": "cruiseUpdate", "data": {"n": 2}}, coalesce_key="k")
+
+        events = [await gen.__anext__() for _ in range(3)]
+        assert [e["event"] for e in events] == ["cruiseUpdate", "cruiseArrived", "cruiseUpdate"]
+        assert events[0]["data"]["n"] == 1
+        assert events[2]["data"]["n"] == 2
+        await gen.aclose()
+
+    async def test_coalesced_event_delivered_when_queue_full(self):
+        bus = EventBus(max_queue_size=1)
+        gen = bus.subscribe()
+        first = asyncio.ensure_future(gen.__anext__())
+        await asyncio.sleep(0)
+
+        await bus.publish({"event": "cruiseUpdate", "data": {"n": 1}}, coalesce_key="k")
+        # Queue is full, but the pending slot is overwritten in place
+        # rather than evicted
+        assert await bus.publish({"event": "cruiseUpdate", "data": {"n": 2}}, coalesce_key="k") == 1
+
+        assert (await first)["data"]["n"] == 2
+        await gen.aclose()
+
+
+class TestEventBusPublishSync:
+    """Tests for thread-safe publish_sync."""
+
+    async def test_publish_sync_without_loop_is_noop(self):
+        bus = EventBus()
+        # Should not raise
+        bus.publish_sync({"event": "test", "data": {}})
+
+    async def test_publish_sync_from_thread(self):
+        bus = EventBus()
+        bus.set_loop(asyncio.get_running_loop())
+        received = []
+        task = await _start_subscriber(bus, received)
+
+        await asyncio.to_thread(bus.publish_sync, {"event": "fromThread", "data": {}})
+        for _ in range(10):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+
+        assert received == [{"event": "fromThread", "data": {}}]
+        task.cancel()
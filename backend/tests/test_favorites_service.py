@@ -3,6 +3,7 @@
 import pytest
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from services.favorites_service import Favorite, FavoritesService
 
@@ -56,6 +57,40 @@ class TestFavorite:
         assert fav is not None
         assert fav.name == "Tokyo, Japan"
 
+    def test_from_line_with_trailing_newline(self):
+        fav = Favorite.from_line("25.033,121.565,Taipei 101\n")
+
+        assert fav is not None
+        assert fav.name == "Taipei 101"
+
+    def test_from_line_number_formats(self):
+        fav = Favorite.from_line("+25,-1.2e2,Signed")
+
+        assert fav is not None
+        assert fav.latitude == 25.0
+        assert fav.longitude == -120.0
+
+        fav = Favorite.from_line(".5,121.,Short")
+
+        assert fav is not None
+        assert fav.latitude == 0.5
+        assert fav.longitude == 121.0
+
+    def test_from_line_non_finite(self):
+        assert Favorite.from_line("nan,121.565,NaN") is None
+        assert Favorite.from_line("25.033,inf,Inf") is None
+        assert Favorite.from_line("infinity,121.565,Inf") is None
+
+    def test_from_line_rejects_digit_separators(self):
+        assert Favorite.from_line("2_5.033,121.565,Taipei") is None
+        assert Favorite.from_line("25.033,1_21.565,Taipei") is None
+
+    def test_from_line_empty_name(self):
+        fav = Favorite.from_line("25.033,121.565,  ")
+
+        assert fav is not None
+        assert fav.name == ""
+
     def test_from_line_empty(self):
         assert Favorite.from_line("") is None
         assert Favorite.from_line("   ") is None
@@ -85,7 +120,9 @@ class TestFavoritesService:
     @pytest.fixture
     def service(self, temp_dir):
         """Create a FavoritesService with temp directory."""
-        return FavoritesService(data_dir=temp_dir)
+        service = FavoritesService(data_dir=temp_dir)
+        yield service
+        service.close()
 
     def test_creates_file_on_init(self, temp_dir):
         service = FavoritesService(data_dir=temp_dir)
@@ -114,6 +151,16 @@ class TestFavoritesService:
         favorites = service.get_all()
         assert len(favorites) == 2
 
+    def test_load_tolerates_invalid_utf8(self, temp_dir):
+        file_path = Path(temp_dir) / "favorites.txt"
+        file_path.write_bytes(b"25.033,121.565,Caf\xe9\r\n35.6762,139.6503,Tokyo Tower\r\n")
+
+        service = FavoritesService(data_dir=temp_dir)
+
+        favorites = service.get_all()
+        assert len(favorites) == 2
+        assert favorites[1].name == "Tokyo Tower"
+
     def test_add_favorite(self, service):
         result = service.add(25.033, 121.565, "Taipei 101")
 
@@ -126,6 +173,7 @@ class TestFavoritesService:
 
     def test_add_favorite_persists_to_file(self, service):
         service.add(25.033, 121.565, "Taipei 101")
+        service.flush()
 
         # Create new service instance to verify persistence
         new_service = FavoritesService(data_dir=str(service.file_path.parent))
@@ -152,6 +200,23 @@ class TestFavoritesService:
         assert result["success"] is False
         assert "longitude" in result["error"].lower()
 
+    def test_add_duplicate_location_rejected(self, service):
+        service.add(25.033, 121.565, "Taipei 101")
+
+        result = service.add(25.0330000001, 121.565, "Again")
+
+        assert result["success"] is False
+        assert "already exists" in result["error"]
+        assert len(service.get_all()) == 1
+
+    def test_add_after_delete_of_same_location(self, service):
+        service.add(25.033, 121.565, "Taipei 101")
+        service.delete(0)
+
+        result = service.add(25.033, 121.565, "Taipei 101")
+
+        assert result["success"] is True
+
     def test_update_favorite(self, service):
         service.add(25.033, 121.565, "Old Name")
 
@@ -164,6 +229,7 @@ class TestFavoritesService:
     def test_update_favorite_persists(self, service):
         service.add(25.033, 121.565, "Old Name")
         service.update(0, "New Name")
+        service.flush()
 
         new_service = FavoritesService(data_dir=str(service.file_path.parent))
         assert new_service.get_all()[0].name == "New Name"
@@ -197,10 +263,53 @@ class TestFavoritesService:
         service.add(25.033, 121.565, "First")
         service.add(35.6762, 139.6503, "Second")
         service.delete(0)
+        service.flush()
 
         new_service = FavoritesService(data_dir=str(service.file_path.parent))
         assert len(new_service.get_all()) == 1
 
+    def test_add_does_not_write_until_flush(self, service):
+        service.add(25.033, 121.565, "First")
+        service.add(35.6762, 139.6503, "Second")
+
+        assert service.file_path.read_text() == ""
+
+        service.flush()
+        assert len(service.file_path.read_text().splitlines()) == 2
+
+    def test_save_replaces_file_atomically(self, service):
+        service.add(25.033, 121.565, "Taipei 101")
+        service.flush()
+
+        assert service.file_path.read_text() == "25.033,121.565,Taipei 101\n"
+        assert list(service.file_path.parent.iterdir()) == [service.file_path]
+
+    def test_failed_save_keeps_previous_file(self, service):
+        service.add(25.033, 121.565, "Taipei 101")
+        service.flush()
+        service.add(35.6762, 139.6503, "Tokyo Tower")
+
+        with patch("os.replace", side_effect=OSError("disk full")):
+            service.flush()
+
+        assert service.file_path.read_text() == "25.033,121.565,Taipei 101\n"
+
+    def test_failed_save_is_retried(self, service):
+        service.add(25.033, 121.565, "Taipei 101")
+
+        with patch("os.replace", side_effect=OSError("disk full")):
+            service.flush()
+        service.close()
+
+        assert service.file_path.read_text() == "25.033,121.565,Taipei 101\n"
+
+    def test_close_flushes_pending_changes(self, service):
+        service.add(25.033, 121.565, "Taipei 101")
+        service.close()
+
+        new_service = FavoritesService(data_dir=str(service.file_path.parent))
+        assert new_service.get_all()[0].name == "Taipei 101"
+
     def test_delete_favorite_invalid_index(self, service):
         result = service.delete(0)
 
@@ -218,6 +327,10 @@ class TestFavoritesService:
         assert result["imported"] == 2
         assert len(service.get_all()) == 2
 
+        service.flush()
+        new_service = FavoritesService(data_dir=temp_dir)
+        assert len(new_service.get_all()) == 2
+
     def test_import_appends_to_existing(self, service, temp_dir):
         service.add(0, 0, "Existing")
 
@@ -230,6 +343,32 @@ class TestFavoritesService:
         assert service.get_all()[0].name == "Existing"
         assert service.get_all()[1].name == "Imported"
 
+    def test_import_skips_duplicates(self, service, temp_dir):
+        service.add(25.033, 121.565, "Existing")
+
+        import_path = Path(temp_dir) / "import.txt"
+        import_path.write_text(
+            "25.033,121.565,Same as existing\n"
+            "35.6762,139.6503,Tokyo\n"
+            "35.6762,139.6503,Tokyo again\n"
+        )
+
+        result = service.import_from_file(str(import_path))
+
+        assert result["success"] is True
+        assert result["imported"] == 1
+        assert result["duplicates"] == 2
+        assert [f.name for f in service.get_all()] == ["Existing", "Tokyo"]
+
+    def test_import_tolerates_invalid_utf8(self, service, temp_dir):
+        import_path = Path(temp_dir) / "import.txt"
+        import_path.write_bytes(b"25.033,121.565,Caf\xe9\r\n35.6762,139.6503,Tokyo\r\n")
+
+        result = service.import_from_file(str(import_path))
+
+        assert result["success"] is True
+        assert result["imported"] == 2
+
     def test_import_file_not_found(self, service):
         result = service.import_from_file("/nonexistent/path.txt")
 
@@ -255,6 +394,7 @@ class TestFavoritesService:
 
     def test_reload(self, service):
         service.add(25.033, 121.565, "Original")
+        service.flush()
 
         # Modify file directly
         service.file_path.write_text("35.6762,139.6503,Modified\n")
@@ -265,3 +405,44 @@ class TestFavoritesService:
         favorites = service.get_all()
         assert len(favorites) == 1
         assert favorites[0].name == "Modified"
+
+    def test_reload_writes_pending_changes(self, service):
+        service.add(25.033, 121.565, "Taipei 101")
+
+        service.reload()
+
+        assert service.get_all()[0].name == "Taipei 101"
+        assert service.file_path.read_text() == "25.033,121.565,Taipei 101\n"
+
+    def test_failed_flush_reported_by_next_change(self, service):
+        service.add(25.033, 121.565, "Taipei 101")
+
+        with patch("os.replace", side_effect=OSError("disk full")):
+            service.flush()
+            result = service.add(35.6762, 139.6503, "Tokyo Tower")
+
+        assert result == {"success": False, "error": "Failed to save favorites file"}
+        assert len(service.get_all()) == 1
+
+        # Recovers once the disk does
+        assert service.add(35.6762, 139.6503, "Tokyo Tower")["success"] is True
+
+    def test_import_writes_synchronously(self, service, temp_dir):
+        import_path = Path(temp_dir) / "import.txt"
+        import_path.write_text("25.033,121.565,Taipei 101\n")
+
+        result = service.import_from_file(str(import_path))
+
+        assert result["success"] is True
+        assert service.file_path.read_text() == "25.033,121.565,Taipei 101\n"
+
+    def test_import_rolled_back_on_failed_write(self, service, temp_dir):
+        import_path = Path(temp_dir) / "import.txt"
+        import_path.write_text("25.033,121.565,Taipei 101\n")
+
+        with patch("os.replace", side_effect=OSError("disk full")):
+            result = service.import_from_file(str(import_path))
+
+        assert result == {"success": False, "error": "Failed to save favorites file"}
+        assert service.get_all() == []
+        assert service.add(25.033, 121.565, "Taipei 101")["success"] is True
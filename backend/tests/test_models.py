@@ -16,21 +16,15 @@ from models import (
 class TestRSDTunnel:
     """Tests for RSDTunnel dataclass."""
 
-    def test_is_configured_with_valid_address_and_port(self):
-        tunnel = RSDTunnel(address="127.0.0.1", port=12345)
-        assert tunnel.is_configured is True
-
-    def test_is_configured_with_empty_address(self):
-        tunnel = RSDTunnel(address="", port=12345)
-        assert tunnel.is_configured is False
-
-    def test_is_configured_with_zero_port(self):
-        tunnel = RSDTunnel(address="127.0.0.1", port=0)
-        assert tunnel.is_configured is False
-
-    def test_is_configured_with_negative_port(self):
-        tunnel = RSDTunnel(address="127.0.0.1", port=-1)
-        assert tunnel.is_configured is False
+    @pytest.mark.parametrize("address,port,expected", [
+        ("127.0.0.1", 12345, True),
+        ("", 12345, False),
+        ("127.0.0.1", 0, False),
+        ("127.0.0.1", -1, False),
+    ])
+    def test_is_configured(self, address, port, expected):
+        tunnel = RSDTunnel(address=address, port=port)
+        assert tunnel.is_configured is expected
 
     def test_to_dict(self):
         tunnel = RSDTunnel(address="192.168.1.1", port=8080, udid="abc123")
@@ -48,6 +42,19 @@ class TestRSDTunnel:
 
         assert result["udid"] is None
 
+    def test_to_dict_is_cached(self):
+        tunnel = RSDTunnel(address="localhost", port=5000)
+
+        assert tunnel.to_dict() is tunnel.to_dict()
+        assert tunnel == RSDTunnel(address="localhost", port=5000)
+        assert hash(tunnel) == hash(RSDTunnel(address="localhost", port=5000))
+
+    def test_is_immutable(self):
+        tunnel = RSDTunnel(address="localhost", port=5000)
+
+        with pytest.raises(AttributeError):
+            tunnel.port = 6000
+
 
 class TestDevice:
     """Tests for Device dataclass."""
@@ -106,6 +113,18 @@ class TestDevice:
         # Falls back to product_type when not in map
         assert device.product_name == "iPhone99,9"
 
+    def test_product_type_is_interned(self):
+        product_type = "".join(["iPhone17", ",1"])  # not a literal
+        device = Device(
+            id="phys-123",
+            name="My iPhone",
+            type=DeviceType.PHYSICAL,
+            state=DeviceState.CONNECTED,
+            product_type=product_type,
+        )
+
+        assert device.product_type is next(k for k in PRODUCT_NAME_MAP if k == product_type)
+
     def test_product_name_without_product_type(self):
         device = Device(
             id="test",
@@ -164,46 +183,94 @@ class TestDevice:
             "udid": "device-udid",
         }
 
+    def test_to_dict_result_is_independent_copy(self):
+        device = Device(
+            id="sim-123",
+            name="iPhone 15 Pro",
+            type=DeviceType.SIMULATOR,
+            state=DeviceState.CONNECTED,
+        )
 
-class TestEnums:
-    """Tests for enum values."""
+        device.to_dict()["tunnel"] = {"status": "connected"}
 
-    def test_device_type_values(self):
-        assert DeviceType.SIMULATOR.value == "simulator"
-        assert DeviceType.PHYSICAL.value == "physical"
+        assert "tunnel" not in device.to_dict()
 
-    def test_device_state_values(self):
-        assert DeviceState.CONNECTED.value == "connected"
-        assert DeviceState.DISCONNECTED.value == "disconnected"
+    def test_defaults_and_equality(self):
+        device = Device("phys-456", "My iPhone", DeviceType.PHYSICAL, DeviceState.CONNECTED)
 
-    def test_connection_type_values(self):
-        assert ConnectionType.USB.value == "USB"
-        assert ConnectionType.WIFI.value == "WiFi"
-        assert ConnectionType.UNKNOWN.value == "Unknown"
+        assert device.rsd_tunnel is None
+        assert device.product_type is None
+        assert device.connection_type == ConnectionType.UNKNOWN
+        device.to_dict()
+        assert device == Device(
+            id="phys-456",
+            name="My iPhone",
+            type=DeviceType.PHYSICAL,
+            state=DeviceState.CONNECTED,
+        )
 
+    def test_to_dict_reflects_field_changes(self):
+        device = Device(
+            id="phys-456",
+            name="My iPhone",
+            type=DeviceType.PHYSICAL,
+            state=DeviceState.CONNECTED,
+        )
+        assert device.to_dict()["rsdTunnel"] is None
+
+        device.rsd_tunnel = RSDTunnel(address="10.0.0.1", port=9999)
+
+        assert device.to_dict()["rsdTunnel"]["address"] == "10.0.0.1"
 
-class TestProductNameMap:
-    """Tests for product name mapping."""
 
-    def test_iphone_16_pro_mapping(self):
-        assert PRODUCT_NAME_MAP["iPhone17,1"] == "iPhone 16 Pro"
-        assert PRODUCT_NAME_MAP["iPhone17,2"] == "iPhone 16 Pro Max"
+class TestGeneratedSerializers:
+    """Tests for exec-generated dict serializers."""
 
-    def test_iphone_15_pro_mapping(self):
-        assert PRODUCT_NAME_MAP["iPhone16,1"] == "iPhone 15 Pro"
-        assert PRODUCT_NAME_MAP["iPhone16,2"] == "iPhone 15 Pro Max"
+    def test_generated_method_belongs_to_class(self):
+        assert Device._build_dict.__qualname__ == "Device._build_dict"
+        assert TunnelState._build_dict.__qualname__ == "TunnelState._build_dict"
 
+    def test_models_use_slots(self):
+        tunnel = RSDTunnel(address="10.0.0.1", port=9999)
 
-class TestTunnelStatus:
-    """Tests for TunnelStatus enum."""
+        assert not hasattr(tunnel, "__dict__")
+        assert not hasattr(TunnelState(udid="test-udid"), "__dict__")
+        assert not hasattr(Device("sim-1", "iPhone", DeviceType.SIMULATOR, DeviceState.CONNECTED), "__dict__")
 
-    def test_tunnel_status_values(self):
-        assert TunnelStatus.NO_TUNNEL.value == "no_tunnel"
-        assert TunnelStatus.DISCOVERING.value == "discovering"
-        assert TunnelStatus.CONNECTED.value == "connected"
-        assert TunnelStatus.STALE.value == "stale"
-        assert TunnelStatus.DISCONNECTED.value == "disconnected"
-        assert TunnelStatus.ERROR.value == "error"
+
+class TestEnums:
+    """Tests for enum values."""
+
+    @pytest.mark.parametrize("member,expected", [
+        (DeviceType.SIMULATOR, "simulator"),
+        (DeviceType.PHYSICAL, "physical"),
+        (DeviceState.CONNECTED, "connected"),
+        (DeviceState.DISCONNECTED, "disconnected"),
+        (ConnectionType.USB, "USB"),
+        (ConnectionType.WIFI, "WiFi"),
+        (ConnectionType.UNKNOWN, "Unknown"),
+        (TunnelStatus.NO_TUNNEL, "no_tunnel"),
+        (TunnelStatus.DISCOVERING, "discovering"),
+        (TunnelStatus.CONNECTED, "connected"),
+        (TunnelStatus.STALE, "stale"),
+        (TunnelStatus.DISCONNECTED, "disconnected"),
+        (TunnelStatus.ERROR, "error"),
+    ])
+    def test_enum_values(self, member, expected):
+        assert member.value == expected
+
+
+class TestProductNameMap:
+    """Tests for product name mapping."""
+
+    @pytest.mark.parametrize("product_type,expected", [
+        ("iPhone17,1", "iPhone 16 Pro"),
+        ("iPhone17,2", "iPhone 16 Pro Max"),
+        ("iPhone16,1", "iPhone 15 Pro"),
+        ("iPhone16,2", "iPhone 15 Pro Max"),
+    ])
+    def test_mapping(self, product_type, expected):
+        assert PRODUCT_NAME_MAP[product_type] == expected
 
 
 class TestTunnelState:
@@ -257,6 +324,16 @@ class TestTunnelState:
             "error": None,
         }
 
+    def test_to_dict_cached_until_invalidated(self):
+        state = TunnelState(udid="test-udid")
+        assert state.to_dict()["status"] == "no_tunnel"
+
+        state.status = TunnelStatus.CONNECTED
+        assert state.to_dict()["status"] == "no_tunnel"
+
+        state.invalidate()
+        assert state.to_dict()["status"] == "connected"
+
     def test_to_dict_full(self):
         tunnel = RSDTunnel(address="10.0.0.1", port=9999, udid="test-udid")
         state = TunnelState(
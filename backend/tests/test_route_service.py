@@ -7,10 +7,18 @@ Tests cover:
 """
 
 import asyncio
+import json
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from services.brouter_service import BrouterService
+import services.brouter_service as brouter_module
+from services.brouter_service import (
+    BrouterService,
+    BROUTER_BACKOFF_CAP_SECONDS,
+    BROUTER_MAX_RETRIES,
+    _backoff,
+)
 from services.route_service import (
     RouteService,
     RouteState,
@@ -18,8 +26,10 @@ from services.route_service import (
     RouteSegment,
     Route,
     RouteSession,
+    _cheap_dist2_km2,
+    _cos_lat,
 )
-from services.cruise_service import CruiseService, CruiseState
+from services.cruise_service import CruiseService, CruiseState, arrival_threshold_km
 from services.coordinate_utils import distance_between
 
 
@@ -35,7 +45,6 @@ class TestBrouterService:
         """Create a BrouterService instance."""
         return BrouterService()
 
-    @pytest.mark.asyncio
     async def test_get_route_success(self, brouter_service):
         """Test successful route fetching from Brouter API."""
         # Mock successful HTTP response
@@ -44,7 +53,7 @@ class TestBrouterService:
                 "geometry": {
                     "coordinates": [
                         [121.5, 25.0],      # [lng, lat]
-                        [121.505, 25.005],
+                        [121.5, 25.005],
                         [121.51, 25.01],
                     ]
                 }
@@ -54,7 +63,7 @@ class TestBrouterService:
         # Create mock response object
         mock_resp = AsyncMock()
         mock_resp.status = 200
-        mock_resp.json = AsyncMock(return_value=mock_response_data)
+        mock_resp.read = AsyncMock(return_value=json.dumps(mock_response_data).encode())
         mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
         mock_resp.__aexit__ = AsyncMock(return_value=None)
 
@@ -69,10 +78,54 @@ class TestBrouterService:
         assert len(result["path"]) == 3
         # Verify lat/lng conversion (Brouter returns [lng, lat], we want [lat, lng])
         assert result["path"][0] == [25.0, 121.5]
-        assert result["path"][1] == [25.005, 121.505]
+        assert result["path"][1] == [25.005, 121.5]
         assert result["distance_km"] > 0
 
-    @pytest.mark.asyncio
+    async def test_get_route_simplifies_dense_path(self, brouter_service):
+        """Test dense paths are simplified but distance uses the full path."""
+        # 101 points along a meridian with a 50m detour in the middle
+        coords = [[121.5, 25.0 + i * 1e-4] for i in range(101)]
+        coords[50] = [121.5005, 25.005]
+        raw_path = [[lat, lng] for lng, lat in coords]
+
+        with patch.object(
+            brouter_service, '_fetch_route', new_callable=AsyncMock, return_value=raw_path
+        ):
+            result = await brouter_service.get_route((25.0, 121.5), (25.01, 121.5))
+
+        assert result["raw_points"] == 101
+        assert result["path"][0] == [25.0, 121.5]
+        assert result["path"][-1] == [25.01, 121.5]
+        assert [25.005, 121.5005] in result["path"]
+        assert len(result["path"]) < 10
+        assert result["distance_km"] == pytest.approx(
+            brouter_service._calculate_path_distance(raw_path)
+        )
+
+    async def test_get_route_drops_elevation(self, brouter_service):
+        """Test [lng, lat, ele] coordinates are converted to [lat, lng]."""
+        mock_response_data = {
+            "features": [{
+                "geometry": {
+                    "coordinates": [[121.5, 25.0, 12.5], [121.51, 25.01, 30.0]]
+                }
+            }]
+        }
+
+        mock_resp = AsyncMock()
+        mock_resp.status = 200
+        mock_resp.read = AsyncMock(return_value=json.dumps(mock_response_data).encode())
+        mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
+        mock_resp.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session = AsyncMock()
+        mock_session.get = MagicMock(return_value=mock_resp)
+
+        with patch.object(brouter_service, '_get_session', return_value=mock_session):
+            result = await brouter_service.get_route((25.0, 121.5), (25.01, 121.51))
+
+        assert result["path"] == [[25.0, 121.5], [25.01, 121.51]]
+
     async def test_get_route_http_error_fallback(self, brouter_service):
         """Test fallback to straight line on HTTP 500 error."""
         # Create mock response object
@@ -98,7 +151,6 @@ class TestBrouterService:
         expected_dist = distance_between(25.0, 121.5, 25.01, 121.51)
         assert result["distance_km"] == pytest.approx(expected_dist, abs=0.001)
 
-    @pytest.mark.asyncio
     async def test_get_route_timeout_fallback(self, brouter_service):
         """Test fallback on request timeout."""
         mock_session = AsyncMock()
@@ -111,7 +163,6 @@ class TestBrouterService:
         assert result["is_fallback"] is True
         assert len(result["path"]) == 2
 
-    @pytest.mark.asyncio
     async def test_get_route_empty_coordinates_fallback(self, brouter_service):
         """Test fallback when Brouter returns empty coordinates."""
         mock_response_data = {
@@ -125,7 +176,7 @@ class TestBrouterService:
         # Create mock response object
         mock_resp = AsyncMock()
         mock_resp.status = 200
-        mock_resp.json = AsyncMock(return_value=mock_response_data)
+        mock_resp.read = AsyncMock(return_value=json.dumps(mock_response_data).encode())
         mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
         mock_resp.__aexit__ = AsyncMock(return_value=None)
 
@@ -139,7 +190,6 @@ class TestBrouterService:
         assert result["is_fallback"] is True
         assert len(result["path"]) == 2
 
-    @pytest.mark.asyncio
     async def test_get_route_retry_then_success(self, brouter_service):
         """Test retry logic - fails twice then succeeds."""
         call_count = 0
@@ -153,13 +203,13 @@ class TestBrouterService:
                 mock_resp.text = AsyncMock(return_value="Service Unavailable")
             else:
                 mock_resp.status = 200
-                mock_resp.json = AsyncMock(return_value={
+                mock_resp.read = AsyncMock(return_value=json.dumps({
                     "features": [{
                         "geometry": {
                             "coordinates": [[121.5, 25.0], [121.51, 25.01]]
                         }
                     }]
-                })
+                }).encode())
             mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
             mock_resp.__aexit__ = AsyncMock(return_value=None)
             return mock_resp
@@ -176,6 +226,116 @@ class TestBrouterService:
         assert result["is_fallback"] is False
         assert call_count == 3
 
+    async def test_get_route_client_error_not_retried(self, brouter_service):
+        """Test 4xx responses (other than 429) fall back without retrying."""
+        mock_resp = AsyncMock()
+        mock_resp.status = 400
+        mock_resp.text = AsyncMock(return_value="Bad Request")
+        mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
+        mock_resp.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session = AsyncMock()
+        mock_session.get = MagicMock(return_value=mock_resp)
+
+        with patch.object(brouter_service, '_get_session', return_value=mock_session):
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                result = await brouter_service.get_route((25.0, 121.5), (25.01, 121.51))
+
+        assert result["is_fallback"] is True
+        assert mock_session.get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    async def test_get_route_rate_limited_is_retried(self, brouter_service):
+        """Test HTTP 429 is retried with backoff."""
+        mock_resp = AsyncMock()
+        mock_resp.status = 429
+        mock_resp.text = AsyncMock(return_value="Too Many Requests")
+        mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
+        mock_resp.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session = AsyncMock()
+        mock_session.get = MagicMock(return_value=mock_resp)
+
+        with patch.object(brouter_service, '_get_session', return_value=mock_session):
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                result = await brouter_service.get_route((25.0, 121.5), (25.01, 121.51))
+
+        assert result["is_fallback"] is True
+        assert mock_session.get.call_count == BROUTER_MAX_RETRIES
+        assert mock_sleep.call_count == BROUTER_MAX_RETRIES - 1
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test backoff delay stays within [0, min(cap, base * 2^attempt)]."""
+        for attempt in range(10):
+            upper = min(BROUTER_BACKOFF_CAP_SECONDS, 2 ** attempt)
+            for _ in range(20):
+                assert 0 <= _backoff(attempt) <= upper
+
+    async def test_get_route_cached_on_repeat(self, brouter_service):
+        """Test repeated waypoint pairs are served from the route cache."""
+        path = [[25.0, 121.5], [25.005, 121.5], [25.01, 121.51]]
+
+        with patch.object(
+            brouter_service, '_fetch_route', new_callable=AsyncMock, return_value=path
+        ) as mock_fetch:
+            first = await brouter_service.get_route((25.0, 121.5), (25.01, 121.51))
+            # Mutating a returned path must not corrupt the cache
+            first["path"].append([0.0, 0.0])
+            second = await brouter_service.get_route((25.000001, 121.5), (25.01, 121.51))
+
+        assert mock_fetch.call_count == 1
+        assert second["is_fallback"] is False
+        assert second["path"] == [[25.0, 121.5], [25.005, 121.5], [25.01, 121.51]]
+
+    async def test_get_route_fallback_not_cached(self, brouter_service):
+        """Test straight-line fallbacks are not memoized."""
+        with patch.object(
+            brouter_service, '_fetch_route', new_callable=AsyncMock, return_value=None
+        ) as mock_fetch:
+            await brouter_service.get_route((25.0, 121.5), (25.01, 121.51))
+            await brouter_service.get_route((25.0, 121.5), (25.01, 121.51))
+
+        assert mock_fetch.call_count == 2
+
+    async def test_concurrent_requests_are_capped(self):
+        """Test in-flight Brouter requests never exceed BROUTER_MAX_CONCURRENCY."""
+        in_flight = 0
+        peak = 0
+        body = json.dumps({
+            "features": [{"geometry": {"coordinates": [[121.5, 25.0], [121.51, 25.01]]}}]
+        }).encode()
+
+        class FakeResponse:
+            status = 200
+
+            async def __aenter__(self):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                return self
+
+            async def __aexit__(self, *exc):
+                nonlocal in_flight
+                in_flight -= 1
+
+            async def read(self):
+                return body
+
+        mock_session = MagicMock()
+        mock_session.get = MagicMock(side_effect=lambda *a, **kw: FakeResponse())
+
+        with patch.dict('os.environ', {'BROUTER_MAX_CONCURRENCY': '2'}):
+            service = BrouterService()
+
+        with patch.object(service, '_get_session', new_callable=AsyncMock, return_value=mock_session):
+            results = await asyncio.gather(*(
+                service._fetch_route((25.0, 121.5 + i), (25.01, 121.51)) for i in range(6)
+            ))
+
+        assert all(r is not None for r in results)
+        assert peak == 2
+
     def test_calculate_path_distance(self, brouter_service):
         """Test path distance calculation."""
         # Simple straight north path
@@ -185,17 +345,36 @@ class TestBrouterService:
         # Each step is ~1.11 km (0.01 degrees latitude)
         assert distance == pytest.approx(2.22, abs=0.05)
 
-    @pytest.mark.asyncio
     async def test_close_session(self, brouter_service):
-        """Test closing the HTTP session."""
+        """Test closing the shared HTTP session."""
         mock_session = AsyncMock()
         mock_session.closed = False
-        brouter_service._session = mock_session
 
-        await brouter_service.close()
+        with patch.object(brouter_module, '_session', mock_session):
+            await brouter_service.close()
+            assert brouter_module._session is None
 
         mock_session.close.assert_called_once()
 
+    async def test_session_shared_across_instances(self):
+        """Test all BrouterService instances reuse one HTTP session."""
+        first = BrouterService()
+        second = BrouterService()
+        try:
+            assert await first._get_session() is await second._get_session()
+        finally:
+            await first.close()
+
+    def test_session_from_finished_loop_released(self):
+        """Test a session left on a finished event loop is closed when replaced."""
+        old = asyncio.run(brouter_module.get_session())
+        try:
+            new = asyncio.run(brouter_module.get_session())
+            assert new is not old
+            assert old.closed
+        finally:
+            asyncio.run(brouter_module.close_session())
+
 
 # =============================================================================
 # RouteService - Route Building Tests
@@ -237,7 +416,6 @@ class TestRouteServiceBuilding:
         service._emit_event = MagicMock()
         return service
 
-    @pytest.mark.asyncio
     async def test_add_first_waypoint_start(self, route_service):
         """Test adding first waypoint sets START position."""
         result = await route_service.add_waypoint("device-1", 25.0, 121.5)
@@ -250,7 +428,6 @@ class TestRouteServiceBuilding:
         assert route["waypoints"][0]["lng"] == 121.5
         assert len(route["segments"]) == 0  # No segments yet
 
-    @pytest.mark.asyncio
     async def test_add_second_waypoint_creates_segment(self, route_service, mock_brouter):
         """Test adding second waypoint creates first segment."""
         # Add START
@@ -277,7 +454,6 @@ class TestRouteServiceBuilding:
             (25.0, 121.5), (25.01, 121.51)
         )
 
-    @pytest.mark.asyncio
     async def test_add_multiple_waypoints(self, route_service):
         """Test adding multiple waypoints builds route progressively."""
         # Add START and 3 waypoints
@@ -294,7 +470,6 @@ class TestRouteServiceBuilding:
         assert route["waypoints"][2]["name"] == "2"
         assert route["waypoints"][3]["name"] == "3"
 
-    @pytest.mark.asyncio
     async def test_set_loop_mode_adds_closure(self, route_service):
         """Test enabling loop mode adds closure segment."""
         # Build route: START -> 1 -> 2
@@ -316,7 +491,6 @@ class TestRouteServiceBuilding:
         assert closure["fromWaypoint"] == 2
         assert closure["toWaypoint"] == 0
 
-    @pytest.mark.asyncio
     async def test_set_loop_mode_removes_closure(self, route_service):
         """Test disabling loop mode removes closure segment."""
         # Build route with loop
@@ -335,7 +509,6 @@ class TestRouteServiceBuilding:
         # No closure segment
         assert not any(s["isClosure"] for s in route["segments"])
 
-    @pytest.mark.asyncio
     async def test_add_waypoint_with_loop_recalculates_closure(self, route_service):
         """Test adding waypoint in loop mode recalculates closure."""
         # Build route with loop
@@ -353,7 +526,22 @@ class TestRouteServiceBuilding:
         assert closure["fromWaypoint"] == 2  # From new waypoint
         assert closure["toWaypoint"] == 0    # To START
 
-    @pytest.mark.asyncio
+    async def test_route_dict_cached_until_modified(self, route_service):
+        """Test route serialization is reused until the route changes."""
+        await route_service.add_waypoint("device-1", 25.0, 121.5)
+        await route_service.add_waypoint("device-1", 25.01, 121.51)
+        route = route_service._routes["device-1"]
+
+        first = route.to_dict()
+        assert route.to_dict() is first
+
+        await route_service.set_loop_mode("device-1", enabled=True)
+
+        updated = route.to_dict()
+        assert updated is not first
+        assert updated["loopMode"] is True
+        assert len(updated["segments"]) == 2
+
     async def test_undo_waypoint(self, route_service):
         """Test removing last waypoint."""
         # Build route with 3 waypoints
@@ -369,7 +557,6 @@ class TestRouteServiceBuilding:
         assert len(route["waypoints"]) == 2  # START and 1
         assert len(route["segments"]) == 1   # Only START->1
 
-    @pytest.mark.asyncio
     async def test_undo_waypoint_with_loop_recalculates_closure(self, route_service):
         """Test undo in loop mode recalculates closure."""
         # Build route with loop
@@ -389,7 +576,6 @@ class TestRouteServiceBuilding:
         assert closure["fromWaypoint"] == 1
         assert closure["toWaypoint"] == 0
 
-    @pytest.mark.asyncio
     async def test_undo_waypoint_cannot_undo_while_cruising(self, route_service):
         """Test cannot undo waypoint while route cruise is active."""
         # Build route
@@ -409,7 +595,6 @@ class TestRouteServiceBuilding:
         # Clean up
         route_service.stop_route_cruise("device-1")
 
-    @pytest.mark.asyncio
     async def test_undo_waypoint_no_waypoints_to_undo(self, route_service):
         """Test undo with no waypoints returns error."""
         result = await route_service.undo_waypoint("device-1")
@@ -417,7 +602,6 @@ class TestRouteServiceBuilding:
         assert result["success"] is False
         assert "No waypoint to undo" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_undo_waypoint_only_start_clears_route(self, route_service):
         """Test undoing START when it's the only waypoint clears the route."""
         await route_service.add_waypoint("device-1", 25.0, 121.5)
@@ -471,7 +655,6 @@ class TestRouteServiceBuilding:
         assert len(status["route"]["waypoints"]) == 0
         assert status["cruiseState"]["state"] == "idle"
 
-    @pytest.mark.asyncio
     async def test_total_distance_calculation(self, route_service):
         """Test route total distance is sum of segments."""
         await route_service.add_waypoint("device-1", 25.0, 121.5)
@@ -538,10 +721,11 @@ class TestRouteServiceCruise:
         assert result["success"] is True
         assert result["session"]["state"] == "running"
 
-        # Verify arrival callback registered
-        mock_cruise_service.on_arrival.assert_called_once_with(
-            "device-1", route_service._on_point_arrival
-        )
+        # Verify arrival callback registered, bound to the new session
+        mock_cruise_service.on_arrival.assert_called_once()
+        callback_device, callback = mock_cruise_service.on_arrival.call_args[0]
+        assert callback_device == "device-1"
+        assert callable(callback)
 
         # Verify CruiseService.start_cruise called for first point pair
         mock_cruise_service.start_cruise.assert_called_once()
@@ -551,10 +735,128 @@ class TestRouteServiceCruise:
         # First point pair: path[0] -> path[1]
         assert call_args["start_lat"] == 25.0
         assert call_args["start_lon"] == 121.5
+        # Plain floats, not numpy scalars, reach CruiseService
+        assert type(call_args["start_lat"]) is float
 
         # Clean up
         route_service.stop_route_cruise("device-1")
 
+    def test_bound_arrival_callback_advances_session(self, route_service, mock_cruise_service):
+        """The registered callback advances its session without a lookup."""
+        asyncio.run(route_service.add_waypoint("device-1", 25.0, 121.5))
+        asyncio.run(route_service.add_waypoint("device-1", 25.01, 121.51))
+        route_service.start_route_cruise("device-1", speed_kmh=10.0)
+        callback = mock_cruise_service.on_arrival.call_args[0][1]
+        session = route_service._sessions["device-1"]
+
+        callback("device-1", {"distanceTraveledKm": 0.5})
+
+        assert session.distance_traveled_km == 0.5
+        assert session.current_step_in_segment == 1
+
+        # A stale callback for a stopped session is a no-op
+        route_service.stop_route_cruise("device-1")
+        callback("device-1", {"distanceTraveledKm": 0.5})
+        assert session.distance_traveled_km == 0.5
+
+    def test_reroute_and_resume_feeds_reroute_path_first(
+        self, route_service, mock_cruise_service, mock_brouter
+    ):
+        """Rerouting cruises the new path, then continues with the next segment."""
+        asyncio.run(route_service.add_waypoint("device-1", 25.0, 121.5))
+        asyncio.run(route_service.add_waypoint("device-1", 25.01, 121.51))
+        route_service.start_route_cruise("device-1", speed_kmh=10.0)
+        route_service.pause_route_cruise("device-1")
+
+        mock_brouter.get_route.return_value = {
+            "path": [[25.002, 121.4], [25.006, 121.45], [25.01, 121.51]],
+            "distance_km": 11.0,
+            "is_fallback": False,
+        }
+        result = asyncio.run(route_service.reroute_and_resume("device-1", 25.002, 121.4))
+
+        assert result["success"] is True
+        call_args = mock_cruise_service.start_cruise.call_args[1]
+        assert (call_args["start_lat"], call_args["start_lon"]) == (25.002, 121.4)
+        assert type(call_args["start_lat"]) is float
+
+        session = route_service._sessions["device-1"]
+        route_service._on_point_arrival("device-1", {"distanceTraveledKm": 5.0})
+        assert session.reroute_step == 1
+        route_service._on_point_arrival("device-1", {"distanceTraveledKm": 6.0})
+
+        # Reroute replaced the only segment, so the route is complete
+        assert session.reroute_segment is None
+        assert session.segments_completed == 1
+        assert session.state.value == "arrived"
+
+    def test_long_skip_logs_warning(self, route_service, mock_cruise_service, caplog):
+        """Skipping a degenerate run of short pairs is logged."""
+        asyncio.run(route_service.add_waypoint("device-1", 25.0, 121.5))
+        asyncio.run(route_service.add_waypoint("device-1", 25.01, 121.51))
+        dense = [[25.0 + i * 1e-9, 121.5] for i in range(1500)] + [[25.01, 121.51]]
+        route_service._routes["device-1"].segments[0] = RouteSegment(
+            from_waypoint=0, to_waypoint=1, path=dense, distance_km=1.4,
+        )
+
+        with caplog.at_level("WARNING", logger="services.route_service"):
+            route_service.start_route_cruise("device-1", speed_kmh=10.0)
+
+        assert "unusually dense" in caplog.text
+        call_args = mock_cruise_service.start_cruise.call_args[1]
+        assert call_args["target_lat"] == 25.01
+
+        route_service.stop_route_cruise("device-1")
+
+    def test_progress_events_omit_route_geometry(self, route_service):
+        """Only routeStarted/routeArrived carry the full route."""
+        asyncio.run(route_service.add_waypoint("device-1", 25.0, 121.5))
+        asyncio.run(route_service.add_waypoint("device-1", 25.01, 121.51))
+        route_service.start_route_cruise("device-1", speed_kmh=10.0)
+        route_service.pause_route_cruise("device-1")
+
+        events = {
+            c[0][0]["event"]: c[0][0]["data"]
+            for c in route_service._emit_event.call_args_list
+        }
+        assert "route" in events["routeStarted"]
+        assert "route" not in events["routeUpdate"]
+        assert events["routeUpdate"]["state"] == "paused"
+        assert events["routeUpdate"]["totalSegments"] == 1
+
+        route_service.stop_route_cruise("device-1")
+
+    def test_point_arrival_route_update_throttled(self, route_service, mock_cruise_service):
+        """Back-to-back arrivals emit one routeUpdate but still advance."""
+        asyncio.run(route_service.add_waypoint("device-1", 25.0, 121.5))
+        asyncio.run(route_service.add_waypoint("device-1", 25.02, 121.51))
+        # Longer path so all arrivals stay inside the segment
+        route_service._routes["device-1"].segments[0] = RouteSegment(
+            from_waypoint=0, to_waypoint=1,
+            path=[
+                [25.0, 121.5], [25.005, 121.5], [25.01, 121.502],
+                [25.015, 121.5], [25.02, 121.51],
+            ],
+            distance_km=2.4,
+        )
+        route_service.start_route_cruise("device-1", speed_kmh=10.0)
+        session = route_service._sessions["device-1"]
+        route_service._emit_event.reset_mock()
+
+        with patch("services.route_service.time.monotonic", side_effect=[100.0, 100.05, 100.2]):
+            for _ in range(3):
+                route_service._on_point_arrival("device-1", {"distanceTraveledKm": 0.1})
+
+        updates = [
+            c for c in route_service._emit_event.call_args_list
+            if c[0][0]["event"] == "routeUpdate"
+        ]
+        assert len(updates) == 2
+        assert session.current_step_in_segment == 3
+        assert session.distance_traveled_km == pytest.approx(0.3)
+
+        route_service.stop_route_cruise("device-1")
+
     def test_start_route_cruise_insufficient_waypoints(self, route_service):
         """Test cannot start route cruise with less than 2 waypoints."""
         # Only START
@@ -845,6 +1147,19 @@ class TestRouteServiceCruise:
         # Clean up
         route_service.stop_route_cruise("device-1")
 
+    def test_set_route_speed_updates_arrival_threshold(self, route_service):
+        """Test the cached arrival threshold follows speed changes."""
+        asyncio.run(route_service.add_waypoint("device-1", 25.0, 121.5))
+        asyncio.run(route_service.add_waypoint("device-1", 25.01, 121.51))
+        route_service.start_route_cruise("device-1", speed_kmh=10.0)
+        session = route_service._sessions["device-1"]
+        assert session._arrival_threshold_km == arrival_threshold_km(10.0)
+
+        route_service.set_route_speed("device-1", 50.0)
+
+        assert session._arrival_threshold_km == arrival_threshold_km(50.0)
+        route_service.stop_route_cruise("device-1")
+
     def test_set_route_speed_minimum_clamp(self, route_service):
         """Test route speed has minimum clamp."""
         asyncio.run(
@@ -934,6 +1249,105 @@ class TestRouteServiceCruise:
         route_service.stop_route_cruise("device-1")
 
 
+class TestRouteSessionDistance:
+    """Tests for RouteSession remaining distance."""
+
+    def test_remaining_distance_mid_segment(self):
+        """Remaining distance matches summing per-pair Haversine distances."""
+        path = [[25.0, 121.5], [25.004, 121.503], [25.007, 121.5], [25.01, 121.51]]
+        route = Route(
+            waypoints=[Waypoint(25.0, 121.5, "START"), Waypoint(25.01, 121.51, "1"),
+                       Waypoint(25.02, 121.52, "2")],
+            segments=[
+                RouteSegment(from_waypoint=0, to_waypoint=1, path=path, distance_km=1.6),
+                RouteSegment(from_waypoint=1, to_waypoint=2, path=[], distance_km=2.0),
+            ],
+        )
+        session = RouteSession(device_id="device-1", route=route, speed_kmh=10.0)
+        session.current_step_in_segment = 1
+
+        expected = sum(
+            distance_between(*path[i], *path[i + 1]) for i in range(1, len(path) - 1)
+        ) + 2.0
+        assert session.remaining_distance_km() == pytest.approx(expected, abs=1e-9)
+
+    def test_segment_next_travel_step_matches_pairwise_skipping(self):
+        """The per-segment skip table agrees with pair-by-pair checks."""
+        lats = [25.0]
+        for step_m in [0.1] * 30 + [20] + [0.1] * 5 + [0.3, 0.1, 20, 0.1]:
+            lats.append(lats[-1] + step_m / 111_195)
+        path = [[lat, 121.5] for lat in lats]
+        segment = RouteSegment(from_waypoint=0, to_waypoint=1, path=path, distance_km=0.04)
+
+        for threshold_km in (0.00025, 0.0005):
+            def pairwise(step):
+                while step < len(path) - 1 and distance_between(
+                    *path[step], *path[step + 1]
+                ) < threshold_km:
+                    step += 1
+                return step
+
+            for start in range(len(path)):
+                assert segment.next_travel_step(start, threshold_km) == pairwise(start)
+
+    def test_cheap_distance_close_to_haversine(self):
+        """Equirectangular distance matches Haversine at metre scales."""
+        lat1, lng1, lat2, lng2 = 25.0, 121.5, 25.00003, 121.50004  # ~5m
+        coslat = _cos_lat([[lat1, lng1]])
+
+        cheap = _cheap_dist2_km2(lat1, lng1, lat2, lng2, coslat) ** 0.5
+
+        assert cheap == pytest.approx(distance_between(lat1, lng1, lat2, lng2), rel=1e-3)
+
+    def test_segment_path_stored_as_array(self):
+        """Segment paths are float64 arrays, serialized back to nested lists."""
+        path = [[25.0, 121.5], [25.01, 121.51]]
+        segment = RouteSegment(from_waypoint=0, to_waypoint=1, path=path, distance_km=1.5)
+
+        assert isinstance(segment.path, np.ndarray)
+        assert segment.path.shape == (2, 2)
+        assert segment.to_dict()["path"] == path
+
+    def test_route_models_use_slots(self):
+        """Route dataclasses carry no per-instance __dict__."""
+        segment = RouteSegment(from_waypoint=0, to_waypoint=1, path=[], distance_km=0.0)
+        route = Route(waypoints=[Waypoint(25.0, 121.5, "START")], segments=[segment])
+        session = RouteSession(device_id="device-1", route=route, speed_kmh=10.0)
+
+        for obj in (route.waypoints[0], segment, route, session):
+            assert not hasattr(obj, "__dict__")
+
+    def test_segment_cumulative_distances(self):
+        """Segments precompute cumulative distance along their path."""
+        path = [[25.0, 121.5], [25.01, 121.5], [25.02, 121.5]]
+        segment = RouteSegment(from_waypoint=0, to_waypoint=1, path=path, distance_km=2.2)
+
+        assert segment.cum_dist_km[0] == 0.0
+        assert segment.cum_dist_km[1] == pytest.approx(distance_between(*path[0], *path[1]))
+        assert segment.cum_dist_km[2] == pytest.approx(
+            distance_between(*path[0], *path[1]) + distance_between(*path[1], *path[2])
+        )
+        assert "cumDistKm" not in segment.to_dict()
+
+    def test_segments_compare_without_error(self):
+        path = [[25.0, 121.5], [25.01, 121.5]]
+        segment = RouteSegment(from_waypoint=0, to_waypoint=1, path=path, distance_km=1.1)
+        other = RouteSegment(from_waypoint=0, to_waypoint=1, path=path, distance_km=1.1)
+
+        assert segment == segment
+        assert segment != other
+        assert Route(segments=[segment]) == Route(segments=[segment])
+
+    def test_segment_endpoints_precomputed(self):
+        """Segments expose their endpoints as plain-float tuples."""
+        path = [[25.0, 121.5], [25.01, 121.5], [25.02, 121.51]]
+        segment = RouteSegment(from_waypoint=0, to_waypoint=1, path=path, distance_km=2.2)
+
+        assert segment.first_point == (25.0, 121.5)
+        assert segment.last_point == (25.02, 121.51)
+        assert type(segment.first_point[0]) is float
+
+
 # =============================================================================
 # Edge Cases and Integration Tests
 # =============================================================================
@@ -973,7 +1387,6 @@ class TestRouteServiceEdgeCases:
         service._emit_event = MagicMock()
         return service
 
-    @pytest.mark.asyncio
     async def test_brouter_fallback_marked_in_segment(self, route_service, mock_brouter):
         """Test segment is marked as fallback when Brouter fails."""
         # Make brouter return fallback
@@ -991,7 +1404,6 @@ class TestRouteServiceEdgeCases:
         segment = result["route"]["segments"][0]
         assert segment["isFallback"] is True
 
-    @pytest.mark.asyncio
     async def test_multi_device_routes(self, route_service):
         """Test multiple devices can have independent routes."""
         # Build routes for two devices
@@ -1040,7 +1452,6 @@ class TestRouteServiceEdgeCases:
         # Clean up
         route_service.stop_route_cruise("device-1")
 
-    @pytest.mark.asyncio
     async def test_event_emission_on_waypoint_add(self, route_service):
         """Test events are emitted when waypoints are added."""
         await route_service.add_waypoint("device-1", 25.0, 121.5)
@@ -1098,3 +1509,36 @@ class TestRouteServiceEdgeCases:
 
         # Clean up
         route_service.stop_route_cruise("device-1")
+
+    def test_dense_polyline_skips_without_recursion(self, route_service, mock_cruise_service):
+        """Test thousands of sub-threshold pairs are skipped without recursing."""
+        # 5000 points ~0.1m apart, then one real step
+        dense = [[25.0 + i * 1e-6, 121.5] for i in range(5000)] + [[25.01, 121.5]]
+        route_service._routes["device-1"] = Route(
+            waypoints=[Waypoint(25.0, 121.5, "START"), Waypoint(25.01, 121.5, "1")],
+            segments=[RouteSegment(from_waypoint=0, to_waypoint=1, path=dense, distance_km=1.1)],
+        )
+
+        # 360 km/h -> 0.5m arrival threshold
+        result = route_service.start_route_cruise("device-1", speed_kmh=360.0)
+
+        assert result["success"] is True
+        assert route_service._sessions["device-1"].current_step_in_segment == 4999
+        mock_cruise_service.start_cruise.assert_called_once()
+
+        route_service.stop_route_cruise("device-1")
+
+    def test_loop_with_no_travelable_pairs_arrives(self, route_service, mock_cruise_service):
+        """Test a loop route whose pairs are all under threshold does not spin."""
+        tiny = [[25.0, 121.5], [25.000001, 121.5]]
+        route = Route(
+            waypoints=[Waypoint(25.0, 121.5, "START"), Waypoint(25.000001, 121.5, "1")],
+            segments=[RouteSegment(from_waypoint=0, to_waypoint=1, path=tiny, distance_km=0.0001)],
+            loop_mode=True,
+        )
+        route_service._routes["device-1"] = route
+
+        route_service.start_route_cruise("device-1", speed_kmh=360.0)
+
+        assert "device-1" not in route_service._sessions
+        mock_cruise_service.start_cruise.assert_not_called()
@@ -1,46 +1,90 @@
 """Tests for LocationSimulatorServer."""
 
+from contextlib import nullcontext
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
 
-from main import LocationSimulatorServer
+from main import LocationSimulatorServer, _EMPTY_DEVICES_RESULT, _EMPTY_FAVORITES_RESULT, _REQUIRED_PARAMS
 from models import Device, DeviceType, DeviceState, RSDTunnel
 
 
+# Server attribute -> service class patched in main
+SERVICES = {
+    "devices": "DeviceManager",
+    "location": "LocationService",
+    "tunnel": "TunnelManager",
+    "favorites": "FavoritesService",
+    "cruise": "CruiseService",
+    "last_locations": "LastLocationService",
+    "port_forward": "PortForwardService",
+    "brouter": "BrouterService",
+    "route": "RouteService",
+}
+
+# Shared devices; handlers only read them
+_PHYSICAL_DEVICE = Device(
+    id="device-123",
+    name="Test iPhone",
+    type=DeviceType.PHYSICAL,
+    state=DeviceState.CONNECTED,
+)
+_SIM_DEVICE = Device(
+    id="sim-123",
+    name="iPhone 15",
+    type=DeviceType.SIMULATOR,
+    state=DeviceState.CONNECTED,
+)
+
+# Shared success result for stubs; handlers only read it
+_OK = {"success": True}
+
+
+def _request(method, params=None):
+    """JSON-RPC request dict for handle_request."""
+    return {"id": "1", "method": method, "params": params or {}}
+
+
+async def _call(server, method, params=None):
+    """Send a request through handle_request and return its result."""
+    response = await server.handle_request(_request(method, params))
+    assert "error" not in response, response["error"]
+    return response["result"]
+
+
+def _raises(exc):
+    """Plain stub that raises exc when called."""
+    def stub(*args, **kwargs):
+        raise exc
+    return stub
+
+
+@pytest.fixture(scope="session")
+def server_base():
+    """Construct the server once per session, with its service classes patched."""
+    with patch.multiple("main", **{cls: DEFAULT for cls in SERVICES.values()}):
+        yield LocationSimulatorServer()
+
+
 @pytest.fixture
-def server():
-    """Create a server instance with mocked services."""
-    with patch("main.DeviceManager") as MockDeviceManager, \
-         patch("main.LocationService") as MockLocationService, \
-         patch("main.TunnelManager") as MockTunnelManager, \
-         patch("main.FavoritesService") as MockFavoritesService, \
-         patch("main.CruiseService") as MockCruiseService, \
-         patch("main.LastLocationService") as MockLastLocationService, \
-         patch("main.PortForwardService") as MockPortForwardService, \
-         patch("main.BrouterService") as MockBrouterService, \
-         patch("main.RouteService") as MockRouteService:
-
-        server = LocationSimulatorServer()
-
-        # Setup mock instances
-        server.devices = MockDeviceManager.return_value
-        server.location = MockLocationService.return_value
-        server.tunnel = MockTunnelManager.return_value
-        server.favorites = MockFavoritesService.return_value
-        server.cruise = MockCruiseService.return_value
-        server.last_locations = MockLastLocationService.return_value
-        server.port_forward = MockPortForwardService.return_value
-        server.brouter = MockBrouterService.return_value
-        server.route = MockRouteService.return_value
-
-        yield server
+def server(server_base):
+    """The shared server instance with fresh service mocks for each test.
+
+    Fresh mocks rather than reset_mock(): tests also assign plain stubs to
+    service attributes, which reset_mock() would leave in place.
+    """
+    for attr in SERVICES:
+        setattr(server_base, attr, MagicMock())
+    server_base._request_count = 0
+    return server_base
 
 
 class TestHandleRequest:
     """Tests for JSON-RPC request handling."""
 
     async def test_unknown_method_returns_error(self, server):
-        request = {"id": "1", "method": "unknownMethod", "params": {}}
+        request = _request("unknownMethod")
 
         response = await server.handle_request(request)
 
@@ -50,7 +94,7 @@ class TestHandleRequest:
         assert "unknownMethod" in response["error"]["message"]
 
     async def test_method_exception_returns_error(self, server):
-        server.devices.list_devices = MagicMock(side_effect=Exception("Test error"))
+        server.devices.list_devices = _raises(Exception("Test error"))
         request = {"id": "2", "method": "listDevices", "params": {}}
 
         response = await server.handle_request(request)
@@ -60,45 +104,88 @@ class TestHandleRequest:
         assert response["error"]["code"] == -1
         assert "Test error" in response["error"]["message"]
 
+    async def test_missing_required_param_checked_before_dispatch(self, server):
+        result = await _call(server, "setRouteLoopMode", {"deviceId": "dev-1"})
 
-class TestListDevices:
-    """Tests for listDevices RPC method."""
+        assert result == {"success": False, "error": "enabled required"}
+        server.route.set_loop_mode.assert_not_called()
 
-    async def test_list_devices_success(self, server):
-        mock_device = Device(
-            id="sim-123",
-            name="iPhone 15",
-            type=DeviceType.SIMULATOR,
-            state=DeviceState.CONNECTED,
-        )
-        server.devices.list_devices = MagicMock(return_value=[mock_device])
+    async def test_param_error_results_are_prebuilt(self, server):
+        first = await _call(server, "stopCruise")
+        second = await _call(server, "stopCruise")
 
-        request = {"id": "1", "method": "listDevices", "params": {}}
-        response = await server.handle_request(request)
+        assert first is second
 
-        assert "result" in response
-        assert "devices" in response["result"]
-        assert len(response["result"]["devices"]) == 1
-        assert response["result"]["devices"][0]["id"] == "sim-123"
+    @pytest.mark.parametrize("method,params,error", [
+        ("setLocation", {"latitude": 25.033, "longitude": 121.565}, "deviceId required"),
+        ("setLocation", {"deviceId": "device-123", "latitude": 25.033}, "latitude and longitude required"),
+        ("clearLocation", {}, "deviceId required"),
+        ("getDeviceState", {}, "deviceId required"),
+        ("addFavorite", {"name": "Test"}, "latitude and longitude required"),
+        ("updateFavorite", {"name": "Test"}, "index required"),
+        ("updateFavorite", {"index": 0}, "name required"),
+        ("deleteFavorite", {}, "index required"),
+        ("importFavorites", {}, "filePath required"),
+        ("stopCruise", {"deviceId": ""}, "deviceId required"),
+    ])
+    async def test_missing_param_errors(self, server, method, params, error):
+        result = await _call(server, method, params)
 
-    async def test_list_devices_empty(self, server):
-        server.devices.list_devices = MagicMock(return_value=[])
+        assert result == {"success": False, "error": error}
 
-        request = {"id": "1", "method": "listDevices", "params": {}}
-        response = await server.handle_request(request)
+    async def test_falsy_values_accepted(self, server):
+        server.route.set_loop_mode = AsyncMock(return_value=_OK)
+        result = await _call(server, "setRouteLoopMode", {"deviceId": "dev-1", "enabled": False})
 
-        assert response["result"]["devices"] == []
+        assert result == {"success": True}
+        server.route.set_loop_mode.assert_awaited_once_with("dev-1", False)
 
+    def test_required_params_cover_registered_methods(self, server):
+        assert set(_REQUIRED_PARAMS) <= set(server._methods)
 
-class TestSelectDeviceRemoved:
-    """Tests that selectDevice RPC method has been removed."""
+    def test_async_handlers_resolved_once(self, server):
+        assert "addRouteWaypoint" in server._async_methods
+        assert "setRouteLoopMode" in server._async_methods
+        assert "listDevices" not in server._async_methods
 
-    async def test_select_device_method_not_found(self, server):
-        request = {"id": "1", "method": "selectDevice", "params": {"deviceId": "device-123"}}
-        response = await server.handle_request(request)
+class TestEmitEvent:
+    """Tests for SSE event emission."""
 
-        assert "error" in response
-        assert response["error"]["code"] == -32601
+    def test_state_updates_are_coalesced_per_device(self, server):
+        event = {"event": "cruiseUpdate", "data": {"deviceId": "dev-1"}}
+
+        with patch("main.event_bus") as mock_bus:
+            server._emit_event(event)
+
+        mock_bus.publish_sync.assert_called_once_with(event, coalesce_key="cruiseUpdate:dev-1")
+
+    def test_other_events_are_not_coalesced(self, server):
+        event = {"event": "cruiseArrived", "data": {"deviceId": "dev-1"}}
+
+        with patch("main.event_bus") as mock_bus:
+            server._emit_event(event)
+
+        mock_bus.publish_sync.assert_called_once_with(event)
+
+
+class TestListDevices:
+    """Tests for listDevices RPC method."""
+
+    async def test_list_devices_success(self, server):
+        server.devices.list_devices = lambda *_: [_SIM_DEVICE]
+
+        result = await _call(server, "listDevices")
+
+        assert len(result["devices"]) == 1
+        assert result["devices"][0]["id"] == "sim-123"
+
+    async def test_list_devices_empty(self, server):
+        server.devices.list_devices = lambda *_: []
+
+        result = await _call(server, "listDevices")
+
+        assert result["devices"] == ()
+        assert result is _EMPTY_DEVICES_RESULT
 
 
 class TestGetDeviceState:
@@ -107,17 +194,15 @@ class TestGetDeviceState:
     async def test_get_device_state_idle(self, server):
         """Idle device returns null for cruise/route, location from LastLocationService."""
         server.location._last_locations = {}
-        server.last_locations.get = MagicMock(return_value={"lat": 25.033, "lon": 121.565})
-        server.cruise.get_cruise_status = MagicMock(return_value={"state": "idle", "deviceId": "dev-1"})
-        server.route.get_route = MagicMock(return_value=None)
-        server.route.get_route_session = MagicMock(return_value=None)
-        server.devices.get_device = MagicMock(return_value=None)
+        server.last_locations.get_tuple = lambda *_: (25.033, 121.565)
+        server.cruise.get_cruise_status = lambda *_: {"state": "idle", "deviceId": "dev-1"}
+        server.route.get_route = lambda *_: None
+        server.route.get_route_session = lambda *_: None
+        server.devices.get_device = lambda *_: None
         server.location._refresh_tasks = {}
 
-        request = {"id": "1", "method": "getDeviceState", "params": {"deviceId": "dev-1"}}
-        response = await server.handle_request(request)
+        result = await _call(server, "getDeviceState", {"deviceId": "dev-1"})
 
-        result = response["result"]
         assert result["location"]["latitude"] == 25.033
         assert result["cruise"] is None
         assert result["route"] is None
@@ -128,41 +213,31 @@ class TestGetDeviceState:
         """Device with active cruise returns cruise data."""
         cruise_data = {"state": "running", "deviceId": "dev-1", "speedKmh": 80}
         server.location._last_locations = {"dev-1": {"lat": 25.0, "lon": 121.0}}
-        server.last_locations.get = MagicMock(return_value=None)
-        server.cruise.get_cruise_status = MagicMock(return_value=cruise_data)
-        server.route.get_route = MagicMock(return_value=None)
-        server.route.get_route_session = MagicMock(return_value=None)
-        server.devices.get_device = MagicMock(return_value=None)
+        server.last_locations.get_tuple = lambda *_: None
+        server.cruise.get_cruise_status = lambda *_: cruise_data
+        server.route.get_route = lambda *_: None
+        server.route.get_route_session = lambda *_: None
+        server.devices.get_device = lambda *_: None
         server.location._refresh_tasks = {"dev-1": {}}
 
-        request = {"id": "1", "method": "getDeviceState", "params": {"deviceId": "dev-1"}}
-        response = await server.handle_request(request)
+        result = await _call(server, "getDeviceState", {"deviceId": "dev-1"})
 
-        result = response["result"]
         assert result["cruise"]["state"] == "running"
         assert result["cruise"]["speedKmh"] == 80
         assert result["isRefreshing"] is True
 
-    async def test_get_device_state_missing_device_id(self, server):
-        request = {"id": "1", "method": "getDeviceState", "params": {}}
-        response = await server.handle_request(request)
-
-        assert "deviceId required" in response["result"]["error"]
-
     async def test_get_device_state_no_state(self, server):
         """Device with no state at all returns all nulls."""
         server.location._last_locations = {}
-        server.last_locations.get = MagicMock(return_value=None)
-        server.cruise.get_cruise_status = MagicMock(return_value={"state": "idle", "deviceId": "dev-1"})
-        server.route.get_route = MagicMock(return_value=None)
-        server.route.get_route_session = MagicMock(return_value=None)
-        server.devices.get_device = MagicMock(return_value=None)
+        server.last_locations.get_tuple = lambda *_: None
+        server.cruise.get_cruise_status = lambda *_: {"state": "idle", "deviceId": "dev-1"}
+        server.route.get_route = lambda *_: None
+        server.route.get_route_session = lambda *_: None
+        server.devices.get_device = lambda *_: None
         server.location._refresh_tasks = {}
 
-        request = {"id": "1", "method": "getDeviceState", "params": {"deviceId": "dev-1"}}
-        response = await server.handle_request(request)
+        result = await _call(server, "getDeviceState", {"deviceId": "dev-1"})
 
-        result = response["result"]
         assert result["location"] is None
         assert result["cruise"] is None
 
@@ -173,40 +248,26 @@ class TestGetAllDeviceStates:
     async def test_empty_states(self, server):
         """No active devices returns empty dict."""
         server.cruise._sessions = {}
-        server.cruise._sessions_lock = MagicMock()
-        server.cruise._sessions_lock.__enter__ = MagicMock()
-        server.cruise._sessions_lock.__exit__ = MagicMock(return_value=False)
+        server.cruise._sessions_lock = nullcontext()
         server.route._sessions = {}
 
-        request = {"id": "1", "method": "getAllDeviceStates", "params": {}}
-        response = await server.handle_request(request)
+        result = await _call(server, "getAllDeviceStates")
 
-        assert response["result"] == {}
+        assert result == {}
 
     async def test_with_active_sessions(self, server):
         """Active cruise and route sessions return badge data."""
-        from unittest.mock import PropertyMock
-        import threading
-
-        # Mock cruise session
-        cruise_session = MagicMock()
-        cruise_session.state = MagicMock()
-        cruise_session.state.value = "running"
-        server.cruise._sessions = {"dev-a": cruise_session}
-        server.cruise._sessions_lock = threading.Lock()
-
-        # Mock route session
-        route_session = MagicMock()
-        route_session.state = MagicMock()
-        route_session.state.value = "running"
-        route_session.current_segment_index = 2
-        route_session.route.segments = [1, 2, 3, 4, 5]  # 5 segments
-        server.route._sessions = {"dev-b": route_session}
-
-        request = {"id": "1", "method": "getAllDeviceStates", "params": {}}
-        response = await server.handle_request(request)
+        running = SimpleNamespace(value="running")
+        server.cruise._sessions = {"dev-a": SimpleNamespace(state=running)}
+        server.cruise._sessions_lock = nullcontext()
+        server.route._sessions = {"dev-b": SimpleNamespace(
+            state=running,
+            current_segment_index=2,
+            route=SimpleNamespace(segments=[1, 2, 3, 4, 5]),  # 5 segments
+        )}
+
+        result = await _call(server, "getAllDeviceStates")
 
-        result = response["result"]
         assert result["dev-a"]["cruising"] is True
         assert result["dev-b"]["routeCruising"] is True
         assert result["dev-b"]["routeProgress"] == "2/5"
@@ -216,124 +277,60 @@ class TestSetLocation:
     """Tests for setLocation RPC method."""
 
     async def test_set_location_success(self, server):
-        mock_device = Device(
-            id="device-123",
-            name="Test iPhone",
-            type=DeviceType.PHYSICAL,
-            state=DeviceState.CONNECTED,
-        )
-        server.devices.get_device = MagicMock(return_value=mock_device)
-        server.location.set_location = MagicMock(return_value={"success": True})
-        server.last_locations.update = MagicMock()
-
-        request = {
-            "id": "1",
-            "method": "setLocation",
-            "params": {"deviceId": "device-123", "latitude": 25.033, "longitude": 121.565}
-        }
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is True
-        server.location.set_location.assert_called_once_with(
-            mock_device, 25.033, 121.565,
-        )
-
-    async def test_set_location_no_device_id(self, server):
-        request = {
-            "id": "1",
-            "method": "setLocation",
-            "params": {"latitude": 25.033, "longitude": 121.565}
-        }
-        response = await server.handle_request(request)
+        server.devices.get_device = lambda *_: _PHYSICAL_DEVICE
+        server.location.set_location = MagicMock(return_value=_OK)
+        server.last_locations.update = lambda *_: None
 
-        assert response["result"]["success"] is False
-        assert "deviceId required" in response["result"]["error"]
+        result = await _call(server, "setLocation", {"deviceId": "device-123", "latitude": 25.033, "longitude": 121.565})
 
-    async def test_set_location_missing_coordinates(self, server):
-        mock_device = Device(
-            id="device-123",
-            name="Test iPhone",
-            type=DeviceType.PHYSICAL,
-            state=DeviceState.CONNECTED,
+        assert result["success"] is True
+        server.location.set_location.assert_called_once_with(
+            _PHYSICAL_DEVICE, 25.033, 121.565,
         )
-        server.devices.get_device = MagicMock(return_value=mock_device)
-
-        request = {"id": "1", "method": "setLocation", "params": {"deviceId": "device-123", "latitude": 25.033}}
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is False
-        assert "latitude and longitude required" in response["result"]["error"]
-
 
 class TestClearLocation:
     """Tests for clearLocation RPC method."""
 
     async def test_clear_location_success(self, server):
-        mock_device = Device(
-            id="device-123",
-            name="Test iPhone",
-            type=DeviceType.PHYSICAL,
-            state=DeviceState.CONNECTED,
-        )
-        server.devices.get_device = MagicMock(return_value=mock_device)
-        server.location.clear_location = MagicMock(return_value={"success": True})
+        server.devices.get_device = lambda *_: _PHYSICAL_DEVICE
+        server.location.clear_location = MagicMock(return_value=_OK)
 
-        request = {"id": "1", "method": "clearLocation", "params": {"deviceId": "device-123"}}
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is True
-        server.location.clear_location.assert_called_once_with(mock_device)
-
-    async def test_clear_location_no_device_id(self, server):
-        request = {"id": "1", "method": "clearLocation", "params": {}}
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is False
-        assert "deviceId required" in response["result"]["error"]
+        result = await _call(server, "clearLocation", {"deviceId": "device-123"})
 
+        assert result["success"] is True
+        server.location.clear_location.assert_called_once_with(_PHYSICAL_DEVICE)
 
 class TestTunnelOperations:
     """Tests for tunnel-related RPC methods."""
 
     async def test_retry_tunneld(self, server):
-        """retryTunneld calls ensure_tunneld and returns state."""
-        server.tunnel.ensure_tunneld = MagicMock(return_value="ready")
-
-        request = {"id": "1", "method": "retryTunneld", "params": {}}
-        response = await server.handle_request(request)
+        """retryTunneld starts a background check and returns at once."""
+        server.tunnel.start_tunneld_check = MagicMock(return_value="starting")
 
-        assert response["result"]["success"] is True
-        assert response["result"]["state"] == "ready"
-        server.tunnel.ensure_tunneld.assert_called_once()
+        result = await _call(server, "retryTunneld")
 
-    async def test_retry_tunneld_failure(self, server):
-        """retryTunneld returns failure when tunneld can't start."""
-        server.tunnel.ensure_tunneld = MagicMock(return_value="error")
+        assert result["success"] is True
+        assert result["state"] == "starting"
+        server.tunnel.start_tunneld_check.assert_called_once()
+        server.tunnel.ensure_tunneld.assert_not_called()
 
-        request = {"id": "1", "method": "retryTunneld", "params": {}}
+    @pytest.mark.parametrize("method", ["startTunnel", "stopTunnel", "getTunnelStatus", "selectDevice"])
+    async def test_old_tunnel_methods_removed(self, server, method):
+        """startTunnel, stopTunnel, getTunnelStatus, selectDevice are no longer available."""
+        request = _request(method, {"deviceId": "device-123"})
         response = await server.handle_request(request)
 
-        assert response["result"]["success"] is False
-        assert response["result"]["state"] == "error"
-
-    async def test_old_tunnel_methods_removed(self, server):
-        """startTunnel, stopTunnel, getTunnelStatus, selectDevice are no longer available."""
-        for method in ["startTunnel", "stopTunnel", "getTunnelStatus", "selectDevice"]:
-            request = {"id": "1", "method": method, "params": {}}
-            response = await server.handle_request(request)
-            assert "error" in response
-            assert response["error"]["code"] == -32601
+        assert response["error"]["code"] == -32601
 
     async def test_disconnect_device(self, server):
         """disconnectDevice clears active tasks for the device."""
-        server.cruise.stop_cruise = MagicMock(return_value={"success": True})
-        server.route.stop_route_cruise = MagicMock(return_value={"success": True})
+        server.cruise.stop_cruise = MagicMock(return_value=_OK)
+        server.route.stop_route_cruise = MagicMock(return_value=_OK)
         server.location.close_connection = MagicMock()
 
-        request = {"id": "1", "method": "disconnectDevice", "params": {"deviceId": "device-123"}}
-        response = await server.handle_request(request)
+        result = await _call(server, "disconnectDevice", {"deviceId": "device-123"})
 
-        assert response["result"]["success"] is True
+        assert result["success"] is True
         server.cruise.stop_cruise.assert_called_once_with("device-123")
         server.route.stop_route_cruise.assert_called_once_with("device-123")
         server.location.close_connection.assert_called_once_with("device-123")
@@ -343,28 +340,26 @@ class TestFavoritesOperations:
     """Tests for favorites-related RPC methods."""
 
     async def test_get_favorites(self, server):
-        mock_favorite = MagicMock()
-        mock_favorite.to_dict.return_value = {
+        favorite = SimpleNamespace(to_dict=lambda: {
             "latitude": 25.033,
             "longitude": 121.565,
             "name": "Taipei 101",
-        }
-        server.favorites.get_all = MagicMock(return_value=[mock_favorite])
+        })
+        server.favorites.get_all = lambda *_: [favorite]
 
-        request = {"id": "1", "method": "getFavorites", "params": {}}
-        response = await server.handle_request(request)
+        result = await _call(server, "getFavorites")
 
-        assert "favorites" in response["result"]
-        assert len(response["result"]["favorites"]) == 1
-        assert response["result"]["favorites"][0]["name"] == "Taipei 101"
+        assert "favorites" in result
+        assert len(result["favorites"]) == 1
+        assert result["favorites"][0]["name"] == "Taipei 101"
 
     async def test_get_favorites_empty(self, server):
-        server.favorites.get_all = MagicMock(return_value=[])
+        server.favorites.get_all = lambda *_: []
 
-        request = {"id": "1", "method": "getFavorites", "params": {}}
-        response = await server.handle_request(request)
+        result = await _call(server, "getFavorites")
 
-        assert response["result"]["favorites"] == []
+        assert result["favorites"] == ()
+        assert result is _EMPTY_FAVORITES_RESULT
 
     async def test_add_favorite_success(self, server):
         server.favorites.add = MagicMock(return_value={
@@ -372,88 +367,37 @@ class TestFavoritesOperations:
             "favorite": {"latitude": 25.033, "longitude": 121.565, "name": "Taipei"},
         })
 
-        request = {
-            "id": "1",
-            "method": "addFavorite",
-            "params": {"latitude": 25.033, "longitude": 121.565, "name": "Taipei"}
-        }
-        response = await server.handle_request(request)
+        result = await _call(server, "addFavorite", {"latitude": 25.033, "longitude": 121.565, "name": "Taipei"})
 
-        assert response["result"]["success"] is True
+        assert result["success"] is True
         server.favorites.add.assert_called_once_with(25.033, 121.565, "Taipei")
 
-    async def test_add_favorite_missing_coords(self, server):
-        request = {"id": "1", "method": "addFavorite", "params": {"name": "Test"}}
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is False
-        assert "latitude" in response["result"]["error"]
-
     async def test_update_favorite_success(self, server):
         server.favorites.update = MagicMock(return_value={
             "success": True,
             "favorite": {"latitude": 25.033, "longitude": 121.565, "name": "New Name"},
         })
 
-        request = {
-            "id": "1",
-            "method": "updateFavorite",
-            "params": {"index": 0, "name": "New Name"}
-        }
-        response = await server.handle_request(request)
+        result = await _call(server, "updateFavorite", {"index": 0, "name": "New Name"})
 
-        assert response["result"]["success"] is True
+        assert result["success"] is True
         server.favorites.update.assert_called_once_with(0, "New Name")
 
-    async def test_update_favorite_missing_index(self, server):
-        request = {"id": "1", "method": "updateFavorite", "params": {"name": "Test"}}
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is False
-        assert "index" in response["result"]["error"]
-
-    async def test_update_favorite_missing_name(self, server):
-        request = {"id": "1", "method": "updateFavorite", "params": {"index": 0}}
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is False
-        assert "name" in response["result"]["error"]
-
     async def test_delete_favorite_success(self, server):
-        server.favorites.delete = MagicMock(return_value={"success": True})
+        server.favorites.delete = MagicMock(return_value=_OK)
 
-        request = {"id": "1", "method": "deleteFavorite", "params": {"index": 0}}
-        response = await server.handle_request(request)
+        result = await _call(server, "deleteFavorite", {"index": 0})
 
-        assert response["result"]["success"] is True
+        assert result["success"] is True
         server.favorites.delete.assert_called_once_with(0)
 
-    async def test_delete_favorite_missing_index(self, server):
-        request = {"id": "1", "method": "deleteFavorite", "params": {}}
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is False
-        assert "index" in response["result"]["error"]
-
     async def test_import_favorites_success(self, server):
-        server.favorites.import_from_file = MagicMock(return_value={
+        server.favorites.import_from_file = lambda *_: {
             "success": True,
             "imported": 5,
-        })
-
-        request = {
-            "id": "1",
-            "method": "importFavorites",
-            "params": {"filePath": "/path/to/file.txt"}
         }
-        response = await server.handle_request(request)
-
-        assert response["result"]["success"] is True
-        assert response["result"]["imported"] == 5
 
-    async def test_import_favorites_missing_path(self, server):
-        request = {"id": "1", "method": "importFavorites", "params": {}}
-        response = await server.handle_request(request)
+        result = await _call(server, "importFavorites", {"filePath": "/path/to/file.txt"})
 
-        assert response["result"]["success"] is False
-        assert "filePath" in response["result"]["error"]
+        assert result["success"] is True
+        assert result["imported"] == 5
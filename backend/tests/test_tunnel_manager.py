@@ -1,30 +1,49 @@
 """Tests for TunnelManager service."""
 
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+from types import SimpleNamespace
+
+import orjson
 import pytest
 from unittest.mock import MagicMock, patch
 
 from models import RSDTunnel, TunnelState, TunnelStatus
-from services.tunnel_manager import TunnelManager
+from services.tunnel_manager import (
+    TUNNEL_MEMO_TTL,
+    TUNNELD_CONNECT_TIMEOUT,
+    TUNNELD_PROBE_TIMEOUT,
+    TunnelManager,
+    _port_open,
+    _proc_has_tunneld,
+)
+
+
+@pytest.fixture
+def manager():
+    """Fresh TunnelManager for each test."""
+    return TunnelManager()
 
 
 class TestTunnelManagerInit:
     """Tests for TunnelManager initialization."""
 
-    def test_init_creates_empty_status_dict(self):
-        manager = TunnelManager()
+    def test_init_creates_empty_status_dict(self, manager):
         assert manager._last_status == {}
 
-    def test_init_has_no_last_error(self):
-        manager = TunnelManager()
+    def test_init_has_no_last_error(self, manager):
         assert manager._last_error is None
 
 
 class TestTunnelManagerGetTunnel:
     """Tests for get_tunnel method."""
 
-    def test_get_tunnel_queries_tunneld_fresh(self):
-        """get_tunnel should always query tunneld fresh, no caching."""
-        manager = TunnelManager()
+    def test_get_tunnel_queries_tunneld(self, manager):
+        """get_tunnel queries tunneld on first use."""
         mock_tunnel = RSDTunnel(address="fd10::1", port=62050, udid="test-udid")
 
         with patch.object(manager, '_query_tunneld_http', return_value=mock_tunnel) as mock_query:
@@ -35,18 +54,70 @@ class TestTunnelManagerGetTunnel:
             assert result.address == "fd10::1"
             assert result.port == 62050
 
-    def test_get_tunnel_returns_none_when_no_tunnel(self):
-        """get_tunnel returns None when tunneld has no tunnel for device."""
-        manager = TunnelManager()
+    def test_get_tunnel_memoizes_within_ttl(self, manager):
+        """Calls within the TTL share one tunneld query."""
+        mock_tunnel = RSDTunnel(address="fd10::1", port=62050, udid="test-udid")
+
+        with patch.object(manager, '_query_tunneld_http', return_value=mock_tunnel) as mock_query:
+            assert manager.get_tunnel("test-udid") is mock_tunnel
+            assert manager.get_tunnel("test-udid") is mock_tunnel
+
+            mock_query.assert_called_once_with("test-udid")
 
+    def test_get_tunnel_queries_again_after_ttl(self, manager):
+        with patch.object(manager, '_query_tunneld_http', return_value=None) as mock_query:
+            manager.get_tunnel("test-udid")
+            # Age the memo entry past the TTL
+            fetched_at, tunnel = manager._tunnel_cache["test-udid"]
+            manager._tunnel_cache["test-udid"] = (fetched_at - TUNNEL_MEMO_TTL, tunnel)
+            manager.get_tunnel("test-udid")
+
+            assert mock_query.call_count == 2
+
+    def test_invalidate_drops_memoized_tunnel(self, manager):
+        with patch.object(manager, '_query_tunneld_http', return_value=None) as mock_query:
+            manager.get_tunnel("test-udid")
+            manager.invalidate("test-udid")
+            manager.get_tunnel("test-udid")
+
+            assert mock_query.call_count == 2
+
+    def test_concurrent_get_tunnel_single_query(self, manager):
+        """Concurrent callers for one device wait for a single query."""
+        mock_tunnel = RSDTunnel(address="fd10::1", port=62050, udid="test-udid")
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_query(udid):
+            started.set()
+            release.wait(5)
+            return mock_tunnel
+
+        with patch.object(manager, '_query_tunneld_http', side_effect=slow_query) as mock_query:
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(manager.get_tunnel("test-udid")))
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            started.wait(5)
+            release.set()
+            for t in threads:
+                t.join(5)
+
+            mock_query.assert_called_once()
+            assert results == [mock_tunnel] * 4
+
+    def test_get_tunnel_returns_none_when_no_tunnel(self, manager):
+        """get_tunnel returns None when tunneld has no tunnel for device."""
         with patch.object(manager, '_query_tunneld_http', return_value=None):
             result = manager.get_tunnel("unknown-device")
 
             assert result is None
 
-    def test_get_tunnel_updates_status_on_success(self):
+    def test_get_tunnel_updates_status_on_success(self, manager):
         """get_tunnel updates last status when tunnel found."""
-        manager = TunnelManager()
         mock_tunnel = RSDTunnel(address="fd10::1", port=62050, udid="test-udid")
 
         with patch.object(manager, '_query_tunneld_http', return_value=mock_tunnel):
@@ -55,10 +126,8 @@ class TestTunnelManagerGetTunnel:
             assert "test-udid" in manager._last_status
             assert manager._last_status["test-udid"].status == TunnelStatus.CONNECTED
 
-    def test_get_tunnel_returns_none_for_empty_udid(self):
+    def test_get_tunnel_returns_none_for_empty_udid(self, manager):
         """get_tunnel returns None when called without UDID."""
-        manager = TunnelManager()
-
         result = manager.get_tunnel("")
         assert result is None
 
@@ -69,8 +138,7 @@ class TestTunnelManagerGetTunnel:
 class TestTunnelManagerGetStatus:
     """Tests for get_status method."""
 
-    def test_get_status_with_no_tunnels(self):
-        manager = TunnelManager()
+    def test_get_status_with_no_tunnels(self, manager):
         status = manager.get_status()
 
         assert status["running"] is False
@@ -79,15 +147,13 @@ class TestTunnelManagerGetStatus:
         assert status["udid"] is None
         assert status["status"] == "no_tunnel"
 
-    def test_get_status_for_specific_device_not_found(self):
-        manager = TunnelManager()
+    def test_get_status_for_specific_device_not_found(self, manager):
         status = manager.get_status(udid="unknown-device")
 
         assert status["udid"] == "unknown-device"
         assert status["status"] == "no_tunnel"
 
-    def test_get_status_for_connected_device(self):
-        manager = TunnelManager()
+    def test_get_status_for_connected_device(self, manager):
         tunnel = RSDTunnel(address="192.168.1.1", port=8080, udid="test-udid")
         state = TunnelState(
             udid="test-udid",
@@ -101,9 +167,8 @@ class TestTunnelManagerGetStatus:
         assert status["status"] == "connected"
         assert status["tunnelInfo"]["address"] == "192.168.1.1"
 
-    def test_get_status_legacy_format_with_connected_tunnel(self):
+    def test_get_status_legacy_format_with_connected_tunnel(self, manager):
         """Legacy format returns first connected tunnel when no UDID specified."""
-        manager = TunnelManager()
         tunnel = RSDTunnel(address="10.0.0.1", port=9999, udid="device-1")
         state = TunnelState(
             udid="device-1",
@@ -119,11 +184,24 @@ class TestTunnelManagerGetStatus:
         assert status["port"] == 9999
 
 
+class TestTunnelManagerInternedUdids:
+    """Tests for interning UDID keys."""
+
+    def test_state_keys_are_interned(self, manager):
+        udid = "".join(["00008110-", "001A2B3C4D5E6F70"])  # not a literal
+
+        with patch.object(manager, '_query_tunneld_http', return_value=None):
+            manager.get_tunnel(udid)
+
+        key = next(iter(manager._last_status))
+        assert key is sys.intern(udid)
+        assert next(iter(manager._tunnel_cache)) is key
+
+
 class TestTunnelManagerInvalidate:
     """Tests for invalidate method."""
 
-    def test_invalidate_existing_tunnel(self):
-        manager = TunnelManager()
+    def test_invalidate_existing_tunnel(self, manager):
         tunnel = RSDTunnel(address="192.168.1.1", port=8080, udid="test-udid")
         state = TunnelState(
             udid="test-udid",
@@ -137,8 +215,18 @@ class TestTunnelManagerInvalidate:
         assert manager._last_status["test-udid"].status == TunnelStatus.DISCONNECTED
         assert "failed" in manager._last_status["test-udid"].error.lower()
 
-    def test_invalidate_nonexistent_tunnel_no_error(self):
-        manager = TunnelManager()
+    def test_status_reflects_updates_after_serializing(self, manager):
+        tunnel = RSDTunnel(address="fd00::1", port=1234, udid="test-udid")
+        manager._update_status("test-udid", TunnelStatus.CONNECTED, tunnel)
+        assert manager.get_status(udid="test-udid")["status"] == "connected"
+
+        manager.invalidate("test-udid")
+        assert manager.get_status(udid="test-udid")["status"] == "disconnected"
+
+        manager._update_status("test-udid", TunnelStatus.NO_TUNNEL, None)
+        assert manager.get_status(udid="test-udid")["status"] == "no_tunnel"
+
+    def test_invalidate_nonexistent_tunnel_no_error(self, manager):
         # Should not raise
         manager.invalidate("unknown-device")
 
@@ -146,139 +234,355 @@ class TestTunnelManagerInvalidate:
 class TestTunnelManagerQueryTunneldHttp:
     """Tests for _query_tunneld_http method."""
 
-    @patch('urllib.request.urlopen')
-    def test_returns_tunnel_when_found(self, mock_urlopen):
-        manager = TunnelManager()
-        mock_response = MagicMock()
-        mock_response.read.return_value = b'{"test-udid": [{"tunnel-address": "fd10::1", "tunnel-port": 62050}]}'
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+    def test_returns_tunnel_when_found(self, manager):
+        body = b'{"test-udid": [{"tunnel-address": "fd10::1", "tunnel-port": 62050}]}'
 
-        result = manager._query_tunneld_http("test-udid")
+        with patch.object(manager, '_tunneld_get', return_value=body):
+            result = manager._query_tunneld_http("test-udid")
 
         assert result is not None
         assert result.address == "fd10::1"
         assert result.port == 62050
         assert result.udid == "test-udid"
 
-    @patch('urllib.request.urlopen')
-    def test_returns_none_when_device_not_found(self, mock_urlopen):
-        manager = TunnelManager()
-        mock_response = MagicMock()
-        mock_response.read.return_value = b'{"other-device": [{"tunnel-address": "fd10::1", "tunnel-port": 62050}]}'
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+    def test_returns_none_when_device_not_found(self, manager):
+        body = b'{"other-device": [{"tunnel-address": "fd10::1", "tunnel-port": 62050}]}'
 
-        result = manager._query_tunneld_http("test-udid")
+        with patch.object(manager, '_tunneld_get', return_value=body):
+            result = manager._query_tunneld_http("test-udid")
 
         assert result is None
 
-    @patch('urllib.request.urlopen')
-    def test_returns_none_when_tunneld_not_available(self, mock_urlopen):
-        manager = TunnelManager()
-        mock_urlopen.side_effect = Exception("Connection refused")
+    def test_returns_none_when_tunneld_not_available(self, manager):
+        with patch.object(manager, '_tunneld_get', side_effect=ConnectionRefusedError()):
+            result = manager._query_tunneld_http("test-udid")
+
+        assert result is None
 
-        result = manager._query_tunneld_http("test-udid")
+    def test_handles_empty_response(self, manager):
+        with patch.object(manager, '_tunneld_get', return_value=b'{}'):
+            result = manager._query_tunneld_http("test-udid")
 
         assert result is None
 
-    @patch('urllib.request.urlopen')
-    def test_handles_empty_response(self, mock_urlopen):
-        manager = TunnelManager()
-        mock_response = MagicMock()
-        mock_response.read.return_value = b'{}'
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+    def test_partial_match(self, manager):
+        body = b'{"00008110-001A2B3C": [{"tunnel-address": "fd10::1", "tunnel-port": 62050}]}'
 
-        result = manager._query_tunneld_http("test-udid")
+        with patch.object(manager, '_tunneld_get', return_value=body):
+            result = manager._query_tunneld_http("001A2B3C")
 
-        assert result is None
+        assert result.address == "fd10::1"
+        assert result.udid == "001A2B3C"
 
+    def test_partial_match_remembered_across_snapshots(self, manager):
+        info = [{"tunnel-address": "fd10::1", "tunnel-port": 62050}]
 
-class TestTunnelManagerExtractTunnelInfo:
-    """Tests for _extract_tunnel_info method."""
+        with patch.object(manager, '_fetch_tunneld_snapshot',
+                          return_value={"00008110-001A2B3C": info}):
+            manager._query_tunneld_http("001A2B3C")
 
-    def test_extracts_from_list_format(self):
-        manager = TunnelManager()
-        device_info = [{"tunnel-address": "fd10::1", "tunnel-port": 62050}]
+        class NoScan(dict):
+            def items(self):
+                raise AssertionError("scanned all devices")
 
-        result = manager._extract_tunnel_info(device_info, "test-udid")
+        with patch.object(manager, '_fetch_tunneld_snapshot',
+                          return_value=NoScan({"00008110-001A2B3C": info})):
+            result = manager._query_tunneld_http("001A2B3C")
 
-        assert result is not None
-        assert result.address == "fd10::1"
         assert result.port == 62050
 
-    def test_extracts_from_dict_format(self):
-        manager = TunnelManager()
-        device_info = {"address": "192.168.1.1", "port": 8080}
 
-        result = manager._extract_tunnel_info(device_info, "test-udid")
+class TestTunnelManagerSnapshot:
+    """Tests for the shared tunneld snapshot."""
 
-        assert result is not None
-        assert result.address == "192.168.1.1"
-        assert result.port == 8080
+    BODY = (
+        b'{"udid-a": [{"tunnel-address": "fd10::1", "tunnel-port": 1111}],'
+        b' "udid-b": [{"tunnel-address": "fd10::2", "tunnel-port": 2222}]}'
+    )
 
-    def test_handles_alternative_key_names(self):
-        manager = TunnelManager()
-        device_info = {"tunnel_address": "10.0.0.1", "tunnel_port": 9999}
+    def test_devices_share_one_query(self, manager):
+        with patch.object(manager, '_tunneld_get', return_value=self.BODY) as mock_get:
+            assert manager._query_tunneld_http("udid-a").port == 1111
+            assert manager._query_tunneld_http("udid-b").port == 2222
 
-        result = manager._extract_tunnel_info(device_info, "test-udid")
+            mock_get.assert_called_once()
 
-        assert result is not None
-        assert result.address == "10.0.0.1"
-        assert result.port == 9999
+    def test_invalidate_drops_snapshot(self, manager):
+        with patch.object(manager, '_tunneld_get', return_value=self.BODY) as mock_get:
+            manager._query_tunneld_http("udid-a")
+            manager.invalidate("udid-a")
+            manager._query_tunneld_http("udid-a")
 
-    def test_returns_none_for_empty_list(self):
-        manager = TunnelManager()
-        device_info = []
+            assert mock_get.call_count == 2
 
-        result = manager._extract_tunnel_info(device_info, "test-udid")
+    def test_malformed_response_returns_none(self, manager):
+        with patch.object(manager, '_tunneld_get', return_value=b'not json'):
+            assert manager._query_tunneld_http("udid-a") is None
+
+    def test_failed_query_not_cached(self, manager):
+        with patch.object(manager, '_tunneld_get', side_effect=[ConnectionRefusedError(), self.BODY]):
+            assert manager._query_tunneld_http("udid-a") is None
+            assert manager._query_tunneld_http("udid-a").port == 1111
+
+
+class TestTunnelManagerTunneldGet:
+    """Tests for the keep-alive tunneld HTTP connection."""
+
+    @staticmethod
+    def _response(body=b'{}', status=200, will_close=False):
+        """Stub HTTPResponse; only status, will_close and read() are used."""
+        return SimpleNamespace(status=status, will_close=will_close, read=lambda: body)
+
+    OK = _response()
+
+    @staticmethod
+    def _connection():
+        """Mock HTTPConnection whose connect() opens a socket."""
+        conn = MagicMock(sock=None)
+        conn.connect.side_effect = lambda: setattr(conn, 'sock', MagicMock())
+        return conn
+
+    @patch('http.client.HTTPConnection')
+    def test_reuses_connection_across_calls(self, mock_conn_cls, manager):
+        conn = mock_conn_cls.return_value = self._connection()
+        conn.getresponse.return_value = self.OK
+
+        assert manager._tunneld_get() == b'{}'
+        assert manager._tunneld_get() == b'{}'
+
+        mock_conn_cls.assert_called_once()
+        assert conn.request.call_count == 2
+
+    @patch('http.client.HTTPConnection')
+    def test_retries_once_on_stale_connection(self, mock_conn_cls, manager):
+        stale, fresh = self._connection(), self._connection()
+        stale.getresponse.side_effect = http.client.RemoteDisconnected()
+        fresh.getresponse.return_value = self._response(b'{"a": 1}')
+        mock_conn_cls.side_effect = [stale, fresh]
+
+        assert manager._tunneld_get() == b'{"a": 1}'
+        stale.close.assert_called_once()
+
+    @patch('http.client.HTTPConnection')
+    def test_connect_and_read_timeouts(self, mock_conn_cls, manager):
+        conn = mock_conn_cls.return_value = self._connection()
+        timeouts = []
+        conn.connect.side_effect = lambda: (
+            timeouts.append(conn.timeout), setattr(conn, 'sock', MagicMock())
+        )
+        conn.getresponse.return_value = self.OK
+
+        manager._tunneld_get(timeout=10)
+
+        assert timeouts == [TUNNELD_CONNECT_TIMEOUT]
+        conn.sock.settimeout.assert_called_with(10)
+
+    @patch('http.client.HTTPConnection')
+    def test_error_status_raises(self, mock_conn_cls, manager):
+        conn = mock_conn_cls.return_value = self._connection()
+        conn.getresponse.return_value = self._response(status=500)
+
+        with pytest.raises(http.client.HTTPException):
+            manager._tunneld_get()
+
+    @patch('http.client.HTTPConnection')
+    def test_close_releases_connection(self, mock_conn_cls, manager):
+        conn = mock_conn_cls.return_value = self._connection()
+        conn.getresponse.return_value = self.OK
+        manager._tunneld_get()
+
+        manager.close()
+
+        conn.close.assert_called_once()
+        assert manager._http is None
 
-        assert result is None
 
-    def test_returns_none_for_missing_address(self):
-        manager = TunnelManager()
-        device_info = {"port": 8080}
+class TestTunnelManagerExtractTunnelInfo:
+    """Tests for _extract_tunnel_info method."""
 
+    @pytest.mark.parametrize("device_info,expected", [
+        ([{"tunnel-address": "fd10::1", "tunnel-port": 62050}], ("fd10::1", 62050)),
+        ({"address": "192.168.1.1", "port": 8080}, ("192.168.1.1", 8080)),
+        ({"tunnel_address": "10.0.0.1", "tunnel_port": 9999}, ("10.0.0.1", 9999)),
+        # Empty values fall through to the next key
+        ({"tunnel-address": "", "address": "10.0.0.2", "tunnel-port": 0, "rsd_port": 7777}, ("10.0.0.2", 7777)),
+        ([], None),
+        ({"port": 8080}, None),
+    ], ids=["list", "dict", "alt-keys", "skip-empty", "empty-list", "no-address"])
+    def test_extract_tunnel_info(self, manager, device_info, expected):
         result = manager._extract_tunnel_info(device_info, "test-udid")
 
-        assert result is None
+        if expected is None:
+            assert result is None
+        else:
+            assert result == RSDTunnel(*expected, udid="test-udid")
 
 
 class TestTunnelManagerIsTunneldRunning:
     """Tests for _is_tunneld_running method."""
 
-    @patch('urllib.request.urlopen')
-    def test_returns_true_when_tunneld_responds(self, mock_urlopen):
-        manager = TunnelManager()
-        mock_response = MagicMock()
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+    def test_returns_true_when_tunneld_responds(self, manager):
+        with patch.object(manager, '_tunneld_get', return_value=b'{}'):
+            result = manager._is_tunneld_running()
+
+        assert result is True
+
+    @patch('subprocess.run')
+    def test_returns_false_when_tunneld_not_running(self, mock_run, manager):
+        """A refused connection is definitive - no process scan."""
+        with patch.object(manager, '_tunneld_get', side_effect=ConnectionRefusedError()):
+            result = manager._is_tunneld_running()
+
+        assert result is False
+        mock_run.assert_not_called()
 
-        result = manager._is_tunneld_running()
+    @patch('subprocess.run')
+    def test_falls_back_to_process_check_on_timeout(self, mock_run, manager):
+        mock_run.return_value = MagicMock(returncode=0, stdout="tunneld")
+
+        with patch.object(manager, '_tunneld_get', side_effect=TimeoutError()) as mock_get, \
+                patch('sys.platform', 'darwin'):
+            result = manager._is_tunneld_running()
 
         assert result is True
+        mock_get.assert_called_once_with(timeout=TUNNELD_PROBE_TIMEOUT)
+        mock_run.assert_called_once()
 
-    @patch('urllib.request.urlopen')
-    def test_returns_false_when_tunneld_not_running(self, mock_urlopen):
-        manager = TunnelManager()
-        mock_urlopen.side_effect = Exception("Connection refused")
 
-        result = manager._is_tunneld_running()
+class TestTunnelManagerWindowsProcessCheck:
+    """Tests for the Windows process fallback of _is_tunneld_running."""
 
-        assert result is False
+    @pytest.fixture
+    def windows(self, monkeypatch, manager):
+        monkeypatch.setattr(sys, 'platform', 'win32')
+        monkeypatch.setattr('services.tunnel_manager.HAS_PSUTIL', False)
+        monkeypatch.setattr(subprocess, 'CREATE_NO_WINDOW', 0x08000000, raising=False)
+        monkeypatch.setattr(manager, '_tunneld_get', MagicMock(side_effect=TimeoutError()))
+        return manager
+
+    @patch('subprocess.run')
+    def test_no_other_python_skips_wmic(self, mock_run, windows):
+        with patch('services.tunnel_manager._windows_python_pids', return_value=[os.getpid()]):
+            assert windows._is_tunneld_running() is False
+
+        mock_run.assert_not_called()
+
+    @patch('subprocess.run')
+    def test_other_python_checked_with_wmic(self, mock_run, windows):
+        mock_run.return_value = MagicMock(stdout="python -m pymobiledevice3 remote tunneld -d")
+
+        with patch('services.tunnel_manager._windows_python_pids', return_value=[os.getpid(), 4242]):
+            assert windows._is_tunneld_running() is True
+
+        mock_run.assert_called_once()
+
+    @patch('subprocess.run')
+    def test_snapshot_failure_falls_back_to_wmic(self, mock_run, windows):
+        mock_run.return_value = MagicMock(stdout="")
+
+        with patch('services.tunnel_manager._windows_python_pids', side_effect=OSError()):
+            assert windows._is_tunneld_running() is False
+
+        mock_run.assert_called_once()
+
+
+class TestTunnelManagerStatusBytes:
+    """Tests for the cached tunneldStatus SSE frame."""
+
+    def test_frame_matches_emitted_event(self, manager):
+        events = []
+        manager.set_event_emitter(events.append)
+
+        manager._emit_tunneld_status("error", "tunneld stopped")
+
+        frame = manager.get_status_bytes()
+        assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+        assert orjson.loads(frame[len(b"data: "):]) == events[0]
+
+    def test_frame_reused_until_state_changes(self, manager):
+        first = manager.get_status_bytes()
+        assert manager.get_status_bytes() is first
+        assert orjson.loads(first[len(b"data: "):])["data"] == {"state": "starting"}
+
+        manager._emit_tunneld_status("ready")
+
+        assert orjson.loads(manager.get_status_bytes()[len(b"data: "):])["data"] == {"state": "ready"}
+
+
+class TestTunnelManagerStartTunneldCheck:
+    """Tests for the background tunneld startup check."""
+
+    def test_returns_immediately(self, manager):
+        release = threading.Event()
+
+        with patch.object(manager, 'ensure_tunneld', side_effect=lambda: release.wait(5)):
+            assert manager.start_tunneld_check() == "starting"
+            assert manager._startup_thread.is_alive()
+            release.set()
+            manager._startup_thread.join(5)
+
+    def test_check_in_progress_is_not_restarted(self, manager):
+        release = threading.Event()
+
+        with patch.object(manager, 'ensure_tunneld', side_effect=lambda: release.wait(5)) as mock_ensure:
+            manager.start_tunneld_check()
+            first = manager._startup_thread
+            manager.start_tunneld_check()
+
+            assert manager._startup_thread is first
+            release.set()
+            first.join(5)
+
+            manager.start_tunneld_check()
+            manager._startup_thread.join(5)
+
+        assert mock_ensure.call_count == 2
+
+
+class TestTunnelManagerWaitReady:
+    """Tests for waiting on a freshly started tunneld."""
+
+    def test_skips_http_probe_until_port_accepts(self, manager):
+        with patch('services.tunnel_manager._port_open', side_effect=[False, False, True]), \
+                patch.object(manager, '_is_tunneld_running', return_value=True) as mock_running, \
+                patch('time.sleep') as mock_sleep:
+            assert manager._wait_ready(5.0) is True
+
+        mock_running.assert_called_once()
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.01, 0.02]
+
+    def test_backoff_is_capped(self, manager):
+        with patch('services.tunnel_manager._port_open', side_effect=[False] * 10 + [True]), \
+                patch.object(manager, '_is_tunneld_running', return_value=True), \
+                patch('time.sleep') as mock_sleep:
+            assert manager._wait_ready(5.0) is True
+
+        assert max(c.args[0] for c in mock_sleep.call_args_list) == 0.5
+
+    def test_gives_up_after_budget(self, manager):
+        with patch('services.tunnel_manager._port_open', return_value=False), \
+                patch('time.sleep'):
+            assert manager._wait_ready(0.0) is False
+
+
+class TestPortOpen:
+    """Tests for the TCP readiness pre-check."""
+
+    def test_open_and_closed_port(self):
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+            port = server.getsockname()[1]
+
+            assert _port_open(port) is True
+
+        assert _port_open(port) is False
 
 
 class TestTunnelManagerPerDeviceIsolation:
     """Tests to ensure per-device state isolation."""
 
-    def test_different_devices_have_independent_state(self):
-        manager = TunnelManager()
-
+    def test_different_devices_have_independent_state(self, manager):
         # Update status for two devices
         manager._update_status(
             "device-1",
@@ -298,9 +602,7 @@ class TestTunnelManagerPerDeviceIsolation:
         assert manager._last_status["device-1"].tunnel_info is not None
         assert manager._last_status["device-2"].tunnel_info is None
 
-    def test_invalidate_one_device_does_not_affect_others(self):
-        manager = TunnelManager()
-
+    def test_invalidate_one_device_does_not_affect_others(self, manager):
         manager._update_status("device-1", TunnelStatus.CONNECTED, None)
         manager._update_status("device-2", TunnelStatus.CONNECTED, None)
 
@@ -308,3 +610,116 @@ class TestTunnelManagerPerDeviceIsolation:
 
         assert manager._last_status["device-1"].status == TunnelStatus.DISCONNECTED
         assert manager._last_status["device-2"].status == TunnelStatus.CONNECTED
+
+
+class TestTunnelManagerFindPython:
+    """Tests for resolving and caching the pymobiledevice3 interpreter."""
+
+    def test_resolved_path_reused(self, tmp_path):
+        manager = TunnelManager(data_dir=str(tmp_path))
+
+        with patch.object(manager, '_probe_python_candidates', return_value=("/usr/bin/python3", True)) as mock_probe:
+            assert manager._find_python_with_pymobiledevice3() == "/usr/bin/python3"
+            assert manager._find_python_with_pymobiledevice3() == "/usr/bin/python3"
+
+        mock_probe.assert_called_once()
+
+    def test_persisted_path_verified_on_restart(self, tmp_path):
+        interpreter = tmp_path / "python3"
+        interpreter.touch()
+        (tmp_path / "python_path").write_text(str(interpreter))
+        manager = TunnelManager(data_dir=str(tmp_path))
+
+        with patch.object(manager, '_probe_python', return_value=True) as mock_verify, \
+                patch.object(manager, '_probe_python_candidates') as mock_probe:
+            assert manager._find_python_with_pymobiledevice3() == str(interpreter)
+
+        mock_verify.assert_called_once_with(str(interpreter))
+        mock_probe.assert_not_called()
+
+    def test_stale_persisted_path_reprobed(self, tmp_path):
+        (tmp_path / "python_path").write_text(str(tmp_path / "missing-python"))
+        manager = TunnelManager(data_dir=str(tmp_path))
+
+        with patch.object(manager, '_probe_python_candidates', return_value=("/opt/python3", True)):
+            assert manager._find_python_with_pymobiledevice3() == "/opt/python3"
+
+        assert (tmp_path / "python_path").read_text() == "/opt/python3"
+
+    def test_fallback_not_persisted(self, tmp_path):
+        manager = TunnelManager(data_dir=str(tmp_path))
+
+        with patch.object(manager, '_probe_python_candidates', return_value=("python3", False)):
+            assert manager._find_python_with_pymobiledevice3() == "python3"
+
+        assert not (tmp_path / "python_path").exists()
+        assert manager._python_path is None
+
+
+class TestTunnelManagerProbeCandidates:
+    """Tests for concurrent interpreter probing."""
+
+    def test_prefers_earliest_working_candidate(self, manager):
+        working = {"/usr/local/bin/python3", sys.executable}
+
+        with patch('os.path.exists', return_value=True), \
+                patch('sys.platform', 'linux'), \
+                patch.object(manager, '_probe_python', side_effect=lambda p: p in working):
+            assert manager._probe_python_candidates() == (sys.executable, True)
+
+    def test_probes_run_concurrently(self, manager):
+        """A hanging candidate doesn't serialize the other probes."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def probe(path):
+            if path in (sys.executable, "/usr/local/bin/python3"):
+                barrier.wait()  # Deadlocks unless both probes run at once
+                return path == "/usr/local/bin/python3"
+            return False
+
+        with patch('os.path.exists', return_value=True), \
+                patch('sys.platform', 'linux'), \
+                patch.object(manager, '_probe_python', side_effect=probe):
+            assert manager._probe_python_candidates() == ("/usr/local/bin/python3", True)
+
+    def test_no_working_candidate(self, manager):
+        with patch('os.path.exists', return_value=False), \
+                patch('sys.platform', 'linux'), \
+                patch.object(manager, '_probe_python', return_value=False):
+            assert manager._probe_python_candidates() == ("python3", False)
+
+
+class TestProcHasTunneld:
+    """Tests for the Linux /proc process scan."""
+
+    @staticmethod
+    def _make_proc(root, processes):
+        for pid, cmdline in processes.items():
+            (root / pid).mkdir()
+            (root / pid / "cmdline").write_bytes(cmdline)
+        (root / "self").mkdir()
+
+    def test_finds_tunneld(self, tmp_path):
+        self._make_proc(tmp_path, {
+            "1": b"/sbin/init\0",
+            "42": b"python3\0-m\0pymobiledevice3\0remote\0tunneld\0-d\0",
+        })
+
+        assert _proc_has_tunneld(str(tmp_path)) is True
+
+    def test_ignores_other_processes(self, tmp_path):
+        self._make_proc(tmp_path, {
+            "1": b"/sbin/init\0",
+            "7": b"tunneld-lookalike\0pymobiledevice3\0",
+        })
+
+        assert _proc_has_tunneld(str(tmp_path)) is False
+
+    @patch('subprocess.run')
+    def test_linux_fallback_does_not_fork(self, mock_run, manager):
+        with patch.object(manager, '_tunneld_get', side_effect=TimeoutError()), \
+                patch('sys.platform', 'linux'), \
+                patch('services.tunnel_manager._proc_has_tunneld', return_value=True):
+            assert manager._is_tunneld_running() is True
+
+        mock_run.assert_not_called()